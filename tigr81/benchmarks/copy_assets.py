@@ -0,0 +1,90 @@
+"""Benchmark the copy of the static assets of a template.
+
+Builds a synthetic cookiecutter template holding a few hundred MB of assets
+listed in ``_copy_without_render``, then times copying them as copier does
+(reading and writing every file in Python), with shutil.copytree, with
+tigr81_utils.copy_tree, and rendering the whole template with cookiecutter.
+
+Usage: python benchmarks/copy_assets.py [--size-mb 300] [--files 200] [--dir DIR]
+"""
+
+import argparse
+import json
+import os
+import pathlib as pl
+import shutil
+import tempfile
+import time
+from typing import Callable
+
+from cookiecutter.main import cookiecutter
+
+import tigr81.utils as tigr81_utils
+
+
+def make_template(root: pl.Path, size_mb: int, files: int) -> pl.Path:
+    """Write a cookiecutter template with ``files`` assets totalling ``size_mb``."""
+    template = root / "template"
+    assets = template / "{{cookiecutter.name}}" / "assets"
+    assets.mkdir(parents=True)
+    (template / "cookiecutter.json").write_text(
+        json.dumps({"name": "project", "_copy_without_render": ["assets"]})
+    )
+    (template / "{{cookiecutter.name}}" / "README.md").write_text("# {{cookiecutter.name}}\n")
+    content = os.urandom(max(1, size_mb * 1024 * 1024 // files))
+    for i in range(files):
+        (assets / f"asset-{i:04d}.bin").write_bytes(content)
+    return template
+
+
+def python_copy(src: pl.Path, dst: pl.Path) -> None:
+    """Copy every file through Python, as copier does for files it does not render."""
+    for path in src.rglob("*"):
+        target = dst / path.relative_to(src)
+        if path.is_dir():
+            target.mkdir(parents=True, exist_ok=True)
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(path.read_bytes())
+
+
+def timed(name: str, fn: Callable[[pl.Path], None], root: pl.Path, runs: int) -> None:
+    """Print the best time of ``runs`` calls of ``fn`` with a new output folder."""
+    best = float("inf")
+    for i in range(runs):
+        output_dir = root / f"{name}-{i}"
+        start = time.perf_counter()
+        fn(output_dir)
+        best = min(best, time.perf_counter() - start)
+        shutil.rmtree(output_dir)
+    print(f"{name:<16} {best:8.3f}s")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=300, help="Total size of the assets")
+    parser.add_argument("--files", type=int, default=200, help="Number of asset files")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per method, the best is kept")
+    parser.add_argument("--dir", type=pl.Path, default=None, help="Where to write the files")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir, prefix="tigr81-bench-") as tmp_dir:
+        root = pl.Path(tmp_dir)
+        template = make_template(root, args.size_mb, args.files)
+        assets = template / "{{cookiecutter.name}}" / "assets"
+        print(f"{args.files} assets, {tigr81_utils.pretty_size(args.size_mb * 1024 * 1024)}")
+
+        timed("python", lambda out: python_copy(assets, out), root, args.runs)
+        timed("shutil.copytree", lambda out: shutil.copytree(assets, out), root, args.runs)
+        timed("copy_tree", lambda out: tigr81_utils.copy_tree(assets, out), root, args.runs)
+        timed(
+            "cookiecutter",
+            lambda out: cookiecutter(str(template), output_dir=str(out), no_input=True),
+            root,
+            args.runs,
+        )
+
+
+if __name__ == "__main__":
+    main()
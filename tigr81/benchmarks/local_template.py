@@ -0,0 +1,90 @@
+"""Benchmark scaffolding a template folder with many small files.
+
+Builds a synthetic template of ``--files`` small files spread over nested
+folders, committed in a git repository, then times exporting it as a raw git
+template does (git archive streamed through tarfile), copying it with
+shutil.copytree, and copying it as a local template, with copies and with hard
+links.
+
+Usage: python benchmarks/local_template.py [--files 50000] [--per-dir 100] [--dir DIR]
+"""
+
+import argparse
+import os
+import pathlib as pl
+import shutil
+import subprocess
+import tempfile
+import time
+from typing import Callable
+
+import tigr81.commands.core.gitw as gitw
+from tigr81.commands.core.local import copy_local_template
+
+
+def make_template(root: pl.Path, files: int, per_dir: int) -> pl.Path:
+    """Write ``files`` files of 1 to 4 KiB, ``per_dir`` per folder, and commit them."""
+    template = root / "template"
+    for i in range(files):
+        folder = template / f"pkg-{i // (per_dir * per_dir):03d}" / f"mod-{i // per_dir:05d}"
+        if i % per_dir == 0:
+            folder.mkdir(parents=True)
+        (folder / f"file-{i:06d}.py").write_bytes(os.urandom(1024 * (1 + i % 4)))
+    for args in (["init", "-q", "-b", "main"], ["add", "-A"], ["commit", "-q", "-m", "template"]):
+        subprocess.run(  # noqa: S603
+            ["git", "-c", "user.name=bench", "-c", "user.email=bench@tigr81", *args],  # noqa: S607
+            cwd=template,
+            check=True,
+        )
+    return template
+
+
+def timed(name: str, fn: Callable[[pl.Path], None], root: pl.Path, runs: int) -> None:
+    """Print the best time of ``runs`` calls of ``fn`` with a new output folder."""
+    best = float("inf")
+    for i in range(runs):
+        output_dir = root / f"{name}-{i}"
+        start = time.perf_counter()
+        fn(output_dir)
+        best = min(best, time.perf_counter() - start)
+        shutil.rmtree(output_dir)
+    print(f"{name:<20} {best:8.3f}s")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=50000, help="Number of template files")
+    parser.add_argument("--per-dir", type=int, default=100, help="Files per folder")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per method, the best is kept")
+    parser.add_argument("--dir", type=pl.Path, default=None, help="Where to write the files")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir, prefix="tigr81-bench-") as tmp_dir:
+        root = pl.Path(tmp_dir)
+        template = make_template(root, args.files, args.per_dir)
+        print(f"{args.files} files, {os.cpu_count()} CPUs")
+
+        timed(
+            "raw_git (archive)",
+            lambda out: gitw.export_repo_directory(str(template), "main", pl.Path("."), out),
+            root,
+            args.runs,
+        )
+        timed(
+            "shutil.copytree",
+            lambda out: shutil.copytree(template, out, ignore=shutil.ignore_patterns(".git")),
+            root,
+            args.runs,
+        )
+        timed("local (copy)", lambda out: copy_local_template(template, out), root, args.runs)
+        timed(
+            "local (hardlink)",
+            lambda out: copy_local_template(template, out, hardlink=True),
+            root,
+            args.runs,
+        )
+
+
+if __name__ == "__main__":
+    main()
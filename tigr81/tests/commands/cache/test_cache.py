@@ -0,0 +1,52 @@
+import os
+
+from typer.testing import CliRunner
+
+from tests.conftest import GitRemote
+from tigr81.commands.core import mirror
+from tigr81.main import app
+
+runner = CliRunner()
+
+
+def test_cache_ls_empty(user_cache):
+    """Listing without mirrors."""
+    result = runner.invoke(app, ["cache", "ls"])
+    assert result.exit_code == 0
+    assert "No mirrors cached." in result.stdout
+
+
+def test_cache_ls(user_cache, git_remote: GitRemote):
+    """Cached mirrors are listed with their source URL."""
+    mirror.resolve_template_source(git_remote.url)
+
+    result = runner.invoke(app, ["cache", "ls"])
+
+    assert result.exit_code == 0
+    assert git_remote.url in result.stdout
+
+
+def test_cache_prune(user_cache, git_remote: GitRemote):
+    """Only mirrors not fetched within --older-than days are removed."""
+    path = mirror.sync_mirror(git_remote.url)
+
+    result = runner.invoke(app, ["cache", "prune", "--older-than", "1"])
+    assert result.exit_code == 0
+    assert path.exists()
+
+    old = path / mirror.MIRROR_STAMP_FILE_NAME
+    os.utime(old, (0, 0))
+    result = runner.invoke(app, ["cache", "prune", "--older-than", "1"])
+    assert result.exit_code == 0
+    assert "Pruned 1 mirrors." in result.stdout
+    assert not path.exists()
+
+
+def test_cache_clear(user_cache, git_remote: GitRemote):
+    """Every cache is removed."""
+    path = mirror.sync_mirror(git_remote.url)
+
+    result = runner.invoke(app, ["cache", "clear"])
+
+    assert result.exit_code == 0
+    assert not path.exists()
@@ -1,3 +1,7 @@
+import os
+import stat
+import sys
+
 import pytest
 
 
@@ -14,3 +18,32 @@ def mock_folders(tmp_path):
     return _tmp_dirs
 
 
+
+
+@pytest.fixture
+def fake_executable(tmp_path, monkeypatch):
+    """Factory of fake executables on PATH.
+
+    A fake executable prints "<name> (version 9.9.9)" for --version, otherwise
+    echoes its arguments on stdout, a line on stderr, and exits with
+    $FAKE_EXECUTABLE_RC.
+    """
+    if sys.platform == "win32":
+        pytest.skip("Fake executables are shell scripts")
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    def create(name: str):
+        executable = bin_dir / name
+        executable.write_text(
+            "#!/bin/sh\n"
+            f'if [ "$1" = "--version" ]; then echo "{name} (version 9.9.9)"; exit 0; fi\n'
+            'echo "line 1 $*"\n'
+            'echo "line 2" >&2\n'
+            'exit "${FAKE_EXECUTABLE_RC:-0}"\n'
+        )
+        executable.chmod(executable.stat().st_mode | stat.S_IEXEC)
+        return executable
+
+    return create
@@ -0,0 +1,268 @@
+import hashlib
+import http.server
+import io
+import os
+import pathlib as pl
+import stat
+import sys
+import tarfile
+import threading
+import zipfile
+from typing import Iterator, List
+
+import pytest
+from typer.testing import CliRunner
+
+import tigr81.commands.core.archive as archive
+import tigr81.commands.core.scaffold as scaffold_core
+from tigr81.commands.hub.models import HubTemplate, TemplateTypeEnum
+from tigr81.main import app
+
+FILES = {"app-1.0/README.md": b"hello\n", "app-1.0/bin/run.sh": b"#!/bin/sh\n"}
+
+
+def _tar_gz(path: pl.Path) -> pl.Path:
+    with tarfile.open(path, "w:gz") as tar:
+        for name, content in FILES.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            info.mode = 0o755 if name.endswith(".sh") else 0o644
+            tar.addfile(info, io.BytesIO(content))
+        link = tarfile.TarInfo("app-1.0/LINK.md")
+        link.type, link.linkname = tarfile.SYMTYPE, "README.md"
+        tar.addfile(link)
+    return path
+
+
+def _zip(path: pl.Path) -> pl.Path:
+    with zipfile.ZipFile(path, "w") as zip_file:
+        for name, content in FILES.items():
+            info = zipfile.ZipInfo(name)
+            info.external_attr = ((0o755 if name.endswith(".sh") else 0o644) | stat.S_IFREG) << 16
+            zip_file.writestr(info, content)
+    return path
+
+
+def _assert_extracted(output_dir: pl.Path) -> None:
+    assert (output_dir / "README.md").read_bytes() == b"hello\n"
+    if sys.platform != "win32":
+        assert os.access(output_dir / "bin" / "run.sh", os.X_OK)
+        assert not os.access(output_dir / "README.md", os.X_OK)
+
+
+class _Handler(http.server.SimpleHTTPRequestHandler):
+    """Serves files with an ETag and answers If-None-Match with 304."""
+
+    requests: List[str] = []
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+    def send_head(self):
+        path = pl.Path(self.translate_path(self.path))
+        if path.is_file():
+            etag = f'"{hashlib.sha256(path.read_bytes()).hexdigest()[:16]}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.requests.append("304")
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return None
+            self.requests.append("200")
+            self.send_response(200)
+            self.send_header("Content-Length", str(path.stat().st_size))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return open(path, "rb")  # noqa: SIM115
+        return super().send_head()
+
+
+@pytest.fixture
+def archive_server(tmp_path) -> Iterator[str]:
+    """Serve tmp_path/"served" over HTTP and yield its base URL."""
+    served = tmp_path / "served"
+    served.mkdir()
+    _Handler.requests = []
+
+    def handler(*args, **kwargs):
+        return _Handler(*args, directory=str(served), **kwargs)
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("make_archive", [_tar_gz, _zip], ids=["tar.gz", "zip"])
+def test_extract_archive(tmp_path: pl.Path, make_archive):
+    """Tarballs and zip files are extracted relative to the requested directory."""
+    path = make_archive(tmp_path / "app")
+
+    with archive.open_archive(str(path)) as f:
+        archive.extract_archive(f, tmp_path / "out", directory="app-1.0")
+
+    _assert_extracted(tmp_path / "out")
+    assert not (tmp_path / "out" / "app-1.0").exists()
+    if make_archive is _tar_gz and sys.platform != "win32":
+        assert os.readlink(tmp_path / "out" / "LINK.md") == "README.md"
+
+
+def test_extract_tar_zst(tmp_path: pl.Path):
+    """Zstandard compressed tarballs are extracted as a stream."""
+    zstandard = pytest.importorskip("zstandard")
+    raw = _tar_gz(tmp_path / "app.tar.gz")
+    with tarfile.open(raw) as tar_gz, open(tmp_path / "app.tar", "wb") as f:
+        with tarfile.open(fileobj=f, mode="w") as tar:
+            for member in tar_gz:
+                tar.addfile(member, tar_gz.extractfile(member) if member.isfile() else None)
+    (tmp_path / "app.tar.zst").write_bytes(
+        zstandard.ZstdCompressor().compress((tmp_path / "app.tar").read_bytes())
+    )
+
+    with archive.open_archive(str(tmp_path / "app.tar.zst")) as f:
+        archive.extract_archive(f, tmp_path / "out", directory="app-1.0")
+
+    _assert_extracted(tmp_path / "out")
+
+
+def test_open_archive_checks_sha256(tmp_path: pl.Path):
+    """Archives not matching the expected SHA-256 are refused."""
+    path = _tar_gz(tmp_path / "app.tar.gz")
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()
+
+    with archive.open_archive(path.as_uri(), sha256=digest.upper()) as f:
+        assert f.read(2) == b"\x1f\x8b"
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        with archive.open_archive(str(path), sha256="0" * 64):
+            pass
+
+
+@pytest.mark.parametrize("name", ["../evil.txt", "/etc/evil.txt", "link/evil.txt"])
+def test_extract_tar_stream_refuses_unsafe_paths(tmp_path, name):
+    """Members written outside of the output directory are refused."""
+    if sys.platform == "win32" and name.startswith("link"):
+        pytest.skip("Symbolic links need privileges on Windows")
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as tar:
+        link = tarfile.TarInfo("link")
+        link.type, link.linkname = tarfile.SYMTYPE, str(tmp_path)
+        tar.addfile(link)
+        member = tarfile.TarInfo(name)
+        member.size = 4
+        tar.addfile(member, io.BytesIO(b"evil"))
+    buffer.seek(0)
+
+    with tarfile.open(fileobj=buffer, mode="r|") as tar:
+        with pytest.raises(ValueError, match="Unsafe path"):
+            archive.extract_tar_stream(tar, tmp_path / "out")
+    assert not (tmp_path / "evil.txt").exists()
+
+
+@pytest.mark.parametrize("name", ["link/dir/", "link/dir/sub/file.txt"])
+@pytest.mark.skipif(sys.platform == "win32", reason="Symbolic links need privileges on Windows")
+def test_extract_refuses_folders_through_symlinks(tmp_path, name):
+    """Folders are not created through a symbolic link member pointing outside."""
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as tar:
+        link = tarfile.TarInfo("link")
+        link.type, link.linkname = tarfile.SYMTYPE, str(outside)
+        tar.addfile(link)
+        member = tarfile.TarInfo(name.rstrip("/"))
+        if name.endswith("/"):
+            member.type = tarfile.DIRTYPE
+            tar.addfile(member)
+        else:
+            member.size = 4
+            tar.addfile(member, io.BytesIO(b"evil"))
+    buffer.seek(0)
+
+    with tarfile.open(fileobj=buffer, mode="r|") as tar:
+        with pytest.raises(ValueError, match="Unsafe path"):
+            archive.extract_tar_stream(tar, tmp_path / "out")
+    assert [*outside.iterdir()] == []
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zip_file:
+        info = zipfile.ZipInfo("link")
+        info.external_attr = (0o777 | stat.S_IFLNK) << 16
+        zip_file.writestr(info, str(outside))
+        zip_file.writestr(name, b"" if name.endswith("/") else b"evil")
+
+    with zipfile.ZipFile(buffer) as zip_file:
+        with pytest.raises(ValueError, match="Unsafe path"):
+            archive.extract_zip(zip_file, tmp_path / "out-zip")
+    assert [*outside.iterdir()] == []
+
+
+def test_resolve_archive_source_conditional_download(
+    tmp_path: pl.Path, archive_server: str, user_cache: pl.Path
+):
+    """Remote archives are downloaded again only when they changed."""
+    served = _tar_gz(tmp_path / "served" / "app.tar.gz")
+    url = f"{archive_server}/app.tar.gz"
+
+    source = archive.resolve_archive_source(url)
+    assert pl.Path(source).read_bytes() == served.read_bytes()
+    assert archive.resolve_archive_source(url) == source
+    assert _Handler.requests == ["200", "304"]
+
+    FILES["app-1.0/README.md"] = b"changed\n"
+    try:
+        _tar_gz(served)
+    finally:
+        FILES["app-1.0/README.md"] = b"hello\n"
+    assert pl.Path(archive.resolve_archive_source(url)).read_bytes() == served.read_bytes()
+    assert _Handler.requests == ["200", "304", "200"]
+
+
+def test_resolve_archive_source_offline(tmp_path: pl.Path, archive_server: str, user_cache: pl.Path):
+    """The cached copy is used when the server is unreachable, the URL without one."""
+    _tar_gz(tmp_path / "served" / "app.tar.gz")
+    url = f"{archive_server}/app.tar.gz"
+    source = archive.resolve_archive_source(url)
+    (tmp_path / "served" / "app.tar.gz").unlink()
+
+    assert archive.resolve_archive_source(url) == source
+    assert archive.resolve_archive_source(f"{archive_server}/missing.zip").endswith("missing.zip")
+
+
+def test_scaffold_hub_template_archive(
+    tmp_path: pl.Path, archive_server: str, monkeypatch: pytest.MonkeyPatch
+):
+    """Archive hub templates are extracted into a folder named after the archive."""
+    _zip(tmp_path / "served" / "app.zip")
+    monkeypatch.chdir(tmp_path)
+    hub_template = HubTemplate(
+        name="app",
+        template=f"{archive_server}/app.zip",
+        directory="app-1.0",
+        template_type=TemplateTypeEnum.ARCHIVE,
+        sha256=hashlib.sha256((tmp_path / "served" / "app.zip").read_bytes()).hexdigest(),
+    )
+
+    scaffold_core.scaffold_hub_template(hub_template, default=True)
+
+    _assert_extracted(tmp_path / "app")
+
+
+def test_scaffold_archive_url_cli(tmp_path: pl.Path):
+    """`tigr81 scaffold --archive-url` extracts the archive and reports checksum errors."""
+    path = _tar_gz(tmp_path / "app.tar.gz")
+    runner = CliRunner()
+
+    result = runner.invoke(
+        app,
+        ["scaffold", "--archive-url", str(path), "--directory", "app-1.0", "--output-dir", str(tmp_path / "out")],
+    )
+    assert result.exit_code == 0, result.output
+    _assert_extracted(tmp_path / "out")
+
+    result = runner.invoke(
+        app, ["scaffold", "--archive-url", str(path), "--sha256", "0" * 64]
+    )
+    assert result.exit_code == 1
+    assert "Checksum mismatch" in result.output
@@ -1,10 +1,17 @@
+import os
 import pathlib as pl
+import stat
 import subprocess
+import sys
 
+import pytest
 from pytest_mock import MockerFixture
 
+import tigr81.commands.core.gitw as gitw
+from tests.conftest import run_git
 from tigr81.commands.core.gitw import (
     clone_repo_directory,
+    export_repo_directory,
     get_author_info,
     get_latest_tag,
 )
@@ -57,29 +64,62 @@ def test_get_author_info(mocker: MockerFixture):
 Unit tests for clone_repo_directory
 """
 
+def _fetch_call(work_dir, checkout="main"):
+    return [
+        "git",
+        "-C",
+        str(work_dir),
+        "fetch",
+        "--quiet",
+        "--depth",
+        "1",
+        "--filter=blob:none",
+        "origin",
+        checkout,
+    ]
+
+
+def _mock_git(mocker: MockerFixture):
+    """Mock subprocess.run, creating the directories of ``git init`` calls."""
+
+    def run(args, **kwargs):
+        if args[:2] == ["git", "init"]:
+            (pl.Path(args[-1]) / ".git").mkdir(parents=True)
+        return mocker.MagicMock(stdout="", returncode=0)
+
+    return mocker.patch("subprocess.run", side_effect=run)
+
+
+def _work_dir(mock_spr) -> str:
+    """The temporary directory the repository was cloned in."""
+    return mock_spr.call_args_list[0].args[0][-1]
+
+
 def test_clone_directory_entire_repo(mocker: MockerFixture, mock_repo_url, mock_folders):
     """Test clone_directory for an entire repo."""
     checkout = ""
     directory = pl.Path(".")
     output_dir = mock_folders[0]
 
-    git_dir = output_dir / ".git"
-    git_dir.mkdir()
-
-    mock_spr = mocker.patch("subprocess.run")
+    mock_spr = _mock_git(mocker)
     clone_repo_directory(
         repo_url=mock_repo_url,
         checkout=checkout,
         directory=directory,
         output_dir=output_dir
     )
+    work_dir = _work_dir(mock_spr)
+    assert not pl.Path(work_dir).is_relative_to(output_dir)
     mock_spr.assert_any_call(
-        ["git", "clone", "--no-checkout", mock_repo_url, str(output_dir)], check=True
+        ["git", "-C", work_dir, "remote", "add", "origin", mock_repo_url],
+        check=True,
     )
+    mock_spr.assert_any_call(_fetch_call(work_dir), check=True)
     mock_spr.assert_any_call(
-        ["git", "-C", str(output_dir), "checkout", "main"], check=True
+        ["git", "-C", work_dir, "checkout", "--quiet", "FETCH_HEAD"], check=True
     )
-
+    assert not (output_dir / ".git").exists()
+    assert not pl.Path(work_dir).exists()
 
 
 def test_clone_directory_sub_repo(mocker: MockerFixture, mock_repo_url, mock_folders):
@@ -88,26 +128,245 @@ def test_clone_directory_sub_repo(mocker: MockerFixture, mock_repo_url, mock_fol
     directory = mock_folders[0]
     output_dir = mock_folders[1]
 
-    git_dir = output_dir / ".git"
-    git_dir.mkdir()
-
-    sparse_checkout_file = git_dir / "info" / "sparse-checkout"
-    sparse_checkout_file.parent.mkdir(parents=True, exist_ok=True)
-    sparse_checkout_file.touch()
-    
-    mock_spr = mocker.patch("subprocess.run")
+    mock_spr = _mock_git(mocker)
     clone_repo_directory(
         repo_url=mock_repo_url,
         checkout=checkout,
         directory=directory,
         output_dir=output_dir
     )
+    work_dir = _work_dir(mock_spr)
     mock_spr.assert_any_call(
-        ["git", "clone", "--no-checkout", mock_repo_url, str(output_dir)], check=True
+        ["git", "-C", work_dir, "sparse-checkout", "set", "--cone", str(directory)],
+        check=True,
     )
+    mock_spr.assert_any_call(_fetch_call(work_dir), check=True)
     mock_spr.assert_any_call(
-        ["git", "-C", str(output_dir), "config", "core.sparseCheckout", "true"], check=True
+        ["git", "-C", work_dir, "checkout", "--quiet", "FETCH_HEAD"], check=True
+    )
+
+
+def test_clone_directory_from_source(
+    mocker: MockerFixture, mock_repo_url, tmp_path, monkeypatch
+):
+    """The repository is fetched from source while repo_url names the output directory."""
+    monkeypatch.chdir(tmp_path)
+    mock_spr = _mock_git(mocker)
+
+    clone_repo_directory(
+        repo_url=mock_repo_url,
+        checkout="v1",
+        directory=pl.Path("."),
+        output_dir=pl.Path("."),
+        source="file:///mirror.git",
     )
+
+    work_dir = _work_dir(mock_spr)
     mock_spr.assert_any_call(
-        ["git", "-C", str(output_dir), "checkout", "main"], check=True
-    )
\ No newline at end of file
+        ["git", "-C", work_dir, "remote", "add", "origin", "file:///mirror.git"],
+        check=True,
+    )
+    mock_spr.assert_any_call(_fetch_call(work_dir, "v1"), check=True)
+    assert (tmp_path / "ranged-heap").is_dir()
+
+
+def test_clone_directory_rejects_remote_abbreviated_sha(
+    mocker: MockerFixture, mock_repo_url, tmp_path
+):
+    """Abbreviated SHAs cannot be fetched by name from a remote repository."""
+    mocker.patch.object(gitw.refs, "ls_remote", return_value={"refs/heads/main": "a" * 40})
+    mock_spr = _mock_git(mocker)
+
+    with pytest.raises(ValueError, match="abbreviated commit 'deadbeef'"):
+        clone_repo_directory(
+            repo_url=mock_repo_url,
+            checkout="deadbeef",
+            directory=pl.Path("."),
+            output_dir=tmp_path / "out",
+        )
+    mock_spr.assert_not_called()
+
+
+def test_clone_directory_local_remote(tmp_path, git_remote):
+    """Only the requested directory is checked out and no .git folder is left."""
+    git_remote.commit({"other/big.txt": "x" * 10_000, "sub/deep/inner.txt": "inner\n"})
+    output_dir = tmp_path / "out"
+
+    stats = clone_repo_directory(
+        repo_url=git_remote.url,
+        checkout="main",
+        directory=pl.Path("sub"),
+        output_dir=output_dir,
+    )
+
+    assert (output_dir / "sub" / "file.txt").read_text() == "sub\n"
+    assert (output_dir / "sub" / "deep" / "inner.txt").exists()
+    assert not (output_dir / "other").exists()
+    assert not (output_dir / "README.md").exists()
+    assert not (output_dir / ".git").exists()
+    assert stats.bytes_transferred > 0
+    assert stats.elapsed > 0
+
+
+def test_clone_directory_keeps_existing_repository(tmp_path, git_remote):
+    """Cloning into a git repository adds the files and keeps its history."""
+    output_dir = tmp_path / "project"
+    output_dir.mkdir()
+    run_git("init", "--quiet", cwd=output_dir)
+    (output_dir / "own.txt").write_text("own\n")
+    run_git("add", "own.txt", cwd=output_dir)
+    run_git("commit", "--quiet", "-m", "own", cwd=output_dir)
+
+    clone_repo_directory(
+        repo_url=git_remote.url,
+        checkout="main",
+        directory=pl.Path("sub"),
+        output_dir=output_dir,
+    )
+
+    assert (output_dir / "sub" / "file.txt").read_text() == "sub\n"
+    assert run_git("log", "--format=%s", cwd=output_dir) == "own"
+    assert run_git("status", "--porcelain", cwd=output_dir) == "?? sub/"
+
+
+def test_clone_directory_abbreviated_sha_from_mirror(tmp_path, git_remote):
+    """Abbreviated SHAs are resolved in local sources before being fetched."""
+    commit = git_remote.commit({"README.md": "pinned\n"})
+    git_remote.commit({"README.md": "moved\n"})
+    output_dir = tmp_path / "out"
+
+    clone_repo_directory(
+        repo_url="https://example.com/template.git",
+        checkout=commit[:10],
+        directory=pl.Path("."),
+        output_dir=output_dir,
+        source=git_remote.url,
+    )
+
+    assert (output_dir / "README.md").read_text() == "pinned\n"
+
+
+def test_get_latest_tag_with_prefixed_and_pre_release_tags(mocker: MockerFixture):
+    """Prefixed and pre-release tags are ordered instead of crashing."""
+    result = mocker.Mock()
+    result.stdout.splitlines = lambda: [
+        "d62d84456a68d6359c5c8e5504a1611724cfa4fd        refs/tags/v1.10.0",
+        "8976f04faad06c0b437cae48669af82990365e55        refs/tags/v1.9.0",
+        "8976f04faad06c0b437cae48669af82990365e56        refs/tags/v2.0.0-rc.1",
+        "8976f04faad06c0b437cae48669af82990365e57        refs/tags/nightly",
+    ]
+    mocker.patch("subprocess.run", return_value=result)
+    assert get_latest_tag("https://some-repo.gitw") == "v1.10.0"
+
+
+"""
+Unit tests for export_repo_directory
+"""
+
+def test_export_directory_local_remote(tmp_path, git_remote):
+    """Only the requested directory is exported, with executable bits and symlinks."""
+    git_remote.commit({"other/big.txt": "x" * 10_000, "sub/deep/run.sh": "#!/bin/sh\n"})
+    script = git_remote.work / "sub" / "deep" / "run.sh"
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    run_git("update-index", "--chmod=+x", "sub/deep/run.sh", cwd=git_remote.work)
+    if sys.platform != "win32":
+        os.symlink("file.txt", git_remote.work / "sub" / "link.txt")
+    commit = git_remote.commit({}, message="exec and link")
+    output_dir = tmp_path / "out"
+
+    stats = export_repo_directory(
+        repo_url=git_remote.url,
+        checkout=commit,
+        directory=pl.Path("sub"),
+        output_dir=output_dir,
+    )
+
+    assert sorted(p.name for p in output_dir.iterdir()) == ["sub"]
+    assert (output_dir / "sub" / "file.txt").read_text() == "sub\n"
+    if sys.platform != "win32":
+        assert os.access(output_dir / "sub" / "deep" / "run.sh", os.X_OK)
+        assert not os.access(output_dir / "sub" / "file.txt", os.X_OK)
+        assert os.readlink(output_dir / "sub" / "link.txt") == "file.txt"
+    assert stats.bytes_transferred > 0
+
+
+def test_export_directory_falls_back_to_clone(tmp_path, mocker: MockerFixture, mock_repo_url):
+    """Repositories that cannot be archived are cloned."""
+    mocker.patch(
+        "tigr81.commands.core.gitw._archive_command",
+        return_value=[sys.executable, "-c", "raise SystemExit(1)"],
+    )
+    clone = mocker.patch("tigr81.commands.core.gitw.clone_repo_directory")
+
+    export_repo_directory(
+        repo_url=mock_repo_url,
+        checkout="v1",
+        directory=pl.Path("."),
+        output_dir=tmp_path,
+        source="https://example.com/repo.git",
+    )
+
+    clone.assert_called_once_with(
+        repo_url=mock_repo_url,
+        checkout="v1",
+        directory=pl.Path("."),
+        output_dir=tmp_path,
+        source="https://example.com/repo.git",
+    )
+
+
+@pytest.mark.parametrize(
+    "checkout, directory",
+    [("missing-branch", "sub"), ("main", "missing-dir")],
+    ids=["checkout", "directory"],
+)
+def test_export_directory_missing_in_local_repo(tmp_path, git_remote, checkout, directory):
+    """A missing checkout or directory of a local repository is an error, not an empty export."""
+    with pytest.raises(subprocess.CalledProcessError) as excinfo:
+        export_repo_directory(
+            repo_url=git_remote.url,
+            checkout=checkout,
+            directory=pl.Path(directory),
+            output_dir=tmp_path / "out",
+        )
+
+    assert excinfo.value.stderr
+    assert not (tmp_path / "out").exists()
+
+
+def test_export_directory_partial_archive(tmp_path, mocker: MockerFixture):
+    """Git failing after writing part of the archive is an error, even to a remote."""
+    script = (
+        "import io, sys, tarfile\n"
+        "with tarfile.open(fileobj=sys.stdout.buffer, mode='w|') as tar:\n"
+        "    info = tarfile.TarInfo('README.md')\n"
+        "    tar.addfile(info, io.BytesIO())\n"
+        "sys.stdout.flush()\n"
+        "sys.exit('fatal: the remote end hung up unexpectedly')\n"
+    )
+    mocker.patch(
+        "tigr81.commands.core.gitw._archive_command",
+        return_value=[sys.executable, "-c", script],
+    )
+    clone = mocker.patch("tigr81.commands.core.gitw.clone_repo_directory")
+
+    with pytest.raises(subprocess.CalledProcessError, match="exit status 1") as excinfo:
+        export_repo_directory(
+            repo_url="https://example.com/repo.git",
+            checkout="main",
+            directory=pl.Path("."),
+            output_dir=tmp_path / "out",
+        )
+
+    assert "hung up" in excinfo.value.stderr
+    clone.assert_not_called()
+
+
+def test_archive_command(tmp_path):
+    """Local repositories are archived in place, others through upload-archive."""
+    assert gitw._archive_command(tmp_path.as_uri(), "main", pl.Path("sub")) == [
+        "git", "-C", str(tmp_path), "archive", "--format=tar", "main", "--", "sub"
+    ]
+    assert gitw._archive_command("ssh://host/repo.git", "v1", pl.Path(".")) == [
+        "git", "archive", "--format=tar", "--remote=ssh://host/repo.git", "v1"
+    ]
@@ -0,0 +1,111 @@
+import os
+import pathlib as pl
+import stat
+import sys
+
+import pytest
+
+import tigr81.commands.core.scaffold as scaffold_core
+from tigr81.commands.core.local import IgnoreRules, copy_local_template
+from tigr81.commands.hub.models import HubTemplate, TemplateTypeEnum
+
+
+@pytest.fixture
+def local_template(tmp_path: pl.Path) -> pl.Path:
+    """A template folder with nested files, a git folder and an ignore file."""
+    template = tmp_path / "template"
+    files = {
+        "README.md": "readme\n",
+        "src/app/main.py": "print('app')\n",
+        "src/app/build/out.o": "binary",
+        "assets/logo.png": "png",
+        "notes.log": "log",
+        "keep.log": "keep",
+        ".git/HEAD": "ref: refs/heads/main\n",
+        ".tigr81ignore": "# generated files\n*.log\n!keep.log\nbuild/\n/assets/*.png\n",
+    }
+    for name, content in files.items():
+        (template / name).parent.mkdir(parents=True, exist_ok=True)
+        (template / name).write_text(content)
+    script = template / "src" / "run.sh"
+    script.write_text("#!/bin/sh\n")
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    return template
+
+
+@pytest.mark.parametrize(
+    "path, is_dir, ignored",
+    [
+        ("notes.log", False, True),
+        ("deep/nested/notes.log", False, True),
+        ("keep.log", False, False),
+        ("build", True, True),
+        ("src/build", True, True),
+        ("build", False, False),
+        ("assets/logo.png", False, True),
+        ("other/assets/logo.png", False, False),
+        (".git", True, True),
+        ("README.md", False, False),
+    ],
+)
+def test_ignore_rules(path: str, is_dir: bool, ignored: bool):
+    """Patterns follow the gitignore syntax."""
+    rules = IgnoreRules(
+        [".git/", "# comment", "", "*.log", "!keep.log", "build/", "/assets/*.png"]
+    )
+    assert rules.ignored(path, is_dir) is ignored
+
+
+def test_copy_local_template(tmp_path: pl.Path, local_template: pl.Path):
+    """Files are copied except the ignored ones, merged into existing folders."""
+    output_dir = tmp_path / "out"
+    (output_dir / "src").mkdir(parents=True)
+    (output_dir / "src" / "existing.py").write_text("")
+    (output_dir / "README.md").write_text("old")
+    if sys.platform != "win32":
+        os.symlink("README.md", local_template / "LINK.md")
+
+    copied = copy_local_template(local_template, output_dir, jobs=4)
+
+    assert copied == 4
+    assert (output_dir / "README.md").read_text() == "readme\n"
+    assert (output_dir / "src" / "app" / "main.py").read_text() == "print('app')\n"
+    assert (output_dir / "keep.log").exists()
+    assert (output_dir / "src" / "existing.py").exists()
+    for ignored in ["notes.log", "src/app/build", "assets/logo.png", ".git", ".tigr81ignore"]:
+        assert not (output_dir / ignored).exists()
+    if sys.platform != "win32":
+        assert os.access(output_dir / "src" / "run.sh", os.X_OK)
+        assert os.readlink(output_dir / "LINK.md") == "README.md"
+
+
+def test_copy_local_template_hardlink(tmp_path: pl.Path, local_template: pl.Path):
+    """Hard linked files share their content with the template."""
+    output_dir = tmp_path / "out"
+    copy_local_template(local_template, output_dir, hardlink=True)
+
+    assert (output_dir / "README.md").stat().st_ino == (local_template / "README.md").stat().st_ino
+
+
+def test_copy_local_template_into_itself(local_template: pl.Path):
+    """Copying a template into one of its folders is refused."""
+    with pytest.raises(ValueError, match="into itself"):
+        copy_local_template(local_template, local_template / "out")
+
+
+def test_scaffold_hub_template_local(
+    tmp_path: pl.Path, local_template: pl.Path, monkeypatch: pytest.MonkeyPatch
+):
+    """Local hub templates are copied into a folder named after their directory."""
+    monkeypatch.chdir(tmp_path)
+    hub_template = HubTemplate(
+        name="app",
+        template=str(local_template),
+        directory="src",
+        template_type=TemplateTypeEnum.LOCAL,
+    )
+
+    scaffold_core.scaffold_hub_template(hub_template)
+
+    assert (tmp_path / "src" / "app" / "main.py").exists()
+    assert not (tmp_path / "src" / "README.md").exists()
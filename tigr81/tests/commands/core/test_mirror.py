@@ -0,0 +1,146 @@
+import os
+import pathlib as pl
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pytest_mock import MockerFixture
+
+from tests.conftest import GitRemote, run_git
+from tigr81.commands.core import mirror
+
+"""
+Unit tests for is_remote_repo
+"""
+
+
+@pytest.mark.parametrize(
+    "template, expected",
+    [
+        ("https://github.com/org/repo", True),
+        ("git@github.com:org/repo.git", True),
+        ("file:///tmp/repo.git", True),
+        ("git+https://example.com/repo", True),
+        ("/home/user/template", False),
+        ("relative/template", False),
+    ],
+)
+def test_is_remote_repo(template, expected):
+    """Only git URLs are mirrored."""
+    assert mirror.is_remote_repo(template) == expected
+
+
+"""
+Unit tests for sync_mirror
+"""
+
+
+def test_sync_mirror_clones_once(tmp_path: pl.Path, git_remote: GitRemote):
+    """The first sync creates a bare mirror with every branch of the remote."""
+    path = mirror.sync_mirror(git_remote.url, ttl=3600, mirrors_location=tmp_path)
+
+    assert path == mirror.get_mirror_path(git_remote.url, tmp_path)
+    assert run_git("--git-dir", str(path), "rev-parse", "main") == run_git(
+        "rev-parse", "HEAD", cwd=git_remote.work
+    )
+    assert (path / mirror.MIRROR_STAMP_FILE_NAME).read_text() == git_remote.url
+    assert run_git("--git-dir", str(path), "config", "uploadpack.allowFilter") == "true"
+
+
+def test_sync_mirror_fetches_only_when_stale(tmp_path: pl.Path, git_remote: GitRemote):
+    """A fresh mirror is reused as is, a stale one is fetched incrementally."""
+    path = mirror.sync_mirror(git_remote.url, ttl=3600, mirrors_location=tmp_path)
+    old_sha = run_git("--git-dir", str(path), "rev-parse", "main")
+    new_sha = git_remote.commit({"new.txt": "new\n"})
+
+    mirror.sync_mirror(git_remote.url, ttl=3600, mirrors_location=tmp_path)
+    assert run_git("--git-dir", str(path), "rev-parse", "main") == old_sha
+
+    mirror.sync_mirror(git_remote.url, ttl=0, mirrors_location=tmp_path)
+    assert run_git("--git-dir", str(path), "rev-parse", "main") == new_sha
+
+
+def test_sync_mirror_concurrently(tmp_path: pl.Path, git_remote: GitRemote, mocker: MockerFixture):
+    """Concurrent syncs of a new mirror clone it once, the others wait and reuse it."""
+    clone = mocker.spy(mirror, "_clone_mirror")
+    fetch = mocker.spy(mirror, "_git")
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        paths = set(
+            executor.map(
+                lambda _: mirror.sync_mirror(git_remote.url, ttl=3600, mirrors_location=tmp_path),
+                range(4),
+            )
+        )
+
+    assert paths == {mirror.get_mirror_path(git_remote.url, tmp_path)}
+    assert clone.call_count == 1
+    assert not [call for call in fetch.call_args_list if "fetch" in call.args[0]]
+    assert [p.name for p in tmp_path.iterdir() if p.name.endswith(".tmp")] == []
+
+
+def test_get_mirror_ttl(monkeypatch):
+    """The TTL is read from TIGR81_MIRROR_TTL."""
+    assert mirror.get_mirror_ttl() == mirror.DEFAULT_MIRROR_TTL
+    monkeypatch.setenv("TIGR81_MIRROR_TTL", "10")
+    assert mirror.get_mirror_ttl() == 10
+
+
+"""
+Unit tests for resolve_template_source
+"""
+
+
+def test_resolve_template_source_cache_disabled(git_remote: GitRemote):
+    """Without caches templates are used as given."""
+    assert mirror.resolve_template_source(git_remote.url) == git_remote.url
+
+
+def test_resolve_template_source_uses_mirror(user_cache, git_remote: GitRemote):
+    """Remote templates are served from their local mirror."""
+    source = mirror.resolve_template_source(git_remote.url)
+
+    assert source == mirror.get_mirror_path(git_remote.url).as_uri()
+    assert source.endswith(".git")
+
+
+def test_resolve_template_source_local_dir(user_cache, tmp_path: pl.Path):
+    """Local templates are never mirrored."""
+    assert mirror.resolve_template_source(str(tmp_path)) == str(tmp_path)
+
+
+def test_resolve_template_source_stale_fallback(
+    user_cache, mocker: MockerFixture, git_remote: GitRemote, monkeypatch
+):
+    """A mirror that cannot be refreshed is still used."""
+    source = mirror.resolve_template_source(git_remote.url)
+    git_remote.path.rename(git_remote.path.with_suffix(".moved"))
+    monkeypatch.setenv("TIGR81_MIRROR_TTL", "0")
+
+    assert mirror.resolve_template_source(git_remote.url) == source
+
+
+def test_resolve_template_source_unreachable(user_cache, tmp_path: pl.Path):
+    """Without a mirror an unreachable remote is returned unchanged."""
+    url = (tmp_path / "missing.git").as_uri()
+    assert mirror.resolve_template_source(url) == url
+
+
+"""
+Unit tests for list_mirrors
+"""
+
+
+def test_list_mirrors(tmp_path: pl.Path, git_remote: GitRemote):
+    """Mirrors are listed with their source URL, last fetch time and size."""
+    assert mirror.list_mirrors(tmp_path / "none") == []
+    path = mirror.sync_mirror(git_remote.url, mirrors_location=tmp_path)
+    stamp = path / mirror.MIRROR_STAMP_FILE_NAME
+    os.utime(stamp, (time.time() - 60, time.time() - 60))
+
+    (cached,) = mirror.list_mirrors(tmp_path)
+
+    assert cached.url == git_remote.url
+    assert cached.path == path
+    assert cached.size > 0
+    assert cached.fetched_at == stamp.stat().st_mtime
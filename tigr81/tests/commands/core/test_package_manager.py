@@ -0,0 +1,87 @@
+import pytest
+import typer
+from pytest_mock import MockerFixture
+
+from tigr81.commands.core.package_manager import (
+    PackageManagerEnum,
+    get_package_manager,
+    probe_executable,
+)
+from tigr81.commands.core.poetry_pm import PoetryPM
+from tigr81.commands.core.uv_pm import UvPM
+
+
+@pytest.fixture(autouse=True)
+def clear_probes():
+    """Forget the executables found by previous tests."""
+    probe_executable.cache_clear()
+    yield
+    probe_executable.cache_clear()
+
+
+@pytest.mark.parametrize(
+    "name, cls",
+    [(PackageManagerEnum.POETRY, PoetryPM), (PackageManagerEnum.UV, UvPM), ("uv", UvPM)],
+)
+def test_get_package_manager(fake_executable, name, cls):
+    """Package managers are selected by name."""
+    fake_executable(str(name))
+
+    assert isinstance(get_package_manager(name), cls)
+
+
+def test_get_package_manager_unknown():
+    """Unknown package managers are rejected."""
+    with pytest.raises(ValueError):
+        get_package_manager("pip")
+
+
+def test_get_package_manager_not_installed(mocker: MockerFixture):
+    """A missing executable exits."""
+    mocker.patch("shutil.which", return_value=None)
+
+    with pytest.raises(typer.Exit):
+        get_package_manager(PackageManagerEnum.UV)
+
+
+@pytest.mark.parametrize(
+    "call, expected",
+    [
+        (lambda pm, cwd: pm.install(cwd), "line 1 sync"),
+        (lambda pm, cwd: pm.remove(cwd, "requests"), "line 1 remove requests"),
+        (
+            lambda pm, cwd: pm.add_path_dependency(cwd, "../lib"),
+            "line 1 add --editable ../lib",
+        ),
+        (lambda pm, cwd: pm.lock(cwd), "line 1 lock"),
+    ],
+)
+def test_uv_pm_commands(fake_executable, tmp_path, capsys, call, expected):
+    """UvPM maps every command to the uv command line."""
+    fake_executable("uv")
+    pm = UvPM()
+
+    call(pm, tmp_path)
+
+    assert f"[{tmp_path.name}] {expected}\n" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize(
+    "call, expected",
+    [
+        (lambda pm, cwd: pm.install(cwd), "line 1 install"),
+        (
+            lambda pm, cwd: pm.add_path_dependency(cwd, "../lib"),
+            "line 1 add --editable ../lib",
+        ),
+        (lambda pm, cwd: pm.lock(cwd), "line 1 lock"),
+    ],
+)
+def test_poetry_pm_commands(fake_executable, tmp_path, capsys, call, expected):
+    """PoetryPM maps every command to the poetry command line."""
+    fake_executable("poetry")
+    pm = PoetryPM()
+
+    call(pm, tmp_path)
+
+    assert f"[{tmp_path.name}] {expected}\n" in capsys.readouterr().out
@@ -1,13 +1,23 @@
 import functools
+import os
 import subprocess
 
 import pytest
 import typer
 from pytest_mock import MockerFixture
 
+from tigr81.commands.core.package_manager import probe_executable
 from tigr81.commands.core.poetry_pm import PoetryPM
 
 
+@pytest.fixture(autouse=True)
+def clear_poetry_probe():
+    """Forget the Poetry executable found by previous tests."""
+    probe_executable.cache_clear()
+    yield
+    probe_executable.cache_clear()
+
+
 @pytest.fixture
 def mock_poetry_pm(mocker: MockerFixture):
     """Fixture to create a PoetryPM instance with a mocked poetry executable."""
@@ -18,6 +28,12 @@ def mock_poetry_pm(mocker: MockerFixture):
     return PoetryPM()
 
 
+@pytest.fixture
+def fake_poetry(fake_executable):
+    """A fake `poetry` executable on PATH."""
+    return fake_executable("poetry")
+
+
 def test_poetry_initialization_success(mocker: MockerFixture):
     """Test PoetryPM initialization success."""
     result = mocker.Mock()
@@ -34,16 +50,41 @@ def test_poetry_initialization_failure(mocker: MockerFixture):
         PoetryPM()
 
 
+def test_poetry_probe_runs_once_per_process(mocker: MockerFixture):
+    """Poetry is looked up and probed only once, however many PoetryPM are built."""
+    result = mocker.Mock()
+    result.stdout = "Poetry (version 1.3.2)"
+    mock_run = mocker.patch("subprocess.run", return_value=result)
+    mock_which = mocker.patch("shutil.which", return_value="/usr/local/bin/poetry")
+
+    PoetryPM()
+    PoetryPM()
+
+    mock_which.assert_called_once()
+    mock_run.assert_called_once()
+
+
+def test_poetry_probe_disk_cache(fake_poetry, user_cache, mocker: MockerFixture):
+    """The version is cached on disk until the executable changes."""
+    assert probe_executable("poetry").version == "poetry (version 9.9.9)"
+    probe_executable.cache_clear()
+    mock_run = mocker.patch("subprocess.run", wraps=subprocess.run)
+
+    assert probe_executable("poetry").version == "poetry (version 9.9.9)"
+    mock_run.assert_not_called()
+
+    os.utime(fake_poetry, ns=(0, 0))
+    probe_executable.cache_clear()
+    probe_executable("poetry")
+    mock_run.assert_called_once()
+
+
 @pytest.mark.parametrize(
     "returncode, side_effect, should_raise_exception",
     [
         (0, None, False),  # Success case, no exception
         (1, None, True),  # Failure with return code 1, should raise exception
-        (
-            1,
-            subprocess.CalledProcessError(returncode=1, cmd=""),
-            True,
-        ),  # Failure due to exception
+        (1, FileNotFoundError(), True),  # Failure to start poetry
     ],
 )
 def test_poetry_command(
@@ -54,12 +95,14 @@ def test_poetry_command(
     should_raise_exception,
 ):
     """Test poetry PM install and remove with different return codes and exceptions."""
-    result = mocker.Mock()
-    result.returncode = returncode
+    process = mocker.MagicMock()
+    process.__enter__.return_value = process
+    process.stdout = ["output\n"]
+    process.returncode = returncode
 
-    mock_run = mocker.patch("subprocess.run", return_value=result)
+    mock_popen = mocker.patch("subprocess.Popen", return_value=process)
     if side_effect:
-        mock_run.side_effect = side_effect
+        mock_popen.side_effect = side_effect
 
     # Test both `install` and `remove` commands
     for command in [
@@ -71,3 +114,24 @@ def test_poetry_command(
                 command(".")
         else:
             command(".")
+
+
+def test_poetry_command_streams_prefixed_output(fake_poetry, tmp_path, capsys):
+    """Output lines of both streams are echoed with the component name."""
+    component = tmp_path / "my-component"
+    component.mkdir()
+
+    PoetryPM().install(component)
+
+    out = capsys.readouterr().out
+    assert "[my-component] line 1 install\n" in out
+    assert "[my-component] line 2\n" in out
+
+
+def test_poetry_command_failure_exit_code(fake_poetry, tmp_path, monkeypatch):
+    """A non zero exit code of poetry makes the command fail."""
+    monkeypatch.setenv("FAKE_EXECUTABLE_RC", "3")
+
+    with pytest.raises(typer.Exit):
+        PoetryPM().remove(tmp_path, "requests")
+
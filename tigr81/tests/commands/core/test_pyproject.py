@@ -0,0 +1,95 @@
+import pathlib as pl
+
+import pytest
+
+from tigr81.commands.core.pyproject import normalize_name, remove_dependency
+
+PYPROJECT = """\
+[project]
+name = "app"
+dependencies = [
+    "requests>=2",
+    "my_lib @ file:///x/my-lib",  # local
+    "my-lib-extra",
+]
+
+[project.optional-dependencies]
+dev = ["pytest", "My.Lib[extra]>=1"]
+
+[tool.poetry.dependencies]
+python = "^3.9"
+my-lib = {path = "../my-lib", develop = true}
+"my_lib_extra" = "^1"
+
+[tool.poetry.group.dev.dependencies]
+my-lib = {path = "../my-lib"}
+
+[tool.uv.sources]
+my-lib = { path = "../my-lib", editable = true }
+
+[tool.other]
+my-lib = 1
+"""
+
+EXPECTED = """\
+[project]
+name = "app"
+dependencies = [
+    "requests>=2",
+    "my-lib-extra",
+]
+
+[project.optional-dependencies]
+dev = ["pytest", ]
+
+[tool.poetry.dependencies]
+python = "^3.9"
+"my_lib_extra" = "^1"
+
+[tool.poetry.group.dev.dependencies]
+
+[tool.uv.sources]
+
+[tool.other]
+my-lib = 1
+"""
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [("my_lib", "my-lib"), ("My.Lib", "my-lib"), ("my--lib__x", "my-lib-x")],
+)
+def test_normalize_name(name: str, expected: str):
+    """Names are normalized as in PEP 503."""
+    assert normalize_name(name) == expected
+
+
+def test_remove_dependency(tmp_path: pl.Path):
+    """The dependency is removed from every dependency table and array only."""
+    pyproject_path = tmp_path / "pyproject.toml"
+    pyproject_path.write_text(PYPROJECT)
+
+    assert remove_dependency(pyproject_path, "my-lib")
+    assert pyproject_path.read_text() == EXPECTED
+
+
+def test_remove_dependency_keeps_unrelated_comments(tmp_path: pl.Path):
+    """Comments and blank lines of the array are kept."""
+    pyproject_path = tmp_path / "pyproject.toml"
+    pyproject_path.write_text(
+        '[project]\ndependencies = [\n    # keep me\n\n    "lib",\n    "x"\n]\n'
+    )
+
+    assert remove_dependency(pyproject_path, "lib")
+    assert pyproject_path.read_text() == (
+        '[project]\ndependencies = [\n    # keep me\n\n    "x"\n]\n'
+    )
+
+
+def test_remove_dependency_not_found(tmp_path: pl.Path):
+    """Files not mentioning the dependency are left untouched."""
+    pyproject_path = tmp_path / "pyproject.toml"
+    pyproject_path.write_text(PYPROJECT)
+
+    assert not remove_dependency(pyproject_path, "other")
+    assert pyproject_path.read_text() == PYPROJECT
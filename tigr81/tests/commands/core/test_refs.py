@@ -0,0 +1,134 @@
+import subprocess
+
+import pytest
+from pytest_mock import MockerFixture
+
+from tests.conftest import GitRemote
+from tigr81.commands.core import refs
+
+
+@pytest.mark.parametrize(
+    "tags, expected",
+    [
+        (["0.0.10", "0.0.9", "0.0.2"], ["0.0.2", "0.0.9", "0.0.10"]),
+        (["v1.2.3", "1.10.0", "v1.9"], ["v1.2.3", "v1.9", "1.10.0"]),
+        (
+            ["1.0.0", "1.0.0-rc.1", "1.0.0-rc.11", "1.0.0-rc.2", "1.0.0-alpha", "1.0.0-alpha.1"],
+            ["1.0.0-alpha", "1.0.0-alpha.1", "1.0.0-rc.1", "1.0.0-rc.2", "1.0.0-rc.11", "1.0.0"],
+        ),
+        (["pkg-v2.0.0", "1.0.0b2", "1.0.0b10", "latest", "1.2.3.4"], ["1.0.0b2", "1.0.0b10", "pkg-v2.0.0"]),
+    ],
+)
+def test_sort_tags(tags, expected):
+    """Tags are sorted in semantic version order, other tags are dropped."""
+    assert refs.sort_tags(tags) == expected
+
+
+@pytest.mark.parametrize(
+    "tag, release, pre",
+    [
+        ("1.2.3-1", (1, 2, 3), ((0, 1, ""),)),
+        ("v2.0.0-0", (2, 0, 0), ((0, 0, ""),)),
+        ("1.0.0-rc.1", (1, 0, 0), ((1, 0, "rc"), (0, 1, ""))),
+        ("pkg@1.2.3-rc.1", (1, 2, 3), ((1, 0, "rc"), (0, 1, ""))),
+        ("release/v1.0.0-beta", (1, 0, 0), ((1, 0, "beta"),)),
+        ("pkg-v2.0.0-1", (2, 0, 0), ((0, 1, ""),)),
+        ("my-pkg-1.2", (1, 2, 0), ()),
+    ],
+)
+def test_version_parse(tag, release, pre):
+    """Dashed pre-releases stay in the version, whatever the prefix of the tag."""
+    version = refs.Version.parse(tag)
+
+    assert version.release == release
+    assert version.pre == pre
+    assert version.stable is (pre == ())
+
+
+def test_sort_tags_dashed_prereleases():
+    """Dashed pre-releases sort before their release and after the previous one."""
+    tags = ["v2.0.0", "v2.0.0-0", "v1.9.0", "1.2.3-1", "1.2.3"]
+
+    assert refs.sort_tags(tags) == ["1.2.3-1", "1.2.3", "v1.9.0", "v2.0.0-0", "v2.0.0"]
+
+
+def test_ls_remote_peels_annotated_tags(mocker: MockerFixture):
+    """Annotated tags are resolved to the commit they point to."""
+    run = mocker.patch("subprocess.run")
+    run.return_value.stdout = (
+        "aaa\trefs/heads/main\n"
+        "bbb\trefs/tags/1.0.0\n"
+        "ccc\trefs/tags/1.0.0^{}\n"
+    )
+
+    assert refs.ls_remote("https://example.com/repo") == {
+        "refs/heads/main": "aaa",
+        "refs/tags/1.0.0": "ccc",
+    }
+
+
+def test_ls_remote_cache(mocker: MockerFixture, user_cache, git_remote: GitRemote):
+    """Refs are listed once per TTL, and again with a zero TTL."""
+    git_remote.tag("1.0.0")
+    run = mocker.patch("subprocess.run", wraps=subprocess.run)
+
+    def ls_remote_calls():
+        return sum("ls-remote" in c.args[0] for c in run.call_args_list)
+
+    assert refs.latest_tag(git_remote.url) == "1.0.0"
+    git_remote.tag("v1.1.0")
+    assert refs.latest_tag(git_remote.url) == "1.0.0"
+    assert ls_remote_calls() == 1
+
+    assert refs.latest_tag(git_remote.url, ttl=0) == "v1.1.0"
+    assert refs.latest_tag(git_remote.url) == "v1.1.0"
+    assert ls_remote_calls() == 2
+
+
+def test_latest_tag_prefers_releases(mocker: MockerFixture):
+    """Pre-releases are only returned when there is no release."""
+    ls_remote = mocker.patch.object(refs, "ls_remote")
+    ls_remote.return_value = {"refs/tags/1.0.0": "a", "refs/tags/2.0.0-rc.1": "b"}
+    assert refs.latest_tag("url") == "1.0.0"
+
+    ls_remote.return_value = {"refs/tags/2.0.0-rc.1": "b", "refs/heads/main": "c"}
+    assert refs.latest_tag("url") == "2.0.0-rc.1"
+
+    ls_remote.return_value = {"refs/heads/main": "c"}
+    assert refs.latest_tag("url") is None
+
+
+def test_resolve_ref(git_remote: GitRemote):
+    """Branches and tags resolve to their commit SHA."""
+    sha = git_remote.commit({"a.txt": "a"})
+    git_remote.tag("1.0.0")
+
+    assert refs.resolve_ref(git_remote.url, "main") == sha
+    assert refs.resolve_ref(git_remote.url, "1.0.0") == sha
+    assert refs.resolve_ref(git_remote.url, "missing") is None
+
+
+def test_resolve_checkouts(mocker: MockerFixture):
+    """Only the latest checkouts are resolved, once per repository."""
+    latest_tag = mocker.patch.object(
+        refs, "latest_tag", side_effect=lambda url: {"a": "1.0.0", "b": None}[url]
+    )
+
+    resolved = refs.resolve_checkouts(
+        [("a", "latest"), ("b", "latest"), ("a", "latest"), ("c", "develop")]
+    )
+
+    assert resolved == {("a", "latest"): "1.0.0", ("b", "latest"): "main", ("c", "develop"): "develop"}
+    assert sorted(c.args[0] for c in latest_tag.call_args_list) == ["a", "b"]
+
+
+def test_refresh(user_cache, git_remote: GitRemote, tmp_path):
+    """Every repository is listed, failures are reported per repository."""
+    missing = (tmp_path / "missing.git").as_uri()
+
+    errors = refs.refresh([git_remote.url, missing, git_remote.url])
+
+    assert [*errors] == [git_remote.url, missing]
+    assert errors[git_remote.url] is None
+    assert isinstance(errors[missing], subprocess.CalledProcessError)
+    assert git_remote.url in refs._read_cache()
@@ -0,0 +1,158 @@
+import json
+import pathlib as pl
+
+import pytest
+from pytest_mock import MockerFixture
+
+import tigr81.commands.core.render_cache as render_cache
+import tigr81.commands.core.scaffold as scaffold_core
+from tests.conftest import GitRemote
+from tigr81.commands.hub.models import HubTemplate, TemplateTypeEnum
+
+
+@pytest.fixture
+def cookiecutter_remote(git_remote: GitRemote) -> GitRemote:
+    """A remote holding a cookiecutter template in the `template` directory."""
+    git_remote.commit(
+        {
+            "template/cookiecutter.json": json.dumps({"name": "project", "greeting": "hello"}),
+            "template/{{cookiecutter.name}}/README.md": "{{cookiecutter.greeting}}\n",
+            "template/{{cookiecutter.name}}/pkg/__init__.py": "",
+        },
+        message="template",
+    )
+    return git_remote
+
+
+def _hub_template(remote: GitRemote) -> HubTemplate:
+    return HubTemplate(
+        name="template",
+        template=remote.url,
+        checkout="main",
+        directory="template",
+        template_type=TemplateTypeEnum.COOKIECUTTER,
+    )
+
+
+def _renders(cache_location: pl.Path):
+    return sorted(p.name for p in (cache_location / "cache" / "renders").iterdir())
+
+
+def test_render_cache_hit(
+    tmp_path: pl.Path, cookiecutter_remote: GitRemote, user_cache: pl.Path, mocker: MockerFixture
+):
+    """A second identical scaffold copies the cached render instead of rendering."""
+    hub_template = _hub_template(cookiecutter_remote)
+    scaffold_core.scaffold_hub_template(hub_template, default=True, output_dir=tmp_path / "a")
+    assert len(_renders(user_cache)) == 1
+
+    render = mocker.spy(scaffold_core, "cookiecutter")
+    scaffold_core.scaffold_hub_template(hub_template, default=True, output_dir=tmp_path / "b")
+
+    render.assert_not_called()
+    assert (tmp_path / "b" / "project" / "README.md").read_text() == "hello\n"
+    assert (tmp_path / "b" / "project" / "pkg" / "__init__.py").exists()
+    assert len(_renders(user_cache)) == 1
+
+
+def test_render_cache_key(
+    tmp_path: pl.Path, cookiecutter_remote: GitRemote, user_cache: pl.Path, mocker: MockerFixture
+):
+    """Renders of another commit or with other answers are not reused."""
+    scaffold_core.render_cookiecutter(
+        cookiecutter_remote.url,
+        scaffold_core.mirror.resolve_template_source(cookiecutter_remote.url),
+        default=True,
+        output_dir=tmp_path / "a",
+        checkout="main",
+        directory="template",
+        extra_context={"greeting": "hi"},
+    )
+    assert (tmp_path / "a" / "project" / "README.md").read_text() == "hi\n"
+
+    cookiecutter_remote.commit({"template/{{cookiecutter.name}}/README.md": "bye\n"})
+    mocker.patch.dict("os.environ", {"TIGR81_MIRROR_TTL": "0"})
+    scaffold_core.scaffold_hub_template(
+        _hub_template(cookiecutter_remote), default=True, output_dir=tmp_path / "b"
+    )
+
+    assert (tmp_path / "b" / "project" / "README.md").read_text() == "bye\n"
+    assert len(_renders(user_cache)) == 2
+
+
+def test_render_cache_disabled(
+    tmp_path: pl.Path, cookiecutter_remote: GitRemote, user_cache: pl.Path, mocker: MockerFixture
+):
+    """Scaffolds with prompts or without the render cache are rendered every time."""
+    hub_template = _hub_template(cookiecutter_remote)
+    scaffold_core.scaffold_hub_template(hub_template, default=True, output_dir=tmp_path / "a")
+
+    render = mocker.spy(scaffold_core, "cookiecutter")
+    scaffold_core.scaffold_hub_template(
+        hub_template, default=True, output_dir=tmp_path / "b", use_render_cache=False
+    )
+
+    render.assert_called_once()
+    assert (tmp_path / "b" / "project" / "README.md").read_text() == "hello\n"
+    assert render_cache.render_key(cookiecutter_remote.url, cookiecutter_remote.url, "main") is None
+
+
+def test_render_cached_conflict(tmp_path: pl.Path, user_cache: pl.Path):
+    """Existing paths are rendered over by the backend, unless overwriting is allowed."""
+    rendered = []
+
+    def _render(render_dir: pl.Path) -> None:
+        rendered.append(render_dir)
+        (render_dir / "project").mkdir(parents=True, exist_ok=True)
+        (render_dir / "project" / "file.txt").write_text("rendered")
+
+    output_dir = tmp_path / "out"
+    (output_dir / "project").mkdir(parents=True)
+    (output_dir / "project" / "file.txt").write_text("existing")
+
+    assert render_cache.render_cached("key", output_dir, _render) is False
+    assert rendered[-1] == output_dir
+
+    (output_dir / "project" / "file.txt").write_text("existing")
+    assert render_cache.render_cached("key", output_dir, _render, overwrite=True) is True
+    assert (output_dir / "project" / "file.txt").read_text() == "rendered"
+
+
+def test_evict(tmp_path: pl.Path, user_cache: pl.Path):
+    """The least recently used renders are evicted first."""
+
+    def _render(render_dir: pl.Path) -> None:
+        render_dir.mkdir()
+        (render_dir / "file.txt").write_text("x" * 100)
+
+    for i, key in enumerate(["old", "used", "new"]):
+        render_cache.render_cached(key, tmp_path / key, _render)
+        entry = render_cache.RENDER_CACHE_LOCATION / key
+        render_cache.os.utime(entry, (1000 + i, 1000 + i))
+    render_cache.render_cached("used", tmp_path / "used-again", _render)
+
+    render_cache.evict(max_size=250)
+
+    assert _renders(user_cache) == ["new", "used"]
+
+
+def test_render_cache_raw_git(
+    tmp_path: pl.Path, git_remote: GitRemote, user_cache: pl.Path, mocker: MockerFixture
+):
+    """Raw git checkouts are copied from the cache instead of being checked out again."""
+    hub_template = HubTemplate(
+        name="raw",
+        template=git_remote.url,
+        checkout="main",
+        directory="sub",
+        template_type=TemplateTypeEnum.RAW_GIT,
+    )
+    scaffold_core.scaffold_hub_template(hub_template, output_dir=tmp_path / "a")
+
+    clone = mocker.spy(scaffold_core.gitw, "export_repo_directory")
+    scaffold_core.scaffold_hub_template(hub_template, output_dir=tmp_path / "b")
+
+    clone.assert_not_called()
+    for output_dir in [tmp_path / "a", tmp_path / "b"]:
+        assert (output_dir / "sub" / "file.txt").read_text() == "sub\n"
+        assert not (output_dir / "README.md").exists()
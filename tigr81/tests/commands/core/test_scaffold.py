@@ -0,0 +1,90 @@
+import json
+import pathlib as pl
+
+from pytest_mock import MockerFixture
+
+import tigr81.commands.core.scaffold as scaffold_core
+from tigr81.commands.core.scheduler import TaskStatus
+from tigr81.commands.scaffold.project_template import (
+    Dependency,
+    ProjectTemplate,
+    ProjectTemplateOptions,
+    ProjectTypeEnum,
+)
+
+
+def _write_template(repo_url, checkout, directory, output_dir, source=None):
+    """Fake export_repo_directory writing a minimal cookiecutter template."""
+    template = output_dir / directory
+    (template / "{{cookiecutter.name}}").mkdir(parents=True)
+    (template / "cookiecutter.json").write_text(
+        json.dumps({"name": "project", "author_email": "nobody@example.com"})
+    )
+    (template / "{{cookiecutter.name}}" / "AUTHOR").write_text(
+        "{{cookiecutter.author_email}}"
+    )
+
+
+def _component(name: str, project_type: ProjectTypeEnum, *deps: str) -> ProjectTemplate:
+    return ProjectTemplate(
+        project_type=project_type,
+        project_options=ProjectTemplateOptions(name=name),
+        dependencies=[Dependency(name=dep) for dep in deps],
+    )
+
+
+def test_scaffold_monorepo(tmp_path: pl.Path, mocker: MockerFixture):
+    """Each project type is fetched once and the author info is read once."""
+    clone = mocker.patch(
+        "tigr81.commands.core.gitw.export_repo_directory", side_effect=_write_template
+    )
+    author = mocker.patch(
+        "tigr81.commands.core.gitw.get_author_info",
+        return_value=("dev", "dev@example.com"),
+    )
+    components = [
+        _component("api", ProjectTypeEnum.FAST_API, "lib"),
+        _component("lib", ProjectTypeEnum.POETRY_PKG),
+        _component("cli", ProjectTypeEnum.POETRY_PKG, "lib"),
+    ]
+
+    results = scaffold_core.scaffold_monorepo(components, relative_path=tmp_path, jobs=2)
+
+    assert [r.name for r in results] == ["lib", "api", "cli"]
+    assert all(r.status == TaskStatus.OK for r in results)
+    assert clone.call_count == 2
+    author.assert_called_once()
+    for name in ["api", "lib", "cli"]:
+        assert (tmp_path / name / "AUTHOR").read_text() == "dev@example.com"
+
+
+def test_scaffold_monorepo_renders_over_existing_components(
+    tmp_path: pl.Path, mocker: MockerFixture
+):
+    """Existing components are scaffolded again in place."""
+    mocker.patch(
+        "tigr81.commands.core.gitw.export_repo_directory", side_effect=_write_template
+    )
+    mocker.patch(
+        "tigr81.commands.core.gitw.get_author_info",
+        return_value=("dev", "dev@example.com"),
+    )
+    (tmp_path / "lib").mkdir()
+    (tmp_path / "lib" / "AUTHOR").write_text("old@example.com")
+    (tmp_path / "lib" / "main.py").write_text("")
+
+    results = scaffold_core.scaffold_monorepo(
+        [_component("lib", ProjectTypeEnum.POETRY_PKG)], relative_path=tmp_path
+    )
+
+    assert results[0].status == TaskStatus.OK
+    assert (tmp_path / "lib" / "AUTHOR").read_text() == "dev@example.com"
+    assert (tmp_path / "lib" / "main.py").exists()
+
+
+def test_scaffold_monorepo_nothing_to_scaffold(mocker: MockerFixture):
+    """Nothing is fetched without components."""
+    clone = mocker.patch("tigr81.commands.core.gitw.export_repo_directory")
+
+    assert scaffold_core.scaffold_monorepo([], relative_path=pl.Path(".")) == []
+    clone.assert_not_called()
@@ -0,0 +1,106 @@
+import threading
+import time
+
+import pytest
+
+from tigr81.commands.core.scheduler import (
+    TaskStatus,
+    run_tasks,
+    topological_order,
+)
+
+
+def test_topological_order_keeps_original_order_of_independent_tasks():
+    """Dependencies come first, ties keep the given order."""
+    deps = {"app": ["lib", "core"], "lib": ["core"], "core": [], "cli": []}
+
+    assert topological_order(deps) == ["core", "cli", "lib", "app"]
+
+
+def test_topological_order_ignores_unknown_dependencies():
+    """Dependencies that are not tasks do not block anything."""
+    assert topological_order({"app": ["external"]}) == ["app"]
+
+
+def test_topological_order_cycle():
+    """Cycles are reported."""
+    with pytest.raises(ValueError, match="Dependency cycle"):
+        topological_order({"a": ["b"], "b": ["a"], "c": []})
+
+
+def _recorder(log, name, delay=0.0, fail=False):
+    def task():
+        log.append(("start", name))
+        time.sleep(delay)
+        if fail:
+            raise RuntimeError(f"{name} failed")
+        log.append(("end", name))
+
+    return task
+
+
+def test_run_tasks_respects_dependencies():
+    """A task starts only after all its dependencies ended."""
+    log = []
+    tasks = {
+        name: _recorder(log, name, delay=0.01) for name in ["app", "lib", "core"]
+    }
+    deps = {"app": ["lib", "core"], "lib": ["core"]}
+
+    results = run_tasks(tasks, deps, jobs=4)
+
+    assert [r.name for r in results] == ["core", "lib", "app"]
+    assert all(r.status == TaskStatus.OK for r in results)
+    assert log.index(("end", "core")) < log.index(("start", "lib"))
+    assert log.index(("end", "lib")) < log.index(("start", "app"))
+
+
+def test_run_tasks_runs_independent_tasks_concurrently():
+    """Independent tasks run at the same time, up to ``jobs``."""
+    barrier = threading.Barrier(3, timeout=5)
+    tasks = {name: barrier.wait for name in ["a", "b", "c"]}
+
+    results = run_tasks(tasks, {}, jobs=3)
+
+    assert all(r.status == TaskStatus.OK for r in results)
+
+
+def test_run_tasks_fail_fast():
+    """After a failure no new task starts."""
+    log = []
+    tasks = {
+        "bad": _recorder(log, "bad", fail=True),
+        "dependent": _recorder(log, "dependent"),
+        "other": _recorder(log, "other"),
+    }
+
+    results = {
+        r.name: r for r in run_tasks(tasks, {"dependent": ["bad"], "other": ["bad"]})
+    }
+
+    assert results["bad"].status == TaskStatus.FAILED
+    assert results["bad"].error == "bad failed"
+    assert results["dependent"].status == TaskStatus.SKIPPED
+    assert results["other"].status == TaskStatus.SKIPPED
+    assert ("start", "other") not in log
+
+
+def test_run_tasks_keep_going():
+    """With keep_going only the dependents of a failure are skipped."""
+    log = []
+    tasks = {
+        "bad": _recorder(log, "bad", fail=True),
+        "dependent": _recorder(log, "dependent"),
+        "transitive": _recorder(log, "transitive"),
+        "other": _recorder(log, "other"),
+    }
+    deps = {"dependent": ["bad"], "transitive": ["dependent"]}
+
+    results = {r.name: r.status for r in run_tasks(tasks, deps, keep_going=True)}
+
+    assert results == {
+        "bad": TaskStatus.FAILED,
+        "other": TaskStatus.OK,
+        "dependent": TaskStatus.SKIPPED,
+        "transitive": TaskStatus.SKIPPED,
+    }
@@ -1,12 +1,12 @@
-import pytest
-import typer
 from pytest_mock import MockerFixture
 
 from tigr81.commands.hub.helpers import (
-    get_template_from_hubs,
+    find_hub_path,
     is_hub_name_valid,
+    load_hub,
     load_hubs,
 )
+from tigr81.commands.hub.models import Hub, HubTemplate, TemplateTypeEnum
 
 """
 Unit tests for load_hubs
@@ -71,38 +71,47 @@ def test_is_hub_name_valid_with_empty_hubs(mocker: MockerFixture, mock_hub_folde
 
 
 """
-Unit tests for get_template_from_hubs
+Unit tests for find_hub_path and load_hub
 """
 
 
-def test_get_template_from_hubs_no_hubs():
-    """Test get template from hubs with no hubs available."""
-    with pytest.raises(typer.Exit):
-        get_template_from_hubs(hub_name="pippo", template_name="pluto", hubs={})
+def _write_hub(folder, name, template_name="t1"):
+    Hub(
+        name=name,
+        hub_templates={
+            template_name: HubTemplate(
+                name=template_name,
+                template=f"https://example.com/{template_name}",
+                template_type=TemplateTypeEnum.COPIER,
+            )
+        },
+    ).to_yaml(folder)
 
 
-def test_get_template_from_hubs_none_template(mocker: MockerFixture):
-    """Test get template from hubs with an hub template not present in the hub."""
-    mock_hub = mocker.Mock()
-    mock_hub.hub_templates = {}
-
-    hubs = {"pippo": mock_hub}
+def test_find_hub_path_prefers_later_folders(mock_hub_folders):
+    """The last folder wins, as in load_hubs."""
+    _write_hub(mock_hub_folders[0], "hub1")
+    _write_hub(mock_hub_folders[2], "hub1")
+    assert find_hub_path("hub1", mock_hub_folders) == mock_hub_folders[2] / "hub1.yml"
+    assert find_hub_path("missing", mock_hub_folders) is None
 
-    with pytest.raises(typer.Exit):
-        get_template_from_hubs(hub_name="pippo", template_name="pluto", hubs=hubs)
 
+def test_load_hub_parses_only_its_file(mocker: MockerFixture, mock_hub_folders):
+    """Loading a hub by name does not scan the other hub files."""
+    _write_hub(mock_hub_folders[0], "hub1")
+    _write_hub(mock_hub_folders[1], "hub2")
+    mock_load_hubs = mocker.patch("tigr81.commands.hub.helpers.load_hubs")
 
+    hub = load_hub("hub2", mock_hub_folders)
 
-def test_get_template_from_hubs_hub_template_found(mocker: MockerFixture):
-    """Test get template from hubs with an hub template present in the hub."""
-    mock_hub = mocker.Mock()
-    mock_hub.hub_templates = {
-        "pluto": "pluto"
-    }
-
-    hubs = {"pippo": mock_hub}
+    assert hub.name == "hub2"
+    mock_load_hubs.assert_not_called()
 
 
-    hub_template = get_template_from_hubs(hub_name="pippo", template_name="pluto", hubs=hubs)
+def test_load_hub_falls_back_to_full_scan(mock_hub_folders):
+    """A hub stored in a file not named after it is found through a full scan."""
+    _write_hub(mock_hub_folders[0], "hub1")
+    (mock_hub_folders[0] / "hub1.yml").rename(mock_hub_folders[0] / "other.yml")
 
-    assert hub_template is not None
\ No newline at end of file
+    assert load_hub("hub1", mock_hub_folders).name == "hub1"
+    assert load_hub("missing", mock_hub_folders) is None
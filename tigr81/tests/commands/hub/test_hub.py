@@ -1,4 +1,5 @@
 import pathlib as pl
+import subprocess
 
 from pytest_mock import MockerFixture
 from typer.testing import CliRunner
@@ -37,26 +38,24 @@ def test_hub_list_all(mocker: MockerFixture):
 
 def test_hub_wrong_hub(mocker: MockerFixture):
     """Test hub list command."""
-    mock_hub = mocker.Mock()
-    mock_hub.name = "hub1"
-    mock_hubs = {
-        "hub1": mock_hub
-    }
-    mocker.patch("tigr81.commands.hub.hub.load_hubs", return_value=mock_hubs)
+    mocker.patch("tigr81.commands.hub.hub.load_hub", return_value=None)
     result = runner.invoke(app, ["hub", "list", "hub2"])
     assert result.exit_code == 0
+    assert "does not exist" in result.stdout
 
 
 def test_hub_good_hub(mocker: MockerFixture):
     """Test hub list command."""
     mock_hub = mocker.Mock()
     mock_hub.name = "hub1"
-    mock_hubs = {
-        "hub1": mock_hub
-    }
-    mocker.patch("tigr81.commands.hub.hub.load_hubs", return_value=mock_hubs)
+    mock_load_hub = mocker.patch(
+        "tigr81.commands.hub.hub.load_hub", return_value=mock_hub
+    )
+    mock_load_hubs = mocker.patch("tigr81.commands.hub.hub.load_hubs")
     result = runner.invoke(app, ["hub", "list", "hub1"])
     assert result.exit_code == 0
+    mock_load_hub.assert_called_once_with("hub1")
+    mock_load_hubs.assert_not_called()
 
 
 def test_hub_remove_no_hubs(mocker: MockerFixture):
@@ -70,16 +69,12 @@ def test_hub_remove_no_hubs(mocker: MockerFixture):
 
 def test_hub_remove_wrong_hub_name(mocker: MockerFixture):
     """Test hub remove command."""
-    mock_hub = mocker.Mock()
-    mock_hub.name = "hub1"
-    mock_hubs = {
-        "hub1": mock_hub
-    }
-    mocker.patch("tigr81.commands.hub.hub.load_hubs", return_value=mock_hubs)
+    mocker.patch("tigr81.commands.hub.hub.load_hub", return_value=None)
 
     result = runner.invoke(app, ["hub", "remove", "hub2"])
 
     assert result.exit_code == 0
+    assert "does not exist" in result.stdout
 
 
 def test_hub_remove_deletes_existing_hub(tmp_path: pl.Path, mocker: MockerFixture):
@@ -104,6 +99,23 @@ def test_hub_remove_deletes_existing_hub(tmp_path: pl.Path, mocker: MockerFixtur
     assert "Hub 'hub1' deleted successfully." in result.stdout
 
 
+def test_hub_remove_deletes_lock_files(tmp_path: pl.Path, mocker: MockerFixture):
+    """Removing a hub deletes its lock file and the lock sidecars of both files."""
+    from tigr81.commands.hub.models import HubLock
+
+    mocker.patch("tigr81.commands.hub.hub.USER_HUB_LOCATION", tmp_path)
+    mocker.patch("tigr81.commands.hub.models.USER_HUB_LOCATION", tmp_path)
+    Hub(name="hub1", hub_templates={}).to_yaml(tmp_path)
+    HubLock(hub="hub1").to_yaml()
+    for name in ["hub1.yml.lock", "hub1.lock.lock"]:
+        (tmp_path / name).touch()
+
+    result = runner.invoke(app, ["hub", "remove", "hub1"])
+
+    assert result.exit_code == 0, result.output
+    assert [*tmp_path.iterdir()] == []
+
+
 def test_hub_remove_template_deletes_existing_template(
     tmp_path: pl.Path, mocker: MockerFixture, mock_hub_template: HubTemplate
 ):
@@ -238,6 +250,37 @@ def test_hub_add_cli_creates_hub(tmp_path: pl.Path, mocker: MockerFixture):
     assert tpl.directory == "."
 
 
+def test_hub_add_cli_archive(tmp_path: pl.Path, mocker: MockerFixture):
+    """Archive templates are added without checkout and with their SHA-256."""
+    mocker.patch("tigr81.commands.hub.hub.USER_HUB_LOCATION", tmp_path)
+    mocker.patch("tigr81.commands.hub.hub.load_hubs", return_value={})
+
+    result = runner.invoke(
+        app,
+        [
+            "hub",
+            "add",
+            "newhub",
+            "assets",
+            "--template",
+            "https://example.com/assets-1.0.tar.gz",
+            "--type",
+            "archive",
+            "--directory",
+            "assets-1.0",
+            "--sha256",
+            "a" * 64,
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    tpl = Hub.from_yaml(tmp_path / "newhub.yml").hub_templates["assets"]
+    assert tpl.template_type == TemplateTypeEnum.ARCHIVE
+    assert tpl.checkout is None
+    assert tpl.directory == "assets-1.0"
+    assert tpl.sha256 == "a" * 64
+
+
 def test_hub_add_cli_appends_to_existing_hub(
     tmp_path: pl.Path, mocker: MockerFixture
 ):
@@ -331,4 +374,378 @@ def test_hub_add_cli_duplicate_template_name(
         ],
     )
 
-    assert result.exit_code == 1
\ No newline at end of file
+    assert result.exit_code == 1
+
+def test_hub_scaffold_raw_git_through_mirror(
+    tmp_path: pl.Path, mocker: MockerFixture, user_cache, git_remote
+):
+    """Remote raw git templates are cloned from the local mirror."""
+    hub = Hub(
+        name="hub1",
+        hub_templates={
+            "raw": HubTemplate(
+                name="raw",
+                template=git_remote.url,
+                checkout="main",
+                directory=".",
+                template_type=TemplateTypeEnum.RAW_GIT,
+            )
+        },
+    )
+    mocker.patch("tigr81.commands.hub.hub.load_hub", return_value=hub)
+    output_dir = tmp_path / "out"
+
+    result = runner.invoke(
+        app, ["hub", "scaffold", "hub1", "raw", "--output-dir", str(output_dir)]
+    )
+
+    assert result.exit_code == 0
+    assert (output_dir / "README.md").read_text() == "hello\n"
+    assert (user_cache / "mirrors").exists()
+
+
+def _raw_git_hub(url: str) -> Hub:
+    return Hub(
+        name="hub1",
+        hub_templates={
+            "raw": HubTemplate(
+                name="raw",
+                template=url,
+                checkout="main",
+                directory=".",
+                template_type=TemplateTypeEnum.RAW_GIT,
+            ),
+            "broken": HubTemplate(
+                name="broken",
+                template=url,
+                checkout="missing-branch",
+                directory=".",
+                template_type=TemplateTypeEnum.RAW_GIT,
+            ),
+        },
+    )
+
+
+def test_hub_scaffold_many(
+    tmp_path: pl.Path, mocker: MockerFixture, user_cache, git_remote
+):
+    """Every batch item is scaffolded into its own output directory."""
+    mocker.patch(
+        "tigr81.commands.hub.hub.load_hubs",
+        return_value={"hub1": _raw_git_hub(git_remote.url)},
+    )
+    spec = tmp_path / "spec.yml"
+    spec.write_text(f"- {{hub: hub1, template: raw, output_dir: {tmp_path / 'b'}}}\n")
+
+    result = runner.invoke(
+        app,
+        ["hub", "scaffold-many", f"hub1/raw={tmp_path / 'a'}", "--spec", str(spec), "-j", "2"],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "2 succeeded, 0 failed." in result.output
+    assert (tmp_path / "a" / "README.md").read_text() == "hello\n"
+    assert (tmp_path / "b" / "sub" / "file.txt").read_text() == "sub\n"
+
+
+def test_hub_scaffold_many_cookiecutter_exports_once(
+    tmp_path: pl.Path, mocker: MockerFixture, user_cache, git_remote
+):
+    """Items of one cookiecutter template render from a shared export, not clones of the mirror."""
+    import tigr81.commands.core.gitw as gitw
+
+    git_remote.commit(
+        {
+            "tpl/cookiecutter.json": '{"name": "proj"}',
+            "tpl/{{cookiecutter.name}}/README.md": "{{cookiecutter.name}}\n",
+        }
+    )
+    hub = Hub(
+        name="hub1",
+        hub_templates={
+            "cc": HubTemplate(
+                name="cc",
+                template=git_remote.url,
+                checkout="main",
+                directory="tpl",
+                template_type=TemplateTypeEnum.COOKIECUTTER,
+            )
+        },
+    )
+    mocker.patch("tigr81.commands.hub.hub.load_hubs", return_value={"hub1": hub})
+    export = mocker.spy(gitw, "export_repo_directory")
+
+    result = runner.invoke(
+        app,
+        [
+            "hub",
+            "scaffold-many",
+            f"hub1/cc={tmp_path / 'a'}",
+            f"hub1/cc={tmp_path / 'b'}",
+            "--no-render-cache",
+            "-j",
+            "2",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert export.call_count == 1
+    assert export.call_args.kwargs["source"].startswith("file://")
+    for name in ["a", "b"]:
+        assert (tmp_path / name / "proj" / "README.md").read_text() == "proj\n"
+
+
+def test_hub_scaffold_many_reports_failures(
+    tmp_path: pl.Path, mocker: MockerFixture, git_remote
+):
+    """A failing item does not stop the others and makes the command fail."""
+    mocker.patch(
+        "tigr81.commands.hub.hub.load_hubs",
+        return_value={"hub1": _raw_git_hub(git_remote.url)},
+    )
+
+    result = runner.invoke(
+        app,
+        [
+            "hub",
+            "scaffold-many",
+            f"hub1/raw={tmp_path / 'ok'}",
+            f"hub1/broken={tmp_path / 'ko'}",
+        ],
+    )
+
+    assert result.exit_code == 1
+    assert "FAILED" in result.output
+    assert "1 succeeded, 1 failed." in result.output
+    assert (tmp_path / "ok" / "README.md").exists()
+
+
+def test_hub_scaffold_many_reports_fetch_failures(
+    tmp_path: pl.Path, mocker: MockerFixture, user_cache, git_remote
+):
+    """A template that cannot be fetched fails its items, the others are scaffolded."""
+    import tigr81.commands.core.mirror as mirror
+
+    hub = _raw_git_hub(git_remote.url)
+    hub.hub_templates["unreachable"] = HubTemplate(
+        name="unreachable",
+        template="https://example.com/unreachable.git",
+        checkout="main",
+        directory=".",
+        template_type=TemplateTypeEnum.RAW_GIT,
+    )
+    mocker.patch("tigr81.commands.hub.hub.load_hubs", return_value={"hub1": hub})
+    resolve_template_source = mirror.resolve_template_source
+
+    def resolve(template):
+        if "unreachable" in template:
+            raise RuntimeError("network down")
+        return resolve_template_source(template)
+
+    mocker.patch.object(mirror, "resolve_template_source", side_effect=resolve)
+
+    result = runner.invoke(
+        app,
+        [
+            "hub",
+            "scaffold-many",
+            f"hub1/unreachable={tmp_path / 'ko'}",
+            f"hub1/raw={tmp_path / 'ok'}",
+        ],
+    )
+
+    assert result.exit_code == 1
+    assert "Could not fetch the template: network down" in result.output
+    assert "1 succeeded, 1 failed." in result.output
+    assert (tmp_path / "ok" / "README.md").exists()
+
+
+def test_hub_scaffold_many_unknown_template(mocker: MockerFixture):
+    """Unknown templates are rejected before anything is scaffolded."""
+    mocker.patch("tigr81.commands.hub.hub.load_hubs", return_value={})
+
+    result = runner.invoke(app, ["hub", "scaffold-many", "hub1/raw=out"])
+
+    assert result.exit_code == 1
+    assert "Template 'raw' not found in hub 'hub1'." in result.output
+
+
+def test_hub_scaffold_many_invalid_item():
+    """Malformed batch items are rejected."""
+    result = runner.invoke(app, ["hub", "scaffold-many", "hub1-raw"])
+
+    assert result.exit_code == 1
+    assert "expected HUB/TEMPLATE=OUTPUT_DIR" in result.output
+
+
+def test_hub_add_cli_concurrent(tmp_path: pl.Path, mocker: MockerFixture):
+    """Concurrent adds to the same hub do not overwrite each other."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    import tigr81.commands.hub.helpers as helpers
+    from tigr81.commands.hub.hub import _add_template_cli
+
+    mocker.patch("tigr81.commands.hub.hub.USER_HUB_LOCATION", tmp_path)
+    mocker.patch(
+        "tigr81.commands.hub.hub.load_hubs",
+        side_effect=lambda: helpers.load_hubs([tmp_path], use_cache=False),
+    )
+
+    def add(i):
+        _add_template_cli(
+            "hub1", f"tpl{i}", f"https://example.com/{i}", TemplateTypeEnum.COPIER, None, None
+        )
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(add, range(16)))
+
+    saved = Hub.from_yaml(tmp_path / "hub1.yml")
+    assert set(saved.hub_templates) == {f"tpl{i}" for i in range(16)}
+
+
+def test_hub_scaffold_many_latest_checkout(
+    tmp_path: pl.Path, mocker: MockerFixture, user_cache, git_remote
+):
+    """The latest checkout is resolved to the latest tag of the template."""
+    git_remote.tag("v1.0.0")
+    git_remote.commit({"README.md": "unreleased\n"})
+    hub = _raw_git_hub(git_remote.url)
+    hub.hub_templates["raw"].checkout = "latest"
+    mocker.patch("tigr81.commands.hub.hub.load_hubs", return_value={"hub1": hub})
+
+    result = runner.invoke(app, ["hub", "scaffold-many", f"hub1/raw={tmp_path / 'a'}"])
+
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "a" / "README.md").read_text() == "hello\n"
+
+
+def test_hub_scaffold_and_lock_latest_checkout(
+    tmp_path: pl.Path, mocker: MockerFixture, user_cache, git_remote
+):
+    """Single scaffolds and locks resolve the latest checkout to the latest tag."""
+    from tigr81.commands.hub.models import HubLock
+
+    released = git_remote.commit({"README.md": "released\n"})
+    git_remote.tag("v1.0.0")
+    git_remote.commit({"README.md": "unreleased\n"})
+    hub = _raw_git_hub(git_remote.url)
+    hub.hub_templates["raw"].checkout = "latest"
+    del hub.hub_templates["broken"]
+    mocker.patch("tigr81.commands.hub.models.USER_HUB_LOCATION", tmp_path)
+    mocker.patch("tigr81.commands.hub.hub.USER_HUB_LOCATION", tmp_path)
+    mocker.patch("tigr81.commands.hub.hub.load_hub", return_value=hub)
+
+    result = runner.invoke(app, ["hub", "scaffold", "hub1", "raw", "--output-dir", str(tmp_path / "a")])
+
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "a" / "README.md").read_text() == "released\n"
+
+    result = runner.invoke(app, ["hub", "lock", "hub1"])
+
+    assert result.exit_code == 0, result.output
+    locked = HubLock.from_yaml(tmp_path / "hub1.lock").templates["raw"]
+    assert (locked.checkout, locked.commit) == ("latest", released)
+
+
+def test_hub_refresh(mocker: MockerFixture, user_cache, git_remote, tmp_path: pl.Path):
+    """The refs of the remote templates of the hub are cached."""
+    from tigr81.commands.core import refs
+
+    hub = _raw_git_hub(git_remote.url)
+    hub.hub_templates["local"] = HubTemplate(
+        name="local", template=str(tmp_path), template_type=TemplateTypeEnum.COPIER
+    )
+    mocker.patch("tigr81.commands.hub.hub.load_hub", return_value=hub)
+
+    result = runner.invoke(app, ["hub", "refresh", "hub1"])
+
+    assert result.exit_code == 0, result.output
+    assert "1 refreshed, 0 failed." in result.output
+    assert [*refs._read_cache()] == [git_remote.url]
+
+
+def test_hub_lock_and_scaffold_locked_commit(
+    tmp_path: pl.Path, mocker: MockerFixture, monkeypatch, user_cache, git_remote
+):
+    """Locked templates are scaffolded at their commit, from the mirror only."""
+    import tigr81.commands.core.mirror as mirror
+    from tigr81.commands.hub.models import HubLock
+
+    mocker.patch("tigr81.commands.hub.models.USER_HUB_LOCATION", tmp_path)
+    mocker.patch("tigr81.commands.hub.hub.USER_HUB_LOCATION", tmp_path)
+    mocker.patch("tigr81.commands.hub.hub.load_hub", return_value=_raw_git_hub(git_remote.url))
+    locked_commit = git_remote.commit({"README.md": "locked\n"})
+
+    result = runner.invoke(app, ["hub", "lock", "hub1"])
+
+    assert result.exit_code == 1
+    assert f"broken: 'missing-branch' not found in {git_remote.url}" in result.output
+
+    git_remote.commit({"other.txt": "other\n"}, branch="missing-branch")
+    result = runner.invoke(app, ["hub", "lock", "hub1"])
+
+    assert result.exit_code == 0, result.output
+    hub_lock = HubLock.from_yaml(tmp_path / "hub1.lock")
+    assert hub_lock.templates["raw"].commit == locked_commit
+
+    git_remote.commit({"README.md": "moved\n"})
+    monkeypatch.setenv("TIGR81_MIRROR_TTL", "0")
+    sync_mirror = mocker.spy(mirror, "sync_mirror")
+
+    result = runner.invoke(app, ["hub", "scaffold", "hub1", "raw", "--output-dir", str(tmp_path / "a")])
+
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "a" / "README.md").read_text() == "locked\n"
+    sync_mirror.assert_not_called()
+
+    result = runner.invoke(
+        app, ["hub", "scaffold", "hub1", "raw", "--output-dir", str(tmp_path / "b"), "--ignore-lock"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "b" / "README.md").read_text() == "moved\n"
+
+
+def test_hub_lock_reports_fetch_failures(
+    tmp_path: pl.Path, mocker: MockerFixture, user_cache, git_remote
+):
+    """No lock file is written when a locked commit cannot be fetched."""
+    import tigr81.commands.core.mirror as mirror
+
+    hub = _raw_git_hub(git_remote.url)
+    del hub.hub_templates["broken"]
+    mocker.patch("tigr81.commands.hub.models.USER_HUB_LOCATION", tmp_path)
+    mocker.patch("tigr81.commands.hub.hub.USER_HUB_LOCATION", tmp_path)
+    mocker.patch("tigr81.commands.hub.hub.load_hub", return_value=hub)
+    mocker.patch.object(
+        mirror, "sync_mirror", side_effect=subprocess.CalledProcessError(128, ["git", "fetch"])
+    )
+
+    result = runner.invoke(app, ["hub", "lock", "hub1"])
+
+    assert result.exit_code == 1
+    assert "Could not fetch the locked commits:\nraw: could not fetch" in result.output
+    assert not (tmp_path / "hub1.lock").exists()
+
+
+def test_hub_scaffold_many_locked_commit(
+    tmp_path: pl.Path, mocker: MockerFixture, user_cache, git_remote
+):
+    """Batch scaffolds use the locked commits too."""
+    from tigr81.commands.hub.models import HubLock, LockedTemplate
+
+    mocker.patch("tigr81.commands.hub.models.USER_HUB_LOCATION", tmp_path)
+    mocker.patch("tigr81.commands.hub.hub.load_hubs", return_value={"hub1": _raw_git_hub(git_remote.url)})
+    locked_commit = git_remote.commit({"README.md": "locked\n"})
+    git_remote.commit({"README.md": "moved\n"})
+    HubLock(
+        hub="hub1",
+        templates={
+            "raw": LockedTemplate(template=git_remote.url, checkout="main", commit=locked_commit)
+        },
+    ).to_yaml()
+
+    result = runner.invoke(app, ["hub", "scaffold-many", f"hub1/raw={tmp_path / 'a'}"])
+
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "a" / "README.md").read_text() == "locked\n"
@@ -0,0 +1,177 @@
+import pathlib as pl
+import pickle
+
+from pytest_mock import MockerFixture
+from typer.testing import CliRunner
+
+from tigr81.commands.hub.helpers import load_hubs
+from tigr81.commands.hub.index import HubIndex, HubIndexEntry
+from tigr81.commands.hub.models import Hub, HubTemplate, TemplateTypeEnum
+from tigr81.main import app
+
+runner = CliRunner()
+
+
+def _write_hub(folder: pl.Path, name: str, template_names=("t1",)) -> pl.Path:
+    hub = Hub(
+        name=name,
+        hub_templates={
+            template_name: HubTemplate(
+                name=template_name,
+                template=f"https://example.com/{template_name}",
+                template_type=TemplateTypeEnum.COOKIECUTTER,
+            )
+            for template_name in template_names
+        },
+    )
+    hub.to_yaml(folder)
+    return folder / f"{name}.yml"
+
+
+def test_hub_index_reuses_unchanged_hubs(tmp_path: pl.Path, mocker: MockerFixture):
+    """Unchanged hub files are served from the index without being parsed again."""
+    hub_folder = tmp_path / "hubs"
+    hub_folder.mkdir()
+    _write_hub(hub_folder, "hub1")
+    index_path = tmp_path / "cache" / "index"
+
+    hubs = HubIndex(index_path).load([hub_folder])
+    assert [*hubs] == ["hub1"]
+    assert len([*index_path.glob("*.pickle")]) == 1
+
+    from_yaml = mocker.spy(Hub, "from_yaml")
+    hubs = HubIndex(index_path).load([hub_folder])
+
+    assert hubs["hub1"].hub_templates["t1"].template == "https://example.com/t1"
+    from_yaml.assert_not_called()
+
+
+def test_hub_index_revalidates_changed_hubs(tmp_path: pl.Path, mocker: MockerFixture):
+    """Only hub files whose size or mtime changed are parsed again."""
+    hub_folder = tmp_path / "hubs"
+    hub_folder.mkdir()
+    _write_hub(hub_folder, "hub1")
+    _write_hub(hub_folder, "hub2")
+    index_path = tmp_path / "index"
+    HubIndex(index_path).load([hub_folder])
+
+    changed = _write_hub(hub_folder, "hub2", template_names=("t1", "t2"))
+    from_yaml = mocker.spy(Hub, "from_yaml")
+    hubs = HubIndex(index_path).load([hub_folder])
+
+    from_yaml.assert_called_once_with(changed)
+    assert set(hubs["hub2"].hub_templates) == {"t1", "t2"}
+
+
+def test_hub_index_drops_deleted_hubs(tmp_path: pl.Path):
+    """Hub files removed from disk disappear from the index."""
+    hub_folder = tmp_path / "hubs"
+    hub_folder.mkdir()
+    hub_path = _write_hub(hub_folder, "hub1")
+    index_path = tmp_path / "index"
+    HubIndex(index_path).load([hub_folder])
+
+    hub_path.unlink()
+
+    assert HubIndex(index_path).load([hub_folder]) == {}
+    assert [*index_path.glob("*.pickle")] == []
+
+
+def test_hub_index_ignores_corrupted_file(tmp_path: pl.Path):
+    """A corrupted index file is treated as a missing entry."""
+    hub_folder = tmp_path / "hubs"
+    hub_folder.mkdir()
+    hub_path = _write_hub(hub_folder, "hub1")
+    index_path = tmp_path / "index"
+    index_path.mkdir()
+    HubIndex(index_path)._entry_path(str(hub_path.resolve())).write_bytes(b"not a pickle")
+
+    assert [*HubIndex(index_path).load([hub_folder])] == ["hub1"]
+
+
+def test_load_hubs_uses_index_when_cache_enabled(
+    tmp_path: pl.Path, mocker: MockerFixture, monkeypatch
+):
+    """load_hubs goes through the index unless TIGR81_NO_CACHE is set."""
+    monkeypatch.delenv("TIGR81_NO_CACHE")
+    index_path = tmp_path / "index"
+    mocker.patch("tigr81.commands.hub.index.HUB_INDEX_LOCATION", index_path)
+    hub_folder = tmp_path / "hubs"
+    hub_folder.mkdir()
+    _write_hub(hub_folder, "hub1")
+
+    hubs = load_hubs([hub_folder])
+
+    assert [*hubs] == ["hub1"]
+    assert [*index_path.glob("*.pickle")] != []
+
+
+def test_hub_reindex(tmp_path: pl.Path, mocker: MockerFixture):
+    """`hub reindex` rebuilds the index from the available hub folders."""
+    index_path = tmp_path / "index"
+    mocker.patch("tigr81.commands.hub.index.HUB_INDEX_LOCATION", index_path)
+    hub_folder = tmp_path / "hubs"
+    hub_folder.mkdir()
+    _write_hub(hub_folder, "hub1")
+    mocker.patch("tigr81.commands.hub.hub.AVAILABLE_HUBS", [hub_folder])
+
+    result = runner.invoke(app, ["hub", "reindex"])
+
+    assert result.exit_code == 0
+    assert "Indexed 1 hubs." in result.stdout
+    assert len([*index_path.glob("*.pickle")]) == 1
+
+
+def test_hub_index_ignores_index_of_older_models(tmp_path: pl.Path):
+    """An index pickled before a field was added to the models is treated as empty."""
+    hub_folder = tmp_path / "hubs"
+    hub_folder.mkdir()
+    hub_path = _write_hub(hub_folder, "hub1")
+    old_hub = Hub.from_yaml(hub_path)
+    # HubTemplate as pickled before the sha256 field existed
+    del old_hub.hub_templates["t1"].__dict__["sha256"]
+    stat = hub_path.stat()
+    index_path = tmp_path / "index"
+    index_path.mkdir()
+    key = str(hub_path.resolve())
+    with open(HubIndex(index_path)._entry_path(key), "wb") as f:
+        entry = HubIndexEntry(mtime_ns=stat.st_mtime_ns, size=stat.st_size, hub=old_hub)
+        pickle.dump((1, key, entry), f)
+
+    hubs = HubIndex(index_path).load([hub_folder])
+
+    assert hubs["hub1"].hub_templates["t1"].sha256 is None
+    assert "t1" in str(hubs["hub1"])
+
+
+def test_hub_index_get_reads_only_its_hub(tmp_path: pl.Path, mocker: MockerFixture):
+    """Looking a hub up unpickles its own index file, not the other hubs."""
+    hub_folder = tmp_path / "hubs"
+    hub_folder.mkdir()
+    hub_paths = [_write_hub(hub_folder, f"hub{i}") for i in range(3)]
+    index_path = tmp_path / "index"
+    HubIndex(index_path).load([hub_folder])
+
+    load = mocker.spy(pickle, "load")
+    from_yaml = mocker.spy(Hub, "from_yaml")
+    hub = HubIndex(index_path).get(hub_paths[1])
+
+    assert hub.name == "hub1"
+    assert load.call_count == 1
+    from_yaml.assert_not_called()
+
+
+def test_hub_index_keeps_other_folders(tmp_path: pl.Path):
+    """Loading some folders leaves the entries of the other folders in place."""
+    folders = [tmp_path / "hubs1", tmp_path / "hubs2"]
+    for i, folder in enumerate(folders):
+        folder.mkdir()
+        _write_hub(folder, f"hub{i}")
+    index_path = tmp_path / "index"
+    HubIndex(index_path).load(folders)
+
+    (folders[0] / "hub0.yml").unlink()
+    HubIndex(index_path).load([folders[0]])
+
+    assert len([*index_path.glob("*.pickle")]) == 1
+    assert [*HubIndex(index_path).load([folders[1]])] == ["hub1"]
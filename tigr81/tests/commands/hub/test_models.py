@@ -1,6 +1,14 @@
+import pathlib as pl
+
+import pytest
 from pytest_mock import MockerFixture
 
-from tigr81.commands.hub.models import Hub, HubTemplate, TemplateTypeEnum
+from tigr81.commands.hub.models import (
+    BatchScaffoldItem,
+    Hub,
+    HubTemplate,
+    TemplateTypeEnum,
+)
 
 """
 Unit tests for HubTemplate.prompt
@@ -65,3 +73,62 @@ def test_hub_prompt(mocker: MockerFixture, mock_hub_template: HubTemplate):
 
     assert hub.name == "hub1"
     assert hub.hub_templates[mock_hub_template.name] == mock_hub_template
+
+
+"""
+Unit tests for BatchScaffoldItem
+"""
+
+
+def test_batch_scaffold_item_parse():
+    """Test BatchScaffoldItem.parse with a well formed item."""
+    item = BatchScaffoldItem.parse("hub1/api=services/api")
+
+    assert item.hub == "hub1"
+    assert item.template == "api"
+    assert item.output_dir == pl.Path("services/api")
+    assert str(item) == "hub1/api=services/api"
+
+
+@pytest.mark.parametrize("value", ["hub1/api", "hub1=out", "/api=out", "hub1/=out", "hub1/api="])
+def test_batch_scaffold_item_parse_invalid(value: str):
+    """Test BatchScaffoldItem.parse rejects malformed items."""
+    with pytest.raises(ValueError, match="HUB/TEMPLATE=OUTPUT_DIR"):
+        BatchScaffoldItem.parse(value)
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "- {hub: hub1, template: api, output_dir: out/api}\n",
+        "items:\n  - {hub: hub1, template: api, output_dir: out/api}\n",
+    ],
+)
+def test_batch_scaffold_item_from_yaml(tmp_path: pl.Path, content: str):
+    """Test BatchScaffoldItem.from_yaml with a list and with an items key."""
+    spec = tmp_path / "spec.yml"
+    spec.write_text(content)
+
+    items = BatchScaffoldItem.from_yaml(spec)
+
+    assert items == [BatchScaffoldItem(hub="hub1", template="api", output_dir="out/api")]
+
+
+def test_hub_lock_get_commit(tmp_path):
+    """Locked commits are only used while the template location and checkout are unchanged."""
+    from tigr81.commands.hub.models import HubLock, LockedTemplate
+
+    template = HubTemplate(
+        name="tpl", template="https://example.com/tpl", checkout="main", template_type=TemplateTypeEnum.COPIER
+    )
+    hub_lock = HubLock(
+        hub="hub1",
+        templates={"tpl": LockedTemplate(template="https://example.com/tpl", checkout="main", commit="a" * 40)},
+    )
+    hub_lock.to_yaml(tmp_path)
+
+    assert HubLock.from_yaml(tmp_path / "hub1.lock") == hub_lock
+    assert HubLock.from_yaml(tmp_path / "missing.lock") is None
+    assert hub_lock.get_commit(template) == "a" * 40
+    assert hub_lock.get_commit(template.model_copy(update={"checkout": "develop"})) is None
+    assert hub_lock.get_commit(template.model_copy(update={"name": "other"})) is None
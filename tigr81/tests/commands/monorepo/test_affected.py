@@ -0,0 +1,129 @@
+import json
+import pathlib as pl
+import subprocess
+
+import pytest
+from pytest_mock import MockerFixture
+from typer.testing import CliRunner
+
+from tests.conftest import run_git
+from tigr81.commands.monorepo.affected import affected_components, changed_files
+from tigr81.commands.monorepo.manifest import Manifest
+from tigr81.commands.scaffold.project_template import (
+    Dependency,
+    ProjectTemplate,
+    ProjectTemplateOptions,
+    ProjectTypeEnum,
+)
+from tigr81.main import app
+
+runner = CliRunner()
+
+
+def _component(name: str, *deps: str, relative_path: str = ".") -> ProjectTemplate:
+    return ProjectTemplate(
+        project_type=ProjectTypeEnum.POETRY_PKG,
+        relative_path=relative_path,
+        project_options=ProjectTemplateOptions(name=name),
+        dependencies=[Dependency(name=dep) for dep in deps],
+    )
+
+
+@pytest.fixture
+def manifest() -> Manifest:
+    """Components under src, where api depends on lib, which depends on core."""
+    return Manifest(
+        relative_path="src",
+        components=[
+            _component("api", "lib", relative_path="services"),
+            _component("lib", "core"),
+            _component("core"),
+            _component("cli"),
+        ],
+    )
+
+
+@pytest.fixture
+def repo(tmp_path: pl.Path, monkeypatch, manifest: Manifest) -> pl.Path:
+    """A git repository holding the manifest and a file in every component."""
+    monkeypatch.chdir(tmp_path)
+    run_git("init", "-q", "-b", "main", cwd=tmp_path)
+    manifest.to_yaml()
+    for component in manifest.components:
+        location = manifest.component_location(component)
+        location.mkdir(parents=True)
+        (location / "pyproject.toml").write_text("")
+    run_git("add", "-A", cwd=tmp_path)
+    run_git("commit", "-q", "-m", "init", cwd=tmp_path)
+    return tmp_path
+
+
+@pytest.mark.parametrize(
+    "paths, expected",
+    [
+        ([], []),
+        (["README.md", "manifest.yml"], []),
+        (["src/core/core/__init__.py"], ["core", "lib", "api"]),
+        (["src/services/api/main.py", "src/cli/pyproject.toml"], ["cli", "api"]),
+        (["src/lib"], ["lib", "api"]),
+    ],
+)
+def test_affected_components(manifest: Manifest, paths, expected):
+    """Changed paths map onto components, expanded to their dependents."""
+    assert affected_components(manifest, [pl.Path(p) for p in paths]) == expected
+
+
+def test_changed_files(repo: pl.Path):
+    """Committed, uncommitted and untracked changes are listed."""
+    (repo / "src" / "lib" / "pyproject.toml").write_text("[project]\n")
+    run_git("commit", "-q", "-am", "lib", cwd=repo)
+    (repo / "src" / "cli" / "pyproject.toml").write_text("[project]\n")
+    (repo / "src" / "core" / "new.py").write_text("")
+
+    assert sorted(changed_files("HEAD~1")) == [
+        pl.Path("src/cli/pyproject.toml"),
+        pl.Path("src/core/new.py"),
+        pl.Path("src/lib/pyproject.toml"),
+    ]
+
+
+def test_changed_files_unknown_ref(repo: pl.Path):
+    """Unknown refs make git fail."""
+    with pytest.raises(subprocess.CalledProcessError):
+        changed_files("unknown-ref")
+
+
+def test_monorepo_affected(repo: pl.Path):
+    """The affected components are printed in build order, or as JSON."""
+    (repo / "src" / "lib" / "pyproject.toml").write_text("[project]\n")
+
+    result = runner.invoke(app, ["monorepo", "affected", "--since", "HEAD"])
+    assert result.exit_code == 0, result.output
+    assert result.output == "lib\napi\n"
+
+    result = runner.invoke(app, ["monorepo", "affected", "--since", "HEAD", "--json"])
+    assert json.loads(result.output) == ["lib", "api"]
+
+
+def test_monorepo_affected_unknown_ref(repo: pl.Path):
+    """Git errors are reported."""
+    result = runner.invoke(app, ["monorepo", "affected", "--since", "unknown-ref"])
+
+    assert result.exit_code == 1
+    assert "Could not list the files changed since unknown-ref" in result.output
+
+
+def test_monorepo_install_affected_since(repo: pl.Path, mocker: MockerFixture):
+    """Only the affected components are installed."""
+    pm = mocker.patch(
+        "tigr81.commands.monorepo.monorepo.get_package_manager"
+    ).return_value
+    (repo / "src" / "core" / "new.py").write_text("")
+
+    result = runner.invoke(
+        app, ["monorepo", "install", "--affected-since", "HEAD", "-j", "1"]
+    )
+
+    assert result.exit_code == 0, result.output
+    installed = [c.kwargs["cwd"].name for c in pm.install.call_args_list]
+    assert installed == ["core", "lib", "api"]
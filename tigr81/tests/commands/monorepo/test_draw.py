@@ -0,0 +1,98 @@
+import json
+import pathlib as pl
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from tigr81.commands.monorepo import draw
+from tigr81.commands.monorepo.manifest import Manifest
+from tigr81.commands.scaffold.project_template import (
+    Dependency,
+    ProjectTemplate,
+    ProjectTemplateOptions,
+    ProjectTypeEnum,
+)
+
+
+def _component(name: str, *dependencies: str, project_type=ProjectTypeEnum.POETRY_PKG):
+    return ProjectTemplate(
+        project_type=project_type,
+        project_options=ProjectTemplateOptions(name=name, description=f'The "{name}"'),
+        dependencies=[
+            Dependency(name=dependency, relative_path=pl.Path("..") / dependency)
+            for dependency in dependencies
+        ],
+    )
+
+
+@pytest.fixture
+def manifest() -> Manifest:
+    """A manifest where api depends on lib, and lib and cli depend on core."""
+    return Manifest(
+        name="mono",
+        components=[
+            _component("api", "lib", project_type=ProjectTypeEnum.FAST_API),
+            _component("lib", "core"),
+            _component("core"),
+            _component("cli", "core"),
+        ],
+    )
+
+
+def test_to_dot(manifest: Manifest):
+    """Edges go from the dependency to the dependent and labels are escaped."""
+    dot = draw.to_dot(manifest)
+
+    assert dot.startswith('digraph "mono" {\n')
+    assert '"lib" -> "api"' in dot
+    assert '"core" -> "cli"' in dot
+    assert 'label="core\\n\\nThe \\"core\\""' in dot
+    assert 'fillcolor="#836fff"' in dot.splitlines()[1]
+
+
+def test_to_mermaid(manifest: Manifest):
+    """Components get stable ids with their name as label."""
+    mermaid = draw.to_mermaid(manifest)
+
+    assert mermaid.splitlines() == [
+        "flowchart TD",
+        '    c0["api"]',
+        '    c1["lib"]',
+        '    c2["core"]',
+        '    c3["cli"]',
+        "    c1 --> c0",
+        "    c2 --> c1",
+        "    c2 --> c3",
+    ]
+
+
+def test_to_json(manifest: Manifest):
+    """The adjacency list has the dependencies and dependents of each component."""
+    data = json.loads(draw.to_json(manifest))
+
+    assert data["name"] == "mono"
+    core = data["components"][2]
+    assert core["name"] == "core"
+    assert core["project_type"] == "poetry_pkg"
+    assert core["dependencies"] == []
+    assert core["dependents"] == ["lib", "cli"]
+
+
+def test_to_svg_layers(manifest: Manifest):
+    """Components are laid out below their dependencies, in a well-formed document."""
+    root = ET.fromstring(draw.to_svg(manifest))  # noqa: S314
+    ns = {"svg": "http://www.w3.org/2000/svg"}
+
+    y = {
+        group.find("svg:text", ns).text: float(group.find("svg:rect", ns).get("y"))
+        for group in root.findall("svg:g", ns)
+    }
+    assert y["core"] < y["lib"] == y["cli"] < y["api"]
+    assert len(root.findall("svg:line", ns)) == 3
+
+
+def test_to_svg_empty():
+    """An empty manifest is drawn as an empty image."""
+    root = ET.fromstring(draw.to_svg(Manifest(name="empty", components=[])))  # noqa: S314
+
+    assert root.find("{http://www.w3.org/2000/svg}g") is None
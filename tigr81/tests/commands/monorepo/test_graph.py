@@ -0,0 +1,82 @@
+import pytest
+
+from tigr81.commands.monorepo.graph import CycleError, ManifestGraph
+from tigr81.commands.scaffold.project_template import (
+    Dependency,
+    ProjectTemplate,
+    ProjectTemplateOptions,
+    ProjectTypeEnum,
+)
+
+
+def _component(name: str, *deps: str) -> ProjectTemplate:
+    return ProjectTemplate(
+        project_type=ProjectTypeEnum.POETRY_PKG,
+        project_options=ProjectTemplateOptions(name=name),
+        dependencies=[Dependency(name=dep) for dep in deps],
+    )
+
+
+@pytest.fixture
+def graph() -> ManifestGraph:
+    """A graph where api needs lib and auth, auth needs lib, lib needs core."""
+    return ManifestGraph(
+        [
+            _component("api", "lib", "auth"),
+            _component("auth", "lib", "external"),
+            _component("lib", "core"),
+            _component("core"),
+            _component("cli"),
+        ]
+    )
+
+
+def test_graph_adjacency(graph: ManifestGraph):
+    """Forward and reverse adjacency only hold manifest components."""
+    assert graph.dependencies["auth"] == ["lib"]
+    assert graph.dependents["lib"] == ["api", "auth"]
+    assert "external" not in graph
+    assert graph["cli"].project_options.name == "cli"
+
+
+def test_graph_order(graph: ManifestGraph):
+    """Components come after their dependencies, otherwise in manifest order."""
+    assert graph.order() == ["core", "cli", "lib", "auth", "api"]
+
+
+def test_graph_transitive_queries(graph: ManifestGraph):
+    """Transitive dependencies and dependents are listed in manifest order."""
+    assert graph.transitive_dependencies("api") == ["auth", "lib", "core"]
+    assert graph.transitive_dependents("core") == ["api", "auth", "lib"]
+    assert graph.transitive_dependents("cli") == []
+    with pytest.raises(KeyError):
+        graph.transitive_dependencies("unknown")
+
+
+def test_graph_cycle():
+    """Cycles are reported with the components along them."""
+    graph = ManifestGraph(
+        [_component("a", "b"), _component("b", "c"), _component("c", "a"), _component("d")]
+    )
+
+    with pytest.raises(CycleError, match="a -> b -> c -> a") as exc_info:
+        graph.check()
+    assert exc_info.value.cycle == ["a", "b", "c", "a"]
+
+
+def test_graph_duplicate_names():
+    """Component names must be unique."""
+    with pytest.raises(ValueError, match="Duplicate component name 'a'"):
+        ManifestGraph([_component("a"), _component("a")])
+
+
+def test_graph_large_chain_is_linear():
+    """Long dependency chains are handled without recursion limits."""
+    names = [f"c{i}" for i in range(5000)]
+    graph = ManifestGraph(
+        [_component(names[0])]
+        + [_component(names[i], names[i - 1]) for i in range(1, len(names))]
+    )
+
+    assert graph.order() == names
+    assert len(graph.transitive_dependents("c0")) == 4999
@@ -0,0 +1,94 @@
+import pathlib as pl
+
+import pytest
+
+from tigr81.commands.monorepo.install_state import InstallState, hash_install_inputs
+from tigr81.commands.monorepo.manifest import Manifest
+from tigr81.commands.scaffold.project_template import (
+    Dependency,
+    ProjectTemplate,
+    ProjectTemplateOptions,
+    ProjectTypeEnum,
+)
+
+
+def _component(name: str, *deps: str) -> ProjectTemplate:
+    return ProjectTemplate(
+        project_type=ProjectTypeEnum.POETRY_PKG,
+        project_options=ProjectTemplateOptions(name=name),
+        dependencies=[
+            Dependency(name=dep, relative_path=pl.Path("..") / dep) for dep in deps
+        ],
+    )
+
+
+@pytest.fixture
+def manifest(tmp_path: pl.Path) -> Manifest:
+    """A manifest where app depends on lib, which depends on core."""
+    for name in ["app", "lib", "core", "cli"]:
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "pyproject.toml").write_text(f"[tool.poetry]\nname = '{name}'\n")
+    return Manifest(
+        relative_path=tmp_path,
+        components=[
+            _component("app", "lib"),
+            _component("lib", "core"),
+            _component("core"),
+            _component("cli"),
+        ],
+    )
+
+
+@pytest.fixture
+def state(manifest: Manifest) -> InstallState:
+    """The install state of the manifest with every component installed."""
+    state = InstallState()
+    for component in manifest.components:
+        state.update(manifest, component)
+    return state
+
+
+def test_install_state_plan_everything_when_empty(manifest: Manifest):
+    """Components never installed are installed, in dependency order."""
+    assert InstallState().plan(manifest) == ["core", "cli", "lib", "app"]
+
+
+def test_install_state_plan_up_to_date(manifest: Manifest, state: InstallState):
+    """Nothing is installed when nothing changed."""
+    assert state.plan(manifest) == []
+
+
+def test_install_state_plan_changed_component(
+    tmp_path: pl.Path, manifest: Manifest, state: InstallState
+):
+    """A changed lock file reinstalls the component and its dependents."""
+    (tmp_path / "lib" / "poetry.lock").write_text("# lock\n")
+
+    assert state.plan(manifest) == ["lib", "app"]
+
+
+def test_install_state_plan_changed_path_dependency(
+    tmp_path: pl.Path, manifest: Manifest, state: InstallState
+):
+    """A changed path dependency makes its dependents outdated."""
+    (tmp_path / "core" / "pyproject.toml").write_text("[tool.poetry]\nname = 'core2'\n")
+
+    assert state.plan(manifest) == ["core", "lib", "app"]
+
+
+def test_hash_install_inputs_ignores_other_files(tmp_path: pl.Path, manifest: Manifest):
+    """Only pyproject.toml and poetry.lock are hashed."""
+    component = manifest.components[3]
+    before = hash_install_inputs(manifest, component)
+    (tmp_path / "cli" / "main.py").write_text("print('hi')\n")
+
+    assert hash_install_inputs(manifest, component) == before
+
+
+def test_install_state_roundtrip(tmp_path: pl.Path, state: InstallState):
+    """The state is written to and read from YAML."""
+    file_name = str(tmp_path / "state.yml")
+    state.to_yaml(file_name)
+
+    assert InstallState.from_yaml(file_name) == state
+    assert InstallState.from_yaml(str(tmp_path / "missing.yml")) == InstallState()
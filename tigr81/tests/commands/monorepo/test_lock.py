@@ -0,0 +1,71 @@
+import pathlib as pl
+
+import pytest
+
+from tigr81.commands.monorepo.lock import ManifestLock, ScaffoldReason
+from tigr81.commands.monorepo.manifest import Manifest
+from tigr81.commands.scaffold.project_template import (
+    ProjectTemplate,
+    ProjectTemplateOptions,
+    ProjectTypeEnum,
+)
+
+
+def _component(name: str, description: str = "a component") -> ProjectTemplate:
+    return ProjectTemplate(
+        project_type=ProjectTypeEnum.POETRY_PKG,
+        project_options=ProjectTemplateOptions(name=name, description=description),
+    )
+
+
+@pytest.fixture
+def manifest(tmp_path: pl.Path) -> Manifest:
+    """A manifest of three components, with the folders of "lib" and "cli"."""
+    (tmp_path / "lib").mkdir()
+    (tmp_path / "cli").mkdir()
+    return Manifest(
+        relative_path=tmp_path,
+        components=[_component("app"), _component("lib"), _component("cli")],
+    )
+
+
+def test_fingerprint_tracks_template_inputs():
+    """The fingerprint changes with the options and the checkout only."""
+    component = _component("lib")
+
+    assert component.fingerprint() == _component("lib").fingerprint()
+    assert component.fingerprint() != _component("lib", "changed").fingerprint()
+    assert component.fingerprint() != component.fingerprint(checkout="v2")
+
+
+def test_manifest_lock_plan(manifest: Manifest):
+    """Missing, changed and untracked components are planned."""
+    lock = ManifestLock(components={"lib": "outdated"})
+
+    plan = {step.component.project_options.name: step.reason for step in lock.plan(manifest)}
+
+    assert plan == {
+        "app": ScaffoldReason.MISSING,
+        "lib": ScaffoldReason.CHANGED,
+        "cli": ScaffoldReason.UNTRACKED,
+    }
+
+
+def test_manifest_lock_up_to_date(manifest: Manifest):
+    """Components matching their fingerprint are not planned."""
+    lock = ManifestLock()
+    for component in manifest.components:
+        lock.update(component)
+
+    assert [s.component.project_options.name for s in lock.plan(manifest)] == ["app"]
+
+
+def test_manifest_lock_roundtrip_and_prune(tmp_path: pl.Path, manifest: Manifest):
+    """The lock is written to and read from YAML, pruned of removed components."""
+    file_name = str(tmp_path / "manifest.lock")
+    lock = ManifestLock(components={"lib": "abc", "removed": "def"})
+    lock.prune(manifest)
+    lock.to_yaml(file_name)
+
+    assert ManifestLock.from_yaml(file_name) == ManifestLock(components={"lib": "abc"})
+    assert ManifestLock.from_yaml(str(tmp_path / "missing.lock")) == ManifestLock()
@@ -0,0 +1,183 @@
+import pathlib as pl
+
+import pytest
+import typer
+from pytest_mock import MockerFixture
+
+from tigr81.commands.monorepo.manifest import Manifest, manifest_cache_version
+from tigr81.commands.scaffold.project_template import (
+    Dependency,
+    ProjectTemplate,
+    ProjectTemplateOptions,
+    ProjectTypeEnum,
+)
+
+
+def _component(name: str, *deps: str) -> ProjectTemplate:
+    return ProjectTemplate(
+        project_type=ProjectTypeEnum.POETRY_PKG,
+        project_options=ProjectTemplateOptions(name=name),
+        dependencies=[
+            Dependency(name=dep, relative_path=pl.Path("..") / dep) for dep in deps
+        ],
+    )
+
+
+@pytest.fixture
+def manifest(tmp_path: pl.Path) -> Manifest:
+    """A manifest where app and cli depend on lib, with component folders."""
+    manifest = Manifest(
+        relative_path=tmp_path,
+        components=[_component("app", "lib"), _component("cli", "lib"), _component("lib")],
+    )
+    for component in manifest.components:
+        location = manifest.component_location(component)
+        location.mkdir()
+        (location / "pyproject.toml").write_text(
+            "[tool.poetry.dependencies]\n"
+            'python = "^3.9"\n'
+            'lib = {path = "../lib", develop = true}\n'
+        )
+    return manifest
+
+
+def test_graph(manifest: Manifest):
+    """The graph is built once and indexes the components by name."""
+    graph = manifest.graph
+
+    assert manifest.graph is graph
+    assert graph["lib"] is manifest.components[2]
+    assert graph.dependents == {"app": [], "cli": [], "lib": ["app", "cli"]}
+
+
+def test_remove(tmp_path: pl.Path, manifest: Manifest, mocker: MockerFixture):
+    """The component is removed from every dependent with the package manager."""
+    mocker.patch("typer.confirm", return_value=True)
+    pm = mocker.patch(
+        "tigr81.commands.monorepo.manifest.get_package_manager"
+    ).return_value
+
+    manifest.remove("lib", jobs=2)
+
+    removed_from = sorted(c.args[0].name for c in pm.remove.call_args_list)
+    assert removed_from == ["app", "cli"]
+    pm.lock.assert_not_called()
+    assert not (tmp_path / "lib").exists()
+    assert [c.project_options.name for c in manifest.components] == ["app", "cli"]
+    assert "lib" not in manifest.graph
+    assert all(c.dependencies == [] for c in manifest.components)
+
+
+def test_remove_no_lock(tmp_path: pl.Path, manifest: Manifest, mocker: MockerFixture):
+    """Without lock pyproject.toml files are edited and only locked."""
+    mocker.patch("typer.confirm", return_value=True)
+    pm = mocker.patch(
+        "tigr81.commands.monorepo.manifest.get_package_manager"
+    ).return_value
+
+    manifest.remove("lib", lock=False)
+
+    pm.remove.assert_not_called()
+    assert sorted(c.args[0].name for c in pm.lock.call_args_list) == ["app", "cli"]
+    assert (tmp_path / "app" / "pyproject.toml").read_text() == (
+        '[tool.poetry.dependencies]\npython = "^3.9"\n'
+    )
+
+
+def test_remove_failure_keeps_component(
+    tmp_path: pl.Path, manifest: Manifest, mocker: MockerFixture
+):
+    """If a dependent cannot be updated the component is not deleted."""
+    mocker.patch("typer.confirm", return_value=True)
+    pm = mocker.patch(
+        "tigr81.commands.monorepo.manifest.get_package_manager"
+    ).return_value
+    pm.remove.side_effect = typer.Exit()
+
+    with pytest.raises(typer.Exit):
+        manifest.remove("lib")
+
+    assert pm.remove.call_count == 2
+    assert (tmp_path / "lib").exists()
+    assert len(manifest.components) == 3
+
+
+def test_remove_unknown_component(manifest: Manifest):
+    """Unknown components are rejected."""
+    with pytest.raises(ValueError, match="not found"):
+        manifest.remove("unknown")
+
+
+def test_from_yaml_cache(tmp_path: pl.Path, manifest: Manifest, user_cache: pl.Path, mocker: MockerFixture):
+    """An unchanged manifest is validated once, then read from the cache."""
+    manifest_path = tmp_path / "manifest.yml"
+    manifest.to_yaml(manifest_path)
+    validate = mocker.spy(Manifest, "__init__")
+
+    first = Manifest.from_yaml(manifest_path)
+    second = Manifest.from_yaml(manifest_path)
+
+    assert validate.call_count == 1
+    assert second == first == manifest
+    assert second is not first
+    assert len(list((user_cache / "cache" / "manifests").glob("*.pickle"))) == 1
+
+    manifest.components.pop()
+    manifest.to_yaml(manifest_path)
+    assert Manifest.from_yaml(manifest_path) == manifest
+    assert validate.call_count == 2
+
+
+def test_from_yaml_cache_schema_change(
+    tmp_path: pl.Path, manifest: Manifest, user_cache: pl.Path, mocker: MockerFixture
+):
+    """Manifests cached with another schema of the models are validated again."""
+    manifest_path = tmp_path / "manifest.yml"
+    manifest.to_yaml(manifest_path)
+    Manifest.from_yaml(manifest_path)
+    validate = mocker.spy(Manifest, "__init__")
+
+    schema = Manifest.model_json_schema()
+    schema["properties"]["added"] = {"type": "string"}
+    mocker.patch.object(Manifest, "model_json_schema", return_value=schema)
+    manifest_cache_version.cache_clear()
+    try:
+        assert Manifest.from_yaml(manifest_path) == manifest
+    finally:
+        manifest_cache_version.cache_clear()
+
+    assert validate.call_count == 1
+
+
+def test_from_yaml_graph_only(tmp_path: pl.Path, manifest: Manifest):
+    """The graph-only view skips validation but keeps the graph and the locations."""
+    manifest_path = tmp_path / "manifest.yml"
+    manifest.to_yaml(manifest_path)
+    text = manifest_path.read_text().replace("email@gmail.com", "not an email")
+    manifest_path.write_text(text)
+
+    view = Manifest.from_yaml(manifest_path, graph_only=True)
+
+    assert view.graph.dependents == manifest.graph.dependents
+    assert view.graph.order() == manifest.graph.order()
+    assert view.component_location(view.components[0]) == manifest.component_location(
+        manifest.components[0]
+    )
+    with pytest.raises(ValueError):
+        Manifest.from_yaml(manifest_path)
+
+
+def test_from_yaml_graph_only_cache(tmp_path: pl.Path, manifest: Manifest, user_cache: pl.Path):
+    """Graph-only views are cached, and served by cached validated manifests."""
+    manifest_path = tmp_path / "manifest.yml"
+    manifest.to_yaml(manifest_path)
+    cache = user_cache / "cache" / "manifests"
+
+    view = Manifest.from_yaml(manifest_path, graph_only=True)
+    assert [p.name.split(".", 1)[1] for p in cache.iterdir()] == ["graph.pickle"]
+    assert Manifest.from_yaml(manifest_path, graph_only=True).graph.order() == view.graph.order()
+
+    Manifest.from_yaml(manifest_path)
+    for cached in cache.glob("*.graph.pickle"):
+        cached.unlink()
+    assert Manifest.from_yaml(manifest_path, graph_only=True) == manifest
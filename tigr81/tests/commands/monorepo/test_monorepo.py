@@ -0,0 +1,285 @@
+import pathlib as pl
+
+import pytest
+import typer
+from pytest_mock import MockerFixture
+from typer.testing import CliRunner
+
+import tigr81.utils as tigr81_utils
+from tigr81.commands.core.package_manager import PackageManagerEnum
+from tigr81.commands.core.scheduler import TaskResult, TaskStatus
+from tigr81.commands.monorepo.manifest import Manifest
+from tigr81.commands.scaffold.project_template import (
+    Dependency,
+    ProjectTemplate,
+    ProjectTemplateOptions,
+    ProjectTypeEnum,
+)
+from tigr81.main import app
+
+runner = CliRunner()
+
+
+def _component(name: str, *dependencies: str) -> ProjectTemplate:
+    return ProjectTemplate(
+        project_type=ProjectTypeEnum.POETRY_PKG,
+        project_options=ProjectTemplateOptions(name=name),
+        dependencies=[
+            Dependency(name=dependency, relative_path=pl.Path("..") / dependency)
+            for dependency in dependencies
+        ],
+    )
+
+
+@pytest.fixture
+def monorepo(tmp_path: pl.Path, monkeypatch) -> pl.Path:
+    """A monorepo manifest where app depends on lib, which depends on core."""
+    monkeypatch.chdir(tmp_path)
+    Manifest(
+        components=[
+            _component("app", "lib"),
+            _component("lib", "core"),
+            _component("core"),
+            _component("cli"),
+        ]
+    ).to_yaml()
+    return tmp_path
+
+
+def test_monorepo_install_dependency_order(monorepo: pl.Path, mocker: MockerFixture):
+    """Components are installed after their dependencies."""
+    pm = mocker.patch(
+        "tigr81.commands.monorepo.monorepo.get_package_manager"
+    ).return_value
+
+    result = runner.invoke(app, ["monorepo", "install", "--jobs", "1"])
+
+    assert result.exit_code == 0, result.output
+    installed = [c.kwargs["cwd"].name for c in pm.install.call_args_list]
+    assert installed == ["core", "cli", "lib", "app"]
+    assert "4 installed, 0 not installed." in result.output
+
+
+def test_monorepo_install_fail_fast(monorepo: pl.Path, mocker: MockerFixture):
+    """A failed install skips the components not started yet."""
+    get_pm = mocker.patch("tigr81.commands.monorepo.monorepo.get_package_manager")
+    get_pm.return_value.name = "uv"
+    get_pm.return_value.install.side_effect = typer.Exit()
+
+    result = runner.invoke(app, ["monorepo", "install", "--jobs", "1", "--pm", "uv"])
+
+    assert result.exit_code == 1
+    get_pm.assert_called_once_with(PackageManagerEnum.UV)
+    assert get_pm.return_value.install.call_count == 1
+    assert "'uv install' failed" in result.output
+    assert "0 installed, 4 not installed." in result.output
+
+
+def test_monorepo_install_keep_going(monorepo: pl.Path, mocker: MockerFixture):
+    """With --keep-going only the dependents of a failed component are skipped."""
+    pm = mocker.patch(
+        "tigr81.commands.monorepo.monorepo.get_package_manager"
+    ).return_value
+
+    def install(cwd: pl.Path):
+        if cwd.name == "lib":
+            raise typer.Exit()
+
+    pm.install.side_effect = install
+
+    result = runner.invoke(app, ["monorepo", "install", "--keep-going"])
+
+    assert result.exit_code == 1
+    installed = {c.kwargs["cwd"].name for c in pm.install.call_args_list}
+    assert installed == {"core", "cli", "lib"}
+    assert "2 installed, 2 not installed." in result.output
+
+
+def test_monorepo_scaffold(monorepo: pl.Path, mocker: MockerFixture):
+    """Scaffolding is delegated to scaffold_monorepo and reported per component."""
+    scaffold_monorepo = mocker.patch(
+        "tigr81.commands.core.scaffold.scaffold_monorepo",
+        return_value=[
+            TaskResult("core", TaskStatus.OK, 1.0),
+            TaskResult("lib", TaskStatus.FAILED, 0.5, "boom"),
+        ],
+    )
+
+    result = runner.invoke(app, ["monorepo", "scaffold", "-j", "2", "--keep-going"])
+
+    assert result.exit_code == 1
+    assert scaffold_monorepo.call_args.kwargs["jobs"] == 2
+    assert scaffold_monorepo.call_args.kwargs["keep_going"] is True
+    assert "lib  (boom)" in result.output
+    assert "1 scaffolded, 1 not scaffolded." in result.output
+
+
+def test_monorepo_scaffold_incremental(monorepo: pl.Path, mocker: MockerFixture):
+    """Only components that changed since the last scaffold are scaffolded again."""
+    def scaffold(components, **kwargs):
+        for component in components:
+            (kwargs["relative_path"] / component.project_options.name).mkdir(
+                parents=True, exist_ok=True
+            )
+        return [
+            TaskResult(c.project_options.name, TaskStatus.OK) for c in components
+        ]
+
+    scaffold_monorepo = mocker.patch(
+        "tigr81.commands.core.scaffold.scaffold_monorepo", side_effect=scaffold
+    )
+    assert runner.invoke(app, ["monorepo", "scaffold"]).exit_code == 0
+    assert (monorepo / "manifest.lock").exists()
+
+    result = runner.invoke(app, ["monorepo", "scaffold"])
+    assert result.exit_code == 0
+    assert "Every component is up to date." in result.output
+    assert scaffold_monorepo.call_args.args[0] == []
+
+    manifest = Manifest(**tigr81_utils.read_yaml("manifest.yml"))
+    manifest.components[1].project_options.description = "changed"
+    manifest.to_yaml()
+
+    result = runner.invoke(app, ["monorepo", "scaffold", "--dry-run"])
+    assert result.exit_code == 0
+    assert "changed    lib" in result.output
+    assert scaffold_monorepo.call_count == 2
+
+    result = runner.invoke(app, ["monorepo", "scaffold"])
+    assert result.exit_code == 0
+    assert [c.project_options.name for c in scaffold_monorepo.call_args.args[0]] == [
+        "lib"
+    ]
+
+
+def test_monorepo_install_incremental(monorepo: pl.Path, mocker: MockerFixture):
+    """Up to date components are not installed again, unless --force is given."""
+    pm = mocker.patch(
+        "tigr81.commands.monorepo.monorepo.get_package_manager"
+    ).return_value
+
+    def installed():
+        names = [c.kwargs["cwd"].name for c in pm.install.call_args_list]
+        pm.install.reset_mock()
+        return names
+
+    assert runner.invoke(app, ["monorepo", "install", "-j", "1"]).exit_code == 0
+    assert installed() == ["core", "cli", "lib", "app"]
+
+    result = runner.invoke(app, ["monorepo", "install", "-j", "1"])
+    assert result.exit_code == 0
+    assert "4 components are up to date" in result.output
+    assert installed() == []
+
+    lib = monorepo / "src" / "lib"
+    lib.mkdir(parents=True)
+    (lib / "pyproject.toml").write_text("[tool.poetry]\n")
+    assert runner.invoke(app, ["monorepo", "install", "-j", "1"]).exit_code == 0
+    assert installed() == ["lib", "app"]
+
+    assert runner.invoke(app, ["monorepo", "install", "--force"]).exit_code == 0
+    assert sorted(installed()) == ["app", "cli", "core", "lib"]
+
+
+def test_monorepo_install_retries_failed_components(
+    monorepo: pl.Path, mocker: MockerFixture
+):
+    """Components that failed or were skipped are installed on the next run."""
+    pm = mocker.patch(
+        "tigr81.commands.monorepo.monorepo.get_package_manager"
+    ).return_value
+
+    def install(cwd: pl.Path):
+        if cwd.name == "lib":
+            raise typer.Exit()
+
+    pm.install.side_effect = install
+
+    assert runner.invoke(app, ["monorepo", "install", "-k", "-j", "1"]).exit_code == 1
+    pm.install.reset_mock(side_effect=True)
+
+    assert runner.invoke(app, ["monorepo", "install", "-j", "1"]).exit_code == 0
+    assert [c.kwargs["cwd"].name for c in pm.install.call_args_list] == ["lib", "app"]
+
+
+@pytest.mark.parametrize(
+    "args, expected",
+    [
+        (["deps", "app"], "lib\ncore\n"),
+        (["rdeps", "core"], "app\nlib\n"),
+        (["order"], "core\ncli\nlib\napp\n"),
+        (["order", "lib"], "core\nlib\n"),
+    ],
+)
+def test_monorepo_graph(monorepo: pl.Path, args, expected):
+    """The graph commands print one component per line."""
+    result = runner.invoke(app, ["monorepo", "graph", *args])
+
+    assert result.exit_code == 0, result.output
+    assert result.output == expected
+
+
+def test_monorepo_graph_unknown_component(monorepo: pl.Path):
+    """Unknown components are rejected."""
+    result = runner.invoke(app, ["monorepo", "graph", "deps", "unknown"])
+
+    assert result.exit_code == 1
+    assert "Component 'unknown' not found in the manifest." in result.output
+
+
+def test_monorepo_graph_cycle(tmp_path: pl.Path, monkeypatch):
+    """Cycles are reported."""
+    monkeypatch.chdir(tmp_path)
+    Manifest(components=[_component("a", "b"), _component("b", "a")]).to_yaml()
+
+    result = runner.invoke(app, ["monorepo", "graph", "order"])
+
+    assert result.exit_code == 1
+    assert "Dependency cycle: a -> b -> a" in result.output
+
+
+@pytest.mark.parametrize("draw_format", ["svg", "dot", "mermaid", "json"])
+def test_monorepo_draw_native(monorepo: pl.Path, mocker: MockerFixture, draw_format):
+    """The text formats are drawn without Graphviz."""
+    digraph = mocker.patch.object(Manifest, "to_graphviz_digraph")
+    manifest = Manifest.from_yaml()
+
+    result = runner.invoke(app, ["monorepo", "draw", "--format", draw_format])
+
+    assert result.exit_code == 0, result.output
+    extension = "mmd" if draw_format == "mermaid" else draw_format
+    assert (monorepo / f"{manifest.name}.{extension}").is_file()
+    digraph.assert_not_called()
+
+
+def test_monorepo_draw_stdout(monorepo: pl.Path):
+    """The drawing is written to stdout with '-o -'."""
+    result = runner.invoke(app, ["monorepo", "draw", "-f", "mermaid", "-o", "-"])
+
+    assert result.exit_code == 0, result.output
+    assert "c1 --> c0" in result.stdout
+
+
+def test_monorepo_draw_png(monorepo: pl.Path, mocker: MockerFixture):
+    """PNG is still rendered by Graphviz."""
+    digraph = mocker.patch.object(Manifest, "to_graphviz_digraph")
+
+    result = runner.invoke(app, ["monorepo", "draw"])
+
+    assert result.exit_code == 0, result.output
+    digraph.return_value.render.assert_called_once_with()
+
+
+def test_monorepo_remove_does_not_draw(monorepo: pl.Path, mocker: MockerFixture):
+    """Removing a component draws the manifest only when asked."""
+    mocker.patch.object(Manifest, "remove")
+    digraph = mocker.patch.object(Manifest, "to_graphviz_digraph")
+
+    assert runner.invoke(app, ["monorepo", "remove"], input="cli\n").exit_code == 0
+    digraph.assert_not_called()
+    assert not list(monorepo.glob("*.svg"))
+
+    result = runner.invoke(app, ["monorepo", "remove", "--draw", "svg"], input="cli\n")
+    assert result.exit_code == 0, result.output
+    assert list(monorepo.glob("*.svg"))
+    digraph.assert_not_called()
@@ -1,7 +1,85 @@
+import pathlib as pl
+import subprocess
+from typing import Dict
+
 import pytest
 
 
+def run_git(*args: str, cwd: pl.Path = None) -> str:
+    """Run a git command with a fixed identity and return its stdout."""
+    return subprocess.run(  # noqa: S603
+        ["git", "-c", "user.name=tigr81", "-c", "user.email=tigr81@example.com", *args],  # noqa: S607
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+class GitRemote:
+    """A local bare git repository reachable through a file:// URL."""
+
+    def __init__(self, root: pl.Path):
+        self.path = root / "remote.git"
+        self.work = root / "work"
+        self.work.mkdir(parents=True)
+        run_git("init", "-q", "-b", "main", cwd=self.work)
+        run_git("init", "-q", "--bare", str(self.path))
+        run_git("remote", "add", "origin", str(self.path), cwd=self.work)
+
+    @property
+    def url(self) -> str:
+        """The file:// URL of the repository."""
+        return self.path.as_uri()
+
+    def commit(self, files: Dict[str, str], message: str = "commit", branch: str = "main") -> str:
+        """Commit ``files`` (relative path -> content) on ``branch``, push it and return the SHA."""
+        for name, content in files.items():
+            file_path = self.work / name
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_text(content)
+        run_git("add", "-A", cwd=self.work)
+        run_git("commit", "-q", "-m", message, cwd=self.work)
+        run_git("push", "-q", "origin", f"HEAD:refs/heads/{branch}", cwd=self.work)
+        return run_git("rev-parse", "HEAD", cwd=self.work)
+
+    def tag(self, name: str) -> None:
+        """Tag the last commit and push the tag."""
+        run_git("tag", name, cwd=self.work)
+        run_git("push", "-q", "origin", name, cwd=self.work)
+
+
 @pytest.fixture
 def mock_repo_url():
     """Mock repo url."""
-    return "https://github.com/giuseppeambrosio97/ranged-heap"
\ No newline at end of file
+    return "https://github.com/giuseppeambrosio97/ranged-heap"
+
+
+@pytest.fixture
+def git_remote(tmp_path) -> GitRemote:
+    """A local bare git repository with a `main` branch holding a couple of files."""
+    remote = GitRemote(tmp_path / "git_remote")
+    remote.commit({"README.md": "hello\n", "sub/file.txt": "sub\n"}, message="init")
+    return remote
+
+
+@pytest.fixture(autouse=True)
+def no_user_cache(monkeypatch):
+    """Keep tests away from the on-disk caches under the user config folder."""
+    monkeypatch.setenv("TIGR81_NO_CACHE", "1")
+
+
+@pytest.fixture
+def user_cache(tmp_path, monkeypatch, mocker):
+    """Enable the caches, stored in a temporary folder."""
+    monkeypatch.delenv("TIGR81_NO_CACHE")
+    cache_location = tmp_path / "tigr81_cache"
+    mocker.patch("tigr81.commands.core.mirror.MIRRORS_LOCATION", cache_location / "mirrors")
+    mocker.patch("tigr81.commands.cache.cache.USER_CACHE_LOCATION", cache_location / "cache")
+    mocker.patch("tigr81.commands.hub.index.HUB_INDEX_LOCATION", cache_location / "cache" / "hub_index")
+    mocker.patch("tigr81.commands.core.package_manager.PACKAGE_MANAGER_PROBES_LOCATION", cache_location / "cache" / "package_managers.json")
+    mocker.patch("tigr81.commands.monorepo.manifest.MANIFEST_CACHE_LOCATION", cache_location / "cache" / "manifests")
+    mocker.patch("tigr81.commands.core.refs.REFS_CACHE_LOCATION", cache_location / "cache" / "refs.json")
+    mocker.patch("tigr81.commands.core.render_cache.RENDER_CACHE_LOCATION", cache_location / "cache" / "renders")
+    mocker.patch("tigr81.commands.core.archive.ARCHIVES_LOCATION", cache_location / "cache" / "archives")
+    return cache_location
@@ -0,0 +1,66 @@
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+import pytest
+
+# Budget for the cumulative import time of tigr81.main, in microseconds.
+IMPORT_BUDGET_US = int(os.environ.get("TIGR81_IMPORT_BUDGET_US", 300_000))
+
+HEAVY_MODULES = [
+    "copier",
+    "cookiecutter",
+    "graphviz",
+    "InquirerPy",
+    "pydantic",
+    "tigr81.commands.hub.models",
+]
+
+VERSION_SNIPPET = "from tigr81.main import app; app(['version'], standalone_mode=False)"
+SNIPPETS = [VERSION_SNIPPET, "import tigr81.main"]
+
+
+def _import_times(snippet: str) -> Dict[str, int]:
+    """Run ``snippet`` under ``python -X importtime`` and return cumulative times."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", snippet],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+def _imported_modules(snippet: str) -> List[str]:
+    """Run ``snippet`` in a fresh interpreter and return the modules it imported."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", f"{snippet}\nimport json, sys\nprint(json.dumps([*sys.modules]))"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+@pytest.mark.parametrize("snippet", SNIPPETS)
+def test_cli_does_not_import_heavy_modules(snippet):
+    """Importing the CLI or running `tigr81 version` imports no template backend."""
+    modules = _imported_modules(snippet)
+    imported = [module for module in HEAVY_MODULES if module in modules]
+    assert imported == []
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("snippet", SNIPPETS)
+def test_main_import_time_budget(snippet):
+    """Importing the CLI entrypoint stays under the import time budget."""
+    times = _import_times(snippet)
+    assert times["tigr81.main"] < IMPORT_BUDGET_US
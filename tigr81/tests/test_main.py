@@ -7,4 +7,18 @@ runner = CliRunner()
 def test_version():
     """Test the version command."""
     result = runner.invoke(app, ['version'])
-    assert result.exit_code == 0
\ No newline at end of file
+    assert result.exit_code == 0
+
+def test_help_lists_lazy_commands():
+    """The root help lists every sub-command without importing them."""
+    result = runner.invoke(app, ['--help'])
+    assert result.exit_code == 0
+    for command in ['version', 'scaffold', 'hub', 'monorepo']:
+        assert command in result.stdout
+
+
+def test_lazy_sub_app_is_resolved():
+    """Lazy sub-apps are imported and invoked on demand."""
+    result = runner.invoke(app, ['hub', '--help'])
+    assert result.exit_code == 0
+    assert 'scaffold' in result.stdout
@@ -0,0 +1,140 @@
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import tigr81.utils as tigr81_utils
+
+
+def test_atomic_write_replaces_file(tmp_path):
+    """The file is replaced with the new content and keeps its permissions."""
+    path = tmp_path / "hub.yml"
+    path.write_text("old")
+    os.chmod(path, 0o640)
+
+    with tigr81_utils.atomic_write(path) as f:
+        f.write("new")
+        assert path.read_text() == "old"
+
+    assert path.read_text() == "new"
+    if sys.platform != "win32":
+        assert path.stat().st_mode & 0o777 == 0o640
+    assert [p.name for p in tmp_path.iterdir()] == ["hub.yml"]
+
+
+def test_atomic_write_interrupted(tmp_path):
+    """An interrupted write leaves the previous content and no temporary file."""
+    path = tmp_path / "hub.yml"
+    path.write_text("old")
+
+    with pytest.raises(KeyboardInterrupt):
+        with tigr81_utils.atomic_write(path) as f:
+            f.write("truncat")
+            raise KeyboardInterrupt
+
+    assert path.read_text() == "old"
+    assert [p.name for p in tmp_path.iterdir()] == ["hub.yml"]
+
+
+def test_file_lock_serializes_read_modify_write(tmp_path):
+    """Read-modify-write cycles under the lock do not lose updates."""
+    path = tmp_path / "counter"
+    path.write_text("0")
+
+    def increment(_):
+        with tigr81_utils.file_lock(path):
+            value = int(path.read_text())
+            time.sleep(0.001)
+            with tigr81_utils.atomic_write(path) as f:
+                f.write(str(value + 1))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(increment, range(40)))
+
+    assert path.read_text() == "40"
+
+
+def test_clone_file(tmp_path):
+    """The copy has the content and permissions of the file, and is independent of it."""
+    src = tmp_path / "src.txt"
+    src.write_text("content")
+    os.chmod(src, 0o700)
+    dst = tmp_path / "dst.txt"
+    dst.write_text("previous content")
+
+    tigr81_utils.clone_file(src, dst)
+    src.write_text("changed")
+
+    assert dst.read_text() == "content"
+    if sys.platform != "win32":
+        assert dst.stat().st_mode & 0o777 == 0o700
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Symbolic links need privileges on Windows")
+@pytest.mark.parametrize("linux", [True, False], ids=["linux", "shutil"])
+def test_clone_file_replaces_symlink(tmp_path, mocker, linux):
+    """A symbolic link at the destination is replaced, not written through."""
+    src = tmp_path / "src.txt"
+    src.write_text("content")
+    target = tmp_path / "outside" / "target.txt"
+    dst = tmp_path / "dst.txt"
+    os.symlink(target, dst)
+    if not linux:
+        mocker.patch("tigr81.utils.files.sys.platform", "darwin")
+
+    tigr81_utils.clone_file(src, dst)
+
+    assert not dst.is_symlink()
+    assert dst.read_text() == "content"
+    assert not target.parent.exists()
+
+    target.parent.mkdir()
+    target.write_text("target")
+    os.unlink(dst)
+    os.symlink(target, dst)
+
+    tigr81_utils.clone_file(src, dst)
+
+    assert not dst.is_symlink()
+    assert target.read_text() == "target"
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="reflink and copy_file_range are Linux only")
+def test_clone_file_fallbacks(tmp_path, mocker):
+    """Without reflinks the content is copied in kernel, and without that by shutil."""
+    src = tmp_path / "src.bin"
+    src.write_bytes(b"\0\1" * 1000)
+    mocker.patch("tigr81.utils.files.fcntl.ioctl", side_effect=OSError("no reflink"))
+    copy_file_range = mocker.spy(os, "copy_file_range")
+
+    tigr81_utils.clone_file(src, tmp_path / "range.bin")
+    assert (tmp_path / "range.bin").read_bytes() == src.read_bytes()
+    assert copy_file_range.called
+
+    mocker.patch("os.copy_file_range", side_effect=OSError("cross device"))
+    tigr81_utils.clone_file(src, tmp_path / "copy.bin")
+    assert (tmp_path / "copy.bin").read_bytes() == src.read_bytes()
+
+
+def test_copy_tree(tmp_path):
+    """The tree is merged into the destination, replacing existing files."""
+    src = tmp_path / "src"
+    (src / "assets" / "img").mkdir(parents=True)
+    (src / "assets" / "img" / "logo.png").write_bytes(b"\x89PNG")
+    (src / "README.md").write_text("new")
+    dst = tmp_path / "dst"
+    (dst / "assets").mkdir(parents=True)
+    (dst / "assets" / "keep.txt").write_text("keep")
+    (dst / "README.md").write_text("old")
+    if sys.platform != "win32":
+        os.symlink("README.md", src / "LINK.md")
+
+    tigr81_utils.copy_tree(src, dst, jobs=2)
+
+    assert (dst / "assets" / "img" / "logo.png").read_bytes() == b"\x89PNG"
+    assert (dst / "assets" / "keep.txt").read_text() == "keep"
+    assert (dst / "README.md").read_text() == "new"
+    if sys.platform != "win32":
+        assert os.readlink(dst / "LINK.md") == "README.md"
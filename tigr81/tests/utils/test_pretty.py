@@ -35,3 +35,11 @@ def test_pretty_list_special_characters():
     """Test for a list with special characters."""
     result = tigr81_utils.pretty_list(["apple", "banana", "!@#$%^&*()"])
     assert result == "apple, banana and !@#$%^&*()"
+
+
+def test_pretty_size():
+    """Test human-readable sizes."""
+    assert tigr81_utils.pretty_size(0) == "0 B"
+    assert tigr81_utils.pretty_size(1023) == "1023 B"
+    assert tigr81_utils.pretty_size(1536) == "1.5 KiB"
+    assert tigr81_utils.pretty_size(5 * 1024**3) == "5.0 GiB"
@@ -13,6 +13,7 @@ USER_CONFIG_LOCATION = pl.Path.home() / ".tigr81rc"
 USER_CONFIG_LOCATION.mkdir(exist_ok=True)
 USER_HUB_LOCATION = USER_CONFIG_LOCATION / "hubs"
 USER_HUB_LOCATION.mkdir(exist_ok=True)
+USER_CACHE_LOCATION = USER_CONFIG_LOCATION / "cache"
 
 AVAILABLE_HUBS = [HUBS_LOCATION, USER_HUB_LOCATION]
 
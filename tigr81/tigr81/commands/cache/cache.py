@@ -0,0 +1,68 @@
+"""Handle the tigr81 caches.
+
+- List the cached template mirrors
+- Prune mirrors that have not been fetched for a while
+- Clear every cache
+"""
+
+import shutil
+import time
+
+import typer
+from typing_extensions import Annotated
+
+import tigr81.commands.core.mirror as mirror
+import tigr81.utils as tigr81_utils
+from tigr81 import USER_CACHE_LOCATION
+
+app = typer.Typer()
+
+
+@app.callback()
+def callback():
+    """Handle tigr81 caches."""
+
+
+@app.command()
+def ls():
+    """List the cached template mirrors."""
+    mirrors = mirror.list_mirrors()
+    if not mirrors:
+        typer.echo("No mirrors cached.")
+        return
+
+    now = time.time()
+    for cached in mirrors:
+        age_minutes = int((now - cached.fetched_at) // 60)
+        typer.echo(
+            f"{cached.url}\t{tigr81_utils.pretty_size(cached.size)}\t"
+            f"fetched {age_minutes} min ago\t{cached.path}"
+        )
+
+
+@app.command()
+def prune(
+    older_than: Annotated[
+        float,
+        typer.Option(
+            "--older-than",
+            help="Remove mirrors not fetched in the last N days",
+        ),
+    ] = 30,
+):
+    """Remove the mirrors that have not been fetched recently."""
+    threshold = time.time() - older_than * 24 * 3600
+    pruned = [cached for cached in mirror.list_mirrors() if cached.fetched_at < threshold]
+    for cached in pruned:
+        typer.echo(f"Removing mirror of {cached.url}...")
+        mirror.remove_mirror(cached)
+    typer.echo(f"Pruned {len(pruned)} mirrors.")
+
+
+@app.command()
+def clear():
+    """Delete every tigr81 cache."""
+    for location in [mirror.MIRRORS_LOCATION, USER_CACHE_LOCATION]:
+        if location.exists():
+            shutil.rmtree(location)
+    typer.echo("Caches cleared.")
@@ -0,0 +1,365 @@
+"""Archive templates: snapshots of files shipped as tarballs or zip files.
+
+Remote archives are downloaded once under ``~/.tigr81rc/cache/archives`` and
+revalidated with conditional requests (``ETag`` / ``Last-Modified``), so an
+unchanged archive is not downloaded again. Archives are extracted as a
+stream, member by member, without loading them in memory.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import pathlib as pl
+import shutil
+import stat
+import sys
+import tarfile
+import tempfile
+import urllib.error
+import urllib.parse
+import urllib.request
+import zipfile
+from typing import IO, Iterator, Optional
+
+import typer
+
+import tigr81.utils as tigr81_utils
+from tigr81 import USER_CACHE_LOCATION
+
+ARCHIVES_LOCATION = USER_CACHE_LOCATION / "archives"
+ARCHIVE_FILE_NAME = "archive"
+META_FILE_NAME = "meta.json"
+ARCHIVE_SUFFIXES = (".tar.gz", ".tgz", ".tar.zst", ".tzst", ".tar.bz2", ".tar.xz", ".tar", ".zip")
+HTTP_TIMEOUT = 30
+"""Seconds to wait for the archive server before giving up."""
+CHUNK_SIZE = 1024 * 1024
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+ZIP_MAGICS = (b"PK\x03\x04", b"PK\x05\x06")
+
+
+def is_remote_archive(template: str) -> bool:
+    """Check whether an archive location is an HTTP(S) URL.
+
+    Args:
+        template (str): The archive location (URL or local path).
+
+    Returns:
+        bool: True for HTTP and HTTPS URLs, False for local paths and file:// URLs.
+    """
+    return urllib.parse.urlparse(str(template)).scheme in ("http", "https")
+
+
+def _local_path(template: str) -> pl.Path:
+    parsed = urllib.parse.urlparse(str(template))
+    if parsed.scheme == "file":
+        return pl.Path(urllib.request.url2pathname(parsed.path))
+    return pl.Path(template)
+
+
+def archive_name(template: str) -> str:
+    """Return the name of an archive without its extension, e.g. ``app`` for ``app.tar.gz``.
+
+    Args:
+        template (str): The archive location (URL or local path).
+
+    Returns:
+        str: The name of the folder archives are extracted into by default.
+    """
+    name = pl.PurePosixPath(urllib.parse.urlparse(str(template)).path).name
+    for suffix in ARCHIVE_SUFFIXES:
+        if name.endswith(suffix):
+            return name[: -len(suffix)]
+    return name
+
+
+def get_archive_cache_path(url: str) -> pl.Path:
+    """Return where the download of ``url`` is cached.
+
+    Args:
+        url (str): The archive URL.
+
+    Returns:
+        pl.Path: The cache folder of the archive, ``<ARCHIVES_LOCATION>/<hash>``.
+    """
+    return ARCHIVES_LOCATION / hashlib.sha256(url.encode()).hexdigest()[:16]
+
+
+def _urlopen(url: str, headers: Optional[dict] = None):
+    request = urllib.request.Request(url, headers={"User-Agent": "tigr81", **(headers or {})})  # noqa: S310
+    return urllib.request.urlopen(request, timeout=HTTP_TIMEOUT)  # noqa: S310
+
+
+def _read_meta(path: pl.Path) -> dict:
+    try:
+        return json.loads((path / META_FILE_NAME).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _download_cached(url: str) -> pl.Path:
+    """Download ``url`` into the cache unless the cached copy is still current."""
+    path = get_archive_cache_path(url)
+    archive = path / ARCHIVE_FILE_NAME
+    path.mkdir(parents=True, exist_ok=True)
+    with tigr81_utils.file_lock(archive):
+        meta = _read_meta(path) if archive.exists() else {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        try:
+            with _urlopen(url, headers) as response, tigr81_utils.atomic_write(archive, "wb") as f:
+                shutil.copyfileobj(response, f, CHUNK_SIZE)
+                meta = {
+                    "url": url,
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                }
+        except urllib.error.HTTPError as e:
+            if e.code != 304:
+                raise
+            return archive
+        with tigr81_utils.atomic_write(path / META_FILE_NAME) as f:
+            json.dump(meta, f)
+    return archive
+
+
+def resolve_archive_source(template: str) -> str:
+    """Return the location archive scaffolds should read ``template`` from.
+
+    Remote archives are served from an up to date local copy, downloaded only
+    when the server reports a change. Local archives, or any archive when caches
+    are disabled, are returned unchanged. If the archive cannot be downloaded a
+    previous copy is used, and without one the URL is returned.
+
+    Args:
+        template (str): The archive location (URL or local path).
+
+    Returns:
+        str: The location to read the archive from.
+    """
+    template = str(template)
+    if not tigr81_utils.is_cache_enabled() or not is_remote_archive(template):
+        return template
+
+    try:
+        return str(_download_cached(template))
+    except (OSError, urllib.error.URLError) as e:
+        archive = get_archive_cache_path(template) / ARCHIVE_FILE_NAME
+        if archive.exists():
+            typer.echo(f"Could not refresh {template}, using the cached copy.")
+            return str(archive)
+        typer.echo(f"Could not download {template}: {e}", err=True)
+        return template
+
+
+def _check_sha256(f: IO[bytes], sha256: str) -> None:
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+        digest.update(chunk)
+    f.seek(0)
+    if digest.hexdigest() != sha256.lower():
+        raise ValueError(f"Checksum mismatch: expected sha256 {sha256}, got {digest.hexdigest()}")
+
+
+@contextlib.contextmanager
+def open_archive(source: str, sha256: Optional[str] = None) -> Iterator[IO[bytes]]:
+    """Open an archive for reading, downloading it to a temporary file if remote.
+
+    Args:
+        source (str): The archive location, see resolve_archive_source.
+        sha256 (Optional[str]): The expected SHA-256 of the archive, in hex.
+
+    Yields:
+        IO[bytes]: The seekable archive file.
+
+    Raises:
+        ValueError: If the archive does not match ``sha256``.
+        OSError: If the archive cannot be read or downloaded.
+    """
+    if is_remote_archive(source):
+        with tempfile.TemporaryFile() as f:
+            with _urlopen(source) as response:
+                shutil.copyfileobj(response, f, CHUNK_SIZE)
+            f.seek(0)
+            if sha256:
+                _check_sha256(f, sha256)
+            yield f
+        return
+
+    with open(_local_path(source), "rb") as f:
+        if sha256:
+            _check_sha256(f, sha256)
+        yield f
+
+
+def _member_target(
+    name: str, output_dir: pl.Path, directory: Optional[pl.PurePosixPath]
+) -> Optional[pl.Path]:
+    """Where to write an archive member, None if it is not under ``directory``.
+
+    Raises:
+        ValueError: If the member path is absolute or contains "..".
+    """
+    path = pl.PurePosixPath(name)
+    if path.is_absolute() or ".." in path.parts:
+        raise ValueError(f"Unsafe path in archive: {name}")
+    if directory is not None:
+        if path.parts[: len(directory.parts)] != directory.parts:
+            return None
+        path = pl.PurePosixPath(*path.parts[len(directory.parts) :])
+    if not path.parts:
+        return None
+    return output_dir / path
+
+
+def _check_inside(path: pl.Path, name: str, root: str) -> None:
+    """Check that ``path`` stays under ``root`` once symbolic links are resolved."""
+    if os.path.commonpath([root, os.path.realpath(path)]) != root:
+        raise ValueError(f"Unsafe path in archive: {name}")
+
+
+def _make_dir(target: pl.Path, name: str, root: str) -> None:
+    """Create the folder ``target`` if it stays under ``root``."""
+    _check_inside(target, name, root)
+    target.mkdir(parents=True, exist_ok=True)
+
+
+def _prepare_target(target: pl.Path, name: str, root: str) -> None:
+    """Create the parents of ``target`` if writing it stays under ``root``."""
+    _make_dir(target.parent, name, root)
+    if target.is_symlink():
+        target.unlink()
+
+
+def _write_symlink(target: pl.Path, linkname: str) -> None:
+    target.unlink(missing_ok=True)
+    try:
+        os.symlink(linkname, target)
+    except OSError:
+        if sys.platform != "win32":
+            raise
+        # As git without core.symlinks, write the link target in a file
+        target.write_text(linkname)
+
+
+def _make_executable(target: pl.Path) -> None:
+    mode = target.stat().st_mode
+    os.chmod(target, mode | (mode & 0o444) >> 2)
+
+
+def extract_tar_stream(
+    tar: tarfile.TarFile, output_dir: pl.Path, directory: Optional[str] = None
+) -> None:
+    """Write the members of a streamed tar archive under ``output_dir``.
+
+    Files are written once, straight from the stream. Only directories, regular
+    files and symbolic links are extracted, and members that would be written
+    outside of ``output_dir`` are refused.
+
+    Args:
+        tar (tarfile.TarFile): The archive, possibly opened in stream mode ("r|").
+        output_dir (pl.Path): Where the members are written.
+        directory (Optional[str]): Only extract the members under this folder of
+                                   the archive, relative to it. Defaults to all.
+
+    Raises:
+        ValueError: If a member path is absolute, contains "..", or goes through a
+            symbolic link.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    root = os.path.realpath(output_dir)
+    prefix = pl.PurePosixPath(directory) if directory not in (None, ".") else None
+    for member in tar:
+        target = _member_target(member.name, output_dir, prefix)
+        if target is None:
+            continue
+        if member.isdir():
+            _make_dir(target, member.name, root)
+            continue
+        _prepare_target(target, member.name, root)
+        if member.issym():
+            _write_symlink(target, member.linkname)
+        elif member.isfile():
+            with tar.extractfile(member) as fsrc, open(target, "wb") as fdst:
+                shutil.copyfileobj(fsrc, fdst, CHUNK_SIZE)
+            if member.mode & 0o111:
+                _make_executable(target)
+
+
+def extract_zip(zip_file: zipfile.ZipFile, output_dir: pl.Path, directory: Optional[str] = None) -> None:
+    """Write the members of a zip archive under ``output_dir``, as extract_tar_stream.
+
+    Args:
+        zip_file (zipfile.ZipFile): The archive.
+        output_dir (pl.Path): Where the members are written.
+        directory (Optional[str]): Only extract the members under this folder of
+                                   the archive, relative to it. Defaults to all.
+
+    Raises:
+        ValueError: If a member path is absolute, contains "..", or goes through a
+            symbolic link.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    root = os.path.realpath(output_dir)
+    prefix = pl.PurePosixPath(directory) if directory not in (None, ".") else None
+    for info in zip_file.infolist():
+        target = _member_target(info.filename, output_dir, prefix)
+        if target is None:
+            continue
+        if info.is_dir():
+            _make_dir(target, info.filename, root)
+            continue
+        _prepare_target(target, info.filename, root)
+        # Unix permissions, set by most zip tools, are in the high bytes
+        mode = info.external_attr >> 16
+        if stat.S_ISLNK(mode):
+            _write_symlink(target, zip_file.read(info).decode())
+            continue
+        with zip_file.open(info) as fsrc, open(target, "wb") as fdst:
+            shutil.copyfileobj(fsrc, fdst, CHUNK_SIZE)
+        if mode & 0o111:
+            _make_executable(target)
+
+
+def extract_archive(f: IO[bytes], output_dir: pl.Path, directory: Optional[str] = None) -> None:
+    """Extract a tar (gzip, bzip2, xz or zstd compressed) or zip archive.
+
+    The format is detected from the content of the archive. Zstandard needs the
+    ``zstandard`` package, installed with the ``zstd`` extra of tigr81.
+
+    Args:
+        f (IO[bytes]): The seekable archive file, see open_archive.
+        output_dir (pl.Path): Where the members are written.
+        directory (Optional[str]): Only extract the members under this folder of
+                                   the archive, relative to it. Defaults to all.
+
+    Raises:
+        ValueError: If a member path is unsafe, or a zstd archive is given
+            without the zstandard package.
+        tarfile.TarError: If the archive is not a valid archive.
+    """
+    magic = f.read(4)
+    f.seek(0)
+    if magic in ZIP_MAGICS:
+        with zipfile.ZipFile(f) as zip_file:
+            extract_zip(zip_file, output_dir, directory)
+        return
+
+    if magic == ZSTD_MAGIC:
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError(
+                "Zstandard archives need the zstandard package: pip install 'tigr81[zstd]'"
+            ) from None
+        with zstandard.ZstdDecompressor().stream_reader(f) as reader:
+            with tarfile.open(fileobj=reader, mode="r|") as tar:
+                extract_tar_stream(tar, output_dir, directory)
+        return
+
+    with tarfile.open(fileobj=f, mode="r|*") as tar:
+        extract_tar_stream(tar, output_dir, directory)
@@ -1,10 +1,19 @@
 import pathlib as pl
+import re
 import shutil
 import subprocess
-from typing import Tuple
+import tarfile
+import tempfile
+import time
+import urllib.parse
+import urllib.request
+from typing import IO, List, NamedTuple, Optional, Tuple
 
 import typer
 
+import tigr81.utils as tigr81_utils
+from tigr81.commands.core import archive, refs
+
 
 def get_latest_tag(repo_url: str) -> str:
     """Fetches the latest tag from a remote Git repository.
@@ -15,39 +24,20 @@ def get_latest_tag(repo_url: str) -> str:
     Returns:
         str: The latest tag in semantic version order, or "0.0.0" if no tags are found.
 
-    This function uses `git ls-remote --tags` to list all tags in the specified remote
-    repository, then extracts and sorts them according to semantic versioning.
-    Annotated tags (those ending with '^{}') are ignored.
+    The tags are listed with `git ls-remote` through the refs cache (see
+    refs.ls_remote) and sorted according to semantic versioning, ``v`` and other
+    prefixes included. Pre-releases are only returned when there is no release.
     """
     try:
-        # Fetch tags from the remote repository
-        result = subprocess.run(  # noqa: S603
-            ["git", "ls-remote", "--tags", repo_url],  # noqa: S607
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            check=True,
-        )
-
-        # Extract and filter tag names, ignoring annotated tags (those with '^{}' suffix)
-        tags = [
-            line.split("refs/tags/")[-1]
-            for line in result.stdout.splitlines()
-            if "refs/tags/" in line and not line.endswith("^{}")
-        ]
-
-        # Sort tags by semantic version order
-        tags.sort(key=lambda s: list(map(int, s.split("."))))
-
-        # Return the latest tag or "0.0.0" if no tags are found
-        latest_tag = tags[-1] if tags else "0.0.0"
-        typer.echo(f"Latest Tag: {latest_tag}")
-        return latest_tag
-
+        tag = refs.latest_tag(repo_url)
     except subprocess.CalledProcessError as e:
         typer.echo(f"Error fetching tags: {e.stderr}", err=True)
         return "0.0.0"
 
+    latest_tag = tag or "0.0.0"
+    typer.echo(f"Latest Tag: {latest_tag}")
+    return latest_tag
+
 
 def get_author_info() -> Tuple[str, str]:
     """Retrieves the author's name and email from the Git configuration.
@@ -66,37 +56,284 @@ def get_author_info() -> Tuple[str, str]:
     return author_name, author_email
 
 
+ABBREVIATED_SHA_REGEX = re.compile(r"^[0-9a-f]{4,39}$")
+"""Checkouts which may be abbreviated commit SHAs."""
+
+
+class CloneStats(NamedTuple):
+    """Statistics about a repository directory clone.
+
+    Attributes:
+        bytes_transferred (int): Size of the git objects downloaded for the checkout.
+        elapsed (float): Wall clock duration of the clone, in seconds.
+    """
+
+    bytes_transferred: int
+    elapsed: float
+
+
+def _tracked_files_outside(output_dir: pl.Path, directory: pl.Path) -> List[pl.Path]:
+    """List the checked out files that are not inside ``directory``.
+
+    Cone mode sparse checkouts always include the files at the root of the repository
+    and of every parent of ``directory``; only those are returned.
+    """
+    result = subprocess.run(  # noqa: S603
+        ["git", "-C", str(output_dir), "ls-files", "-z"],  # noqa: S607
+        stdout=subprocess.PIPE,
+        check=True,
+        text=True,
+    )
+    prefix = f"{pl.PurePosixPath(directory)}/"
+    return [
+        output_dir / name
+        for name in (result.stdout or "").split("\0")
+        if name and not name.startswith(prefix)
+    ]
+
+
+def _resolve_abbreviated_commit(repo_url: str, source: str, checkout: str) -> str:
+    """Expand ``checkout`` to a full commit SHA if it is an abbreviated one.
+
+    ``git fetch`` only accepts full SHAs. Abbreviated ones are resolved in ``source``
+    when it is a local repository, such as a ``file://`` mirror; any other checkout is
+    returned as is, the refs of remote repositories being fetched by name.
+
+    Raises:
+        ValueError: If ``checkout`` is an abbreviated SHA and no ref of the remote
+            ``source`` has that name.
+    """
+    if not ABBREVIATED_SHA_REGEX.match(checkout):
+        return checkout
+    local_path = _local_repo_path(source)
+    if local_path is not None:
+        result = subprocess.run(  # noqa: S603
+            ["git", "-C", local_path, "rev-parse", "--verify", "--quiet", f"{checkout}^{{commit}}"],  # noqa: S607
+            capture_output=True,
+            text=True,
+        )
+        return result.stdout.strip() if result.returncode == 0 else checkout
+    if refs.find_ref(refs.ls_remote(source), checkout) is None:
+        raise ValueError(
+            f"Cannot fetch the abbreviated commit '{checkout}' from {repo_url}, "
+            "use its full 40 character SHA"
+        )
+    return checkout
+
+
+def _move_into(src: pl.Path, dst: pl.Path) -> None:
+    """Move the content of ``src`` into ``dst``, merging the directories present in both.
+
+    Files of ``dst`` are replaced by those of ``src``; ``.git`` folders of ``src`` are skipped.
+    """
+    dst.mkdir(parents=True, exist_ok=True)
+    for entry in src.iterdir():
+        target = dst / entry.name
+        if entry.name == ".git":
+            continue
+        if entry.is_dir() and target.is_dir():
+            _move_into(entry, target)
+        else:
+            shutil.move(str(entry), str(target))
+
+
 def clone_repo_directory(
-    repo_url: str, checkout: str, directory: pl.Path, output_dir: pl.Path
-) -> None:
-    """Clones a specific directory from the repository using sparse checkout. If the directory is ".", it clones the entire repository."""
-    output_dir_str = str(output_dir)
+    repo_url: str,
+    checkout: str,
+    directory: pl.Path,
+    output_dir: pl.Path,
+    source: Optional[str] = None,
+) -> CloneStats:
+    """Clones a specific directory from the repository using sparse checkout. If the directory is ".", it clones the entire repository.
+
+    Only ``checkout`` is fetched, at depth 1 and without blobs (``--filter=blob:none``): the
+    blobs needed by the cone mode sparse checkout of ``directory`` are downloaded on checkout.
+    The repository is cloned from ``source`` when given (e.g. a local mirror of ``repo_url``),
+    while ``repo_url`` still names the output directory when ``output_dir`` is ".".
+    The clone is made in a temporary directory and its files moved into ``output_dir``,
+    so that a repository already there, with its ``.git`` folder, is left untouched.
+
+    Returns:
+        CloneStats: The bytes transferred and the elapsed time, which are also printed.
+
+    Raises:
+        ValueError: If ``checkout`` is an abbreviated SHA that cannot be fetched.
+        subprocess.CalledProcessError: If git fails, e.g. because ``checkout`` does not exist.
+    """
+    start = time.perf_counter()
     checkout = checkout or "main"
-    if output_dir_str == ".":
+    if str(output_dir) == ".":
         output_dir = pl.Path(pl.Path(repo_url).name.replace(".git", ""))
-        output_dir_str = str(output_dir)
+    source = source or repo_url
+    checkout = _resolve_abbreviated_commit(repo_url, source, checkout)
 
-    # Clone the repository without checking out files
-    subprocess.run(  # noqa: S603
-        ["git", "clone", "--no-checkout", repo_url, output_dir_str], check=True  # noqa: S607
-    )
+    with tempfile.TemporaryDirectory(prefix="tigr81-") as tmp:
+        work_dir = pl.Path(tmp) / "clone"
+        work_dir_str = str(work_dir)
+
+        # Create an empty repository pointing to the remote
+        subprocess.run(["git", "init", "--quiet", work_dir_str], check=True)  # noqa: S603, S607
+        subprocess.run(  # noqa: S603
+            ["git", "-C", work_dir_str, "remote", "add", "origin", source],  # noqa: S607
+            check=True,
+        )
 
-    # If directory is not ".", use sparse checkout
-    if str(directory) != ".":
-        sparse_checkout_path = output_dir / ".git" / "info" / "sparse-checkout"
-        sparse_checkout_path.write_text(f"{directory}\n")
+        # If directory is not ".", use a cone mode sparse checkout
+        if str(directory) != ".":
+            subprocess.run(  # noqa: S603
+                ["git", "-C", work_dir_str, "sparse-checkout", "set", "--cone", str(directory)],  # noqa: S607
+                check=True,
+            )
 
+        # Fetch only the requested ref, without history nor blobs, then check it out
         subprocess.run(  # noqa: S603
-            ["git", "-C", output_dir_str, "config", "core.sparseCheckout", "true"],  # noqa: S607
+            [  # noqa: S607
+                "git",
+                "-C",
+                work_dir_str,
+                "fetch",
+                "--quiet",
+                "--depth",
+                "1",
+                "--filter=blob:none",
+                "origin",
+                checkout,
+            ],
             check=True,
         )
+        subprocess.run(  # noqa: S603
+            ["git", "-C", work_dir_str, "checkout", "--quiet", "FETCH_HEAD"],  # noqa: S607
+            check=True,
+        )
+
+        if str(directory) != ".":
+            for path in _tracked_files_outside(work_dir, directory):
+                path.unlink(missing_ok=True)
 
-    # Checkout the specified branch
-    subprocess.run(  # noqa: S603
-        ["git", "-C", output_dir_str, "checkout", checkout], check=True  # noqa: S607
+        bytes_transferred = sum(
+            f.stat().st_size for f in (work_dir / ".git" / "objects").rglob("*") if f.is_file()
+        )
+        _move_into(work_dir, output_dir)
+
+    stats = CloneStats(
+        bytes_transferred=bytes_transferred, elapsed=time.perf_counter() - start
+    )
+    typer.echo(
+        f"Fetched {tigr81_utils.pretty_size(stats.bytes_transferred)} "
+        f"in {stats.elapsed:.2f}s"
     )
+    return stats
+
+
+class _CountingReader:
+    """Binary stream wrapper counting the bytes read from the stream."""
+
+    def __init__(self, stream: IO[bytes]):
+        self.stream = stream
+        self.count = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.stream.read(size)
+        self.count += len(data)
+        return data
+
+
+def _local_repo_path(source: str) -> Optional[str]:
+    """The path of ``source`` if it is a local repository, e.g. a ``file://`` mirror."""
+    parsed = urllib.parse.urlparse(source)
+    local_path = urllib.request.url2pathname(parsed.path) if parsed.scheme == "file" else source
+    return local_path if pl.Path(local_path).is_dir() else None
 
-    git_dir = output_dir / ".git"
-    if not (git_dir.exists() or git_dir.is_dir()):
-        raise ValueError(f"Git directory {git_dir} does not exist or is not a directory")
-    shutil.rmtree(git_dir)
+
+def _archive_command(source: str, checkout: str, directory: pl.Path) -> List[str]:
+    """The git archive command writing ``directory`` at ``checkout`` of ``source`` as a tar.
+
+    Local repositories, such as the ``file://`` mirrors, are archived directly, which
+    allows any commit; others are asked to through ``git upload-archive``, which
+    most hosting services (e.g. GitHub) do not support.
+    """
+    paths = [] if str(directory) == "." else ["--", pl.PurePath(directory).as_posix()]
+    local_path = _local_repo_path(source)
+    if local_path is not None:
+        return ["git", "-C", local_path, "archive", "--format=tar", checkout, *paths]
+    return ["git", "archive", "--format=tar", f"--remote={source}", checkout, *paths]
+
+
+def export_repo_directory(
+    repo_url: str,
+    checkout: str,
+    directory: pl.Path,
+    output_dir: pl.Path,
+    source: Optional[str] = None,
+) -> CloneStats:
+    """Export a directory of a repository into ``output_dir``, without a working tree.
+
+    The output of ``git archive`` is streamed through tarfile straight into
+    ``output_dir``, so each file is written once and no ``.git`` folder is ever
+    created there. The files keep their path in the repository, as with
+    clone_repo_directory. When a remote repository cannot be archived, e.g. one
+    not supporting ``git upload-archive``, it falls back to clone_repo_directory.
+
+    Args:
+        repo_url (str): The repository URL, naming the output directory when
+                        ``output_dir`` is ".".
+        checkout (str): The branch, tag or commit to export. Defaults to ``main``.
+        directory (pl.Path): The directory of the repository to export, "." for all.
+        output_dir (pl.Path): Where the files are written.
+        source (Optional[str]): Where to read the repository from, e.g. a local
+                                mirror of ``repo_url``. Defaults to ``repo_url``.
+
+    Returns:
+        CloneStats: The size of the archive read and the elapsed time, which are also printed.
+
+    Raises:
+        ValueError: If the archive holds unsafe paths.
+        tarfile.TarError: If the archive is interrupted.
+        subprocess.CalledProcessError: If git fails after writing part of the
+            archive, or fails to archive a local repository, e.g. because the
+            checkout or directory does not exist. Its stderr is also printed.
+    """
+    start = time.perf_counter()
+    checkout = checkout or "main"
+    if str(output_dir) == ".":
+        output_dir = pl.Path(pl.Path(repo_url).name.replace(".git", ""))
+
+    source = source or repo_url
+    command = _archive_command(source, checkout, directory)
+    # A file rather than a pipe, so that git never blocks on a full stderr pipe
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr)  # noqa: S603
+        reader = _CountingReader(process.stdout)
+        try:
+            try:
+                tar = tarfile.open(fileobj=reader, mode="r|")
+            except tarfile.ReadError:
+                tar = None
+            if tar is not None:
+                output_dir.mkdir(parents=True, exist_ok=True)
+                with tar:
+                    archive.extract_tar_stream(tar, output_dir)
+        finally:
+            process.stdout.close()
+            process.wait()
+        stderr.seek(0)
+        error = stderr.read().decode(errors="replace").strip()
+
+    if process.returncode != 0:
+        if tar is not None or _local_repo_path(source) is not None:
+            typer.echo(f"Could not export {directory} at {checkout} of {repo_url}: {error}", err=True)
+            raise subprocess.CalledProcessError(process.returncode, command, stderr=error)
+        return clone_repo_directory(
+            repo_url=repo_url,
+            checkout=checkout,
+            directory=directory,
+            output_dir=output_dir,
+            source=source,
+        )
+
+    stats = CloneStats(bytes_transferred=reader.count, elapsed=time.perf_counter() - start)
+    typer.echo(
+        f"Exported {tigr81_utils.pretty_size(stats.bytes_transferred)} "
+        f"in {stats.elapsed:.2f}s"
+    )
+    return stats
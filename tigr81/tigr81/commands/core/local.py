@@ -0,0 +1,212 @@
+"""Local templates: directory trees copied as they are.
+
+A local template is a folder, e.g. on a shared disk, whose files are copied
+into the output folder without rendering. Folders are scanned concurrently
+with ``os.scandir`` and files are copied with tigr81_utils.clone_file, as
+copy-on-write clones where the filesystem supports it, or hard linked on
+request. Paths matching the patterns of a ``.tigr81ignore`` file at the root
+of the template are skipped.
+"""
+
+import fnmatch
+import os
+import pathlib as pl
+import re
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import List, NamedTuple, Optional, Set, Tuple
+
+import tigr81.utils as tigr81_utils
+
+IGNORE_FILE_NAME = ".tigr81ignore"
+DEFAULT_IGNORE_PATTERNS = [".git/", IGNORE_FILE_NAME]
+"""Patterns always ignored, so that a template kept in git can be copied as is."""
+FILES_PER_TASK = 256
+"""Number of files copied by each task of the thread pool."""
+
+
+class IgnoreRule(NamedTuple):
+    """A pattern of an ignore file.
+
+    Attributes:
+        regex (re.Pattern): The compiled pattern.
+        negated (bool): Whether matching paths are included again (``!pattern``).
+        dir_only (bool): Whether the pattern only matches folders (``pattern/``).
+        anchored (bool): Whether the pattern matches the path from the template
+                         root rather than the name of a file at any depth.
+    """
+
+    regex: "re.Pattern[str]"
+    negated: bool
+    dir_only: bool
+    anchored: bool
+
+
+class IgnoreRules:
+    """The paths to skip when copying a local template, in the gitignore syntax.
+
+    Supported: blank lines and ``#`` comments, ``!`` negations (the last
+    matching pattern wins), a trailing ``/`` for folders only, and patterns
+    containing a ``/`` matching the path from the template root, with ``*``
+    ``?`` and ``[...]`` wildcards. Other patterns match file names at any depth.
+    As in git, files of an ignored folder cannot be included again.
+    """
+
+    def __init__(self, patterns: List[str]):
+        """Compile the patterns.
+
+        Args:
+            patterns: The lines of an ignore file.
+        """
+        self.rules: List[IgnoreRule] = []
+        for line in patterns:
+            pattern = line.strip()
+            if not pattern or pattern.startswith("#"):
+                continue
+            negated = pattern.startswith("!")
+            pattern = pattern[1:] if negated else pattern
+            dir_only = pattern.endswith("/")
+            pattern = pattern.rstrip("/")
+            anchored = "/" in pattern
+            pattern = pattern.lstrip("/")
+            if pattern:
+                regex = re.compile(fnmatch.translate(pattern))
+                self.rules.append(IgnoreRule(regex, negated, dir_only, anchored))
+
+    @classmethod
+    def from_template(cls, template_dir: pl.Path) -> "IgnoreRules":
+        """Read the ignore file of a template, on top of DEFAULT_IGNORE_PATTERNS.
+
+        Args:
+            template_dir: The template folder.
+
+        Returns:
+            IgnoreRules: The rules of ``<template_dir>/.tigr81ignore``, if any.
+        """
+        patterns = [*DEFAULT_IGNORE_PATTERNS]
+        ignore_file = template_dir / IGNORE_FILE_NAME
+        if ignore_file.is_file():
+            patterns += ignore_file.read_text().splitlines()
+        return cls(patterns)
+
+    def ignored(self, path: str, is_dir: bool) -> bool:
+        """Whether a path of the template is ignored.
+
+        Args:
+            path: The path relative to the template root, with ``/`` separators.
+            is_dir: Whether the path is a folder.
+
+        Returns:
+            bool: True if the last pattern matching the path is not negated.
+        """
+        name = path.rsplit("/", 1)[-1]
+        ignored = False
+        for rule in self.rules:
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.regex.match(path if rule.anchored else name):
+                ignored = not rule.negated
+        return ignored
+
+
+def _link_file(src: str, dst: str) -> None:
+    """Hard link ``src`` to ``dst``, copying it when linking is not possible."""
+    try:
+        os.unlink(dst)
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(src, dst)
+    except OSError:
+        tigr81_utils.clone_file(src, dst)
+
+
+def _scan_dir(
+    src_dir: str, dst_dir: str, rel_dir: str, ignore: IgnoreRules
+) -> Tuple[List[Tuple[str, str, str]], List[Tuple[str, str]]]:
+    """Create the sub folders and symbolic links of a folder, listing what is left to copy.
+
+    Returns:
+        The sub folders to scan, as (source, destination, relative path), and
+        the files to copy, as (source, destination).
+    """
+    subdirs, files = [], []
+    with os.scandir(src_dir) as entries:
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            dst_path = os.path.join(dst_dir, entry.name)
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if ignore.ignored(rel_path, is_dir):
+                continue
+            if entry.is_symlink():
+                if os.path.lexists(dst_path):
+                    os.unlink(dst_path)
+                os.symlink(os.readlink(entry.path), dst_path)
+            elif is_dir:
+                os.makedirs(dst_path, exist_ok=True)
+                subdirs.append((entry.path, dst_path, rel_path))
+            else:
+                files.append((entry.path, dst_path))
+    return subdirs, files
+
+
+def _copy_files(files: List[Tuple[str, str]], hardlink: bool) -> int:
+    copy = _link_file if hardlink else tigr81_utils.clone_file
+    for src, dst in files:
+        copy(src, dst)
+    return len(files)
+
+
+def copy_local_template(
+    template_dir: pl.Path,
+    output_dir: pl.Path,
+    ignore: Optional[IgnoreRules] = None,
+    hardlink: bool = False,
+    jobs: Optional[int] = None,
+) -> int:
+    """Copy a template folder into ``output_dir``, merging it with existing folders.
+
+    Folders are scanned and files copied concurrently by a thread pool, since
+    scandir and clone_file release the GIL. Existing files are replaced.
+
+    Args:
+        template_dir: The template folder.
+        output_dir: The folder to copy it into, created if needed.
+        ignore: The paths to skip. Defaults to the ignore file of the template.
+        hardlink: Whether to hard link the files instead of copying them, when
+            both folders are on the same filesystem. The scaffolded files then
+            share their content with the template: editing one in place edits
+            the other.
+        jobs: Maximum number of folders scanned or file batches copied
+            concurrently. Defaults to the ThreadPoolExecutor default.
+
+    Returns:
+        int: The number of files copied.
+
+    Raises:
+        ValueError: If ``output_dir`` is inside ``template_dir``.
+    """
+    if template_dir.resolve() in [output_dir.resolve(), *output_dir.resolve().parents]:
+        raise ValueError(f"Cannot copy {template_dir} into itself ({output_dir}).")
+    if ignore is None:
+        ignore = IgnoreRules.from_template(template_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    copied = 0
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        scans: Set[Future] = {
+            executor.submit(_scan_dir, str(template_dir), str(output_dir), "", ignore)
+        }
+        copies: List[Future] = []
+        while scans:
+            done, scans = wait(scans, return_when=FIRST_COMPLETED)
+            for scan in done:
+                subdirs, files = scan.result()
+                for subdir in subdirs:
+                    scans.add(executor.submit(_scan_dir, *subdir, ignore))
+                for i in range(0, len(files), FILES_PER_TASK):
+                    copies.append(
+                        executor.submit(_copy_files, files[i : i + FILES_PER_TASK], hardlink)
+                    )
+        for copy in copies:
+            copied += copy.result()
+    return copied
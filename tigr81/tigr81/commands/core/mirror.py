@@ -0,0 +1,256 @@
+"""Local bare mirrors of remote template repositories.
+
+Remote git templates are cloned once with ``git clone --mirror`` under
+``~/.tigr81rc/mirrors`` and refreshed with an incremental ``git fetch`` only
+when older than a TTL. Cookiecutter, copier and raw git scaffolds then clone
+from the local mirror instead of the network.
+"""
+
+import hashlib
+import os
+import pathlib as pl
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+from typing import List, NamedTuple, Optional
+
+import typer
+
+import tigr81.utils as tigr81_utils
+from tigr81 import USER_CONFIG_LOCATION
+
+MIRRORS_LOCATION = USER_CONFIG_LOCATION / "mirrors"
+MIRROR_TTL_ENV_VAR = "TIGR81_MIRROR_TTL"
+DEFAULT_MIRROR_TTL = 3600
+"""Default number of seconds before a mirror is fetched again."""
+MIRROR_STAMP_FILE_NAME = "tigr81-mirror"
+"""File inside a mirror holding its source URL; its mtime is the last fetch time."""
+
+REMOTE_REPO_REGEX = re.compile(r"^((git\+)?(git|ssh|file|https?)://|\w+@[\w.]+:)")
+
+
+class Mirror(NamedTuple):
+    """A local bare mirror of a remote repository.
+
+    Attributes:
+        path (pl.Path): Location of the bare mirror.
+        url (str): The remote repository URL it mirrors.
+        fetched_at (float): Timestamp of the last clone or fetch.
+        size (int): Disk usage of the mirror, in bytes.
+    """
+
+    path: pl.Path
+    url: str
+    fetched_at: float
+    size: int
+
+
+def is_remote_repo(template: str) -> bool:
+    """Check whether a template location is a git URL that can be mirrored.
+
+    Args:
+        template (str): The template location (URL or local path).
+
+    Returns:
+        bool: True for git URLs (including ``file://``), False for local paths.
+    """
+    return bool(REMOTE_REPO_REGEX.match(str(template)))
+
+
+def get_mirror_ttl() -> float:
+    """Return the mirror TTL in seconds, read from ``TIGR81_MIRROR_TTL``."""
+    return float(os.environ.get(MIRROR_TTL_ENV_VAR, DEFAULT_MIRROR_TTL))
+
+
+def get_mirror_path(repo_url: str, mirrors_location: Optional[pl.Path] = None) -> pl.Path:
+    """Return where the mirror of ``repo_url`` is stored.
+
+    Args:
+        repo_url (str): The remote repository URL.
+        mirrors_location (Optional[pl.Path]): The mirrors folder. Defaults to MIRRORS_LOCATION.
+
+    Returns:
+        pl.Path: The mirror location, ``<mirrors_location>/<hash>.git``.
+    """
+    digest = hashlib.sha256(repo_url.encode()).hexdigest()[:16]
+    return (mirrors_location or MIRRORS_LOCATION) / f"{digest}.git"
+
+
+def _git(args: List[str], cwd: Optional[pl.Path] = None) -> None:
+    subprocess.run(  # noqa: S603
+        ["git", *args],  # noqa: S607
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+
+
+def sync_mirror(
+    repo_url: str,
+    ttl: Optional[float] = None,
+    mirrors_location: Optional[pl.Path] = None,
+) -> pl.Path:
+    """Create the mirror of ``repo_url`` or fetch it if older than ``ttl``.
+
+    Args:
+        repo_url (str): The remote repository URL.
+        ttl (Optional[float]): Seconds after which the mirror is fetched again.
+                               Defaults to get_mirror_ttl().
+        mirrors_location (Optional[pl.Path]): The mirrors folder. Defaults to MIRRORS_LOCATION.
+
+    Returns:
+        pl.Path: The location of the up to date mirror.
+
+    The clone or fetch holds a lock on the mirror, so that concurrent tigr81
+    processes sync it once and never replace it while another one reads it.
+
+    Raises:
+        subprocess.CalledProcessError: If cloning or fetching fails.
+        OSError: If the mirror cannot be written.
+    """
+    ttl = get_mirror_ttl() if ttl is None else ttl
+    path = get_mirror_path(repo_url, mirrors_location)
+    if _is_fresh(path, ttl):
+        return path
+
+    # Another process may be cloning or fetching the same mirror: wait for it,
+    # then only sync if the mirror is still missing or stale
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tigr81_utils.file_lock(path):
+        stamp = path / MIRROR_STAMP_FILE_NAME
+        if not stamp.exists():
+            _clone_mirror(repo_url, path)
+        elif not _is_fresh(path, ttl):
+            _git(["--git-dir", str(path), "fetch", "--prune", "--quiet"])
+            stamp.touch()
+    return path
+
+
+def _is_fresh(path: pl.Path, ttl: float) -> bool:
+    try:
+        return time.time() - (path / MIRROR_STAMP_FILE_NAME).stat().st_mtime <= ttl
+    except OSError:
+        return False
+
+
+def _clone_mirror(repo_url: str, path: pl.Path) -> None:
+    """Clone ``repo_url`` into a staging folder, then move it to ``path``."""
+    tmp_path = pl.Path(tempfile.mkdtemp(dir=path.parent, suffix=".tmp"))
+    try:
+        _git(["clone", "--mirror", "--quiet", repo_url, str(tmp_path)])
+        # Serve shallow, blob filtered fetches of any commit to local clones
+        for key in ["uploadpack.allowFilter", "uploadpack.allowAnySHA1InWant"]:
+            _git(["--git-dir", str(tmp_path), "config", key, "true"])
+        (tmp_path / MIRROR_STAMP_FILE_NAME).write_text(repo_url)
+        # Leftovers of an interrupted clone, without a stamp
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def _error_message(error: Exception) -> str:
+    return error.stderr if isinstance(error, subprocess.CalledProcessError) else str(error)
+
+
+def resolve_template_source(template: str) -> str:
+    """Return the location scaffolding backends should read ``template`` from.
+
+    Remote git templates are served from an up to date local mirror, given as a
+    ``file://`` URL ending in ``.git`` so that cookiecutter, copier and git all
+    treat it as a repository. Local templates, or any template when caches are
+    disabled, are returned unchanged. If the mirror cannot be refreshed a
+    previous copy is used, and without one the remote is used directly.
+
+    Args:
+        template (str): The template location (URL or local path).
+
+    Returns:
+        str: The location to scaffold the template from.
+    """
+    template = str(template)
+    if not tigr81_utils.is_cache_enabled() or not is_remote_repo(template):
+        return template
+
+    try:
+        return sync_mirror(template).as_uri()
+    except (OSError, subprocess.CalledProcessError) as e:
+        path = get_mirror_path(template)
+        if (path / MIRROR_STAMP_FILE_NAME).exists():
+            typer.echo(f"Could not refresh the mirror of {template}, using the cached copy.")
+            return path.as_uri()
+        typer.echo(f"Could not mirror {template}: {_error_message(e)}", err=True)
+        return template
+
+
+def resolve_commit_source(template: str, commit: str) -> str:
+    """Return where to read a commit of ``template`` from, fetching only if needed.
+
+    Unlike resolve_template_source, the mirror is not fetched when it is older
+    than the TTL but already has ``commit``: a pinned commit never changes, so
+    scaffolding it needs no network round trip.
+
+    Args:
+        template (str): The template location (URL or local path).
+        commit (str): The commit SHA to scaffold.
+
+    Returns:
+        str: The location to scaffold the template from.
+    """
+    template = str(template)
+    if not tigr81_utils.is_cache_enabled() or not is_remote_repo(template):
+        return template
+
+    path = get_mirror_path(template)
+    if (path / MIRROR_STAMP_FILE_NAME).exists():
+        try:
+            _git(["--git-dir", str(path), "cat-file", "-e", f"{commit}^{{commit}}"])
+            return path.as_uri()
+        except subprocess.CalledProcessError:
+            pass
+
+    try:
+        return sync_mirror(template, ttl=0).as_uri()
+    except (OSError, subprocess.CalledProcessError) as e:
+        typer.echo(f"Could not mirror {template}: {_error_message(e)}", err=True)
+        return template
+
+
+def list_mirrors(mirrors_location: Optional[pl.Path] = None) -> List[Mirror]:
+    """List the mirrors found in the mirrors folder.
+
+    Args:
+        mirrors_location (Optional[pl.Path]): The mirrors folder. Defaults to MIRRORS_LOCATION.
+
+    Returns:
+        List[Mirror]: The mirrors, most recently fetched first.
+    """
+    mirrors_location = mirrors_location or MIRRORS_LOCATION
+    if not mirrors_location.exists():
+        return []
+
+    mirrors = []
+    for path in mirrors_location.glob("*.git"):
+        stamp = path / MIRROR_STAMP_FILE_NAME
+        if not stamp.exists():
+            continue
+        size = sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+        mirrors.append(
+            Mirror(
+                path=path,
+                url=stamp.read_text().strip(),
+                fetched_at=stamp.stat().st_mtime,
+                size=size,
+            )
+        )
+    return sorted(mirrors, key=lambda mirror: mirror.fetched_at, reverse=True)
+
+
+def remove_mirror(mirror: Mirror) -> None:
+    """Delete a mirror from disk, once no process is syncing it."""
+    with tigr81_utils.file_lock(mirror.path):
+        shutil.rmtree(mirror.path)
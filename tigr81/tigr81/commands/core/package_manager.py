@@ -0,0 +1,200 @@
+"""Package managers installing and editing the dependencies of monorepo components.
+
+Every backend implements the PackageManager interface and runs its executable
+as a subprocess whose output is streamed line by line. Backends are selected by
+name with get_package_manager.
+"""
+
+import abc
+import functools
+import json
+import os
+import pathlib as pl
+import shutil
+import subprocess as sp
+from typing import List, NamedTuple, Optional
+
+import typer
+
+import tigr81.utils as tigr81_utils
+from tigr81 import USER_CACHE_LOCATION
+
+PACKAGE_MANAGER_PROBES_LOCATION = USER_CACHE_LOCATION / "package_managers.json"
+
+
+class PackageManagerEnum(tigr81_utils.StrEnum):
+    """Enumeration of the supported package managers."""
+
+    POETRY = "poetry"
+    """Poetry, see https://python-poetry.org."""
+    UV = "uv"
+    """uv, see https://docs.astral.sh/uv."""
+
+
+class ExecutableProbe(NamedTuple):
+    """An executable found on this machine.
+
+    Attributes:
+        executable (str): Path to the executable.
+        version (str): Output of ``<executable> --version``.
+    """
+
+    executable: str
+    version: str
+
+
+def _read_probes() -> dict:
+    try:
+        return json.loads(PACKAGE_MANAGER_PROBES_LOCATION.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_probe(name: str, executable: str, mtime_ns: int, version: str) -> None:
+    try:
+        PACKAGE_MANAGER_PROBES_LOCATION.parent.mkdir(parents=True, exist_ok=True)
+        with tigr81_utils.file_lock(PACKAGE_MANAGER_PROBES_LOCATION):
+            probes = _read_probes()
+            probes[name] = {"executable": executable, "mtime_ns": mtime_ns, "version": version}
+            with tigr81_utils.atomic_write(PACKAGE_MANAGER_PROBES_LOCATION) as f:
+                json.dump(probes, f)
+    except OSError:
+        pass
+
+
+@functools.lru_cache(maxsize=None)
+def probe_executable(name: str) -> Optional[ExecutableProbe]:
+    """Find an executable on PATH and its version, once per process.
+
+    The version is also cached on disk, keyed by the executable path and
+    modification time, so that ``<name> --version`` only runs again when the
+    executable is moved or upgraded.
+
+    Args:
+        name (str): The name of the executable, e.g. "poetry".
+
+    Returns:
+        Optional[ExecutableProbe]: The executable and its version, or None if
+        it is not installed.
+
+    Raises:
+        subprocess.CalledProcessError: If ``<name> --version`` fails.
+    """
+    executable = shutil.which(name)
+    if not executable:
+        return None
+
+    use_cache = tigr81_utils.is_cache_enabled()
+    mtime_ns = os.stat(executable).st_mtime_ns if use_cache else 0
+    cached = _read_probes().get(name, {}) if use_cache else {}
+    if cached.get("executable") == executable and cached.get("mtime_ns") == mtime_ns:
+        return ExecutableProbe(executable=executable, version=cached["version"])
+
+    result: sp.CompletedProcess = sp.run(  # noqa: S603
+        [executable, "--version"],
+        stdout=sp.PIPE,
+        stderr=sp.PIPE,
+        check=True,
+        text=True,
+    )
+    version = result.stdout.strip()
+    if use_cache:
+        _write_probe(name, executable, mtime_ns, version)
+    return ExecutableProbe(executable=executable, version=version)
+
+
+class PackageManager(abc.ABC):
+    """A package manager backend, driving its executable in component folders.
+
+    Subclasses set ``name`` to the executable name and implement the commands
+    on top of ``_run``.
+    """
+
+    name: str
+
+    def __init__(self):
+        """Initializes the package manager by checking for its executable.
+
+        If the executable is installed, it captures its version information.
+        If it is not found, it will print a message and exit the program.
+        The lookup runs once per process, see probe_executable.
+        """
+        probe = probe_executable(self.name)
+
+        if not probe:
+            typer.echo(f"{self.name} is not installed or not found on this machine.")
+            raise typer.Exit()
+
+        self.executable = probe.executable
+        typer.echo(f"{self.name} executable: {self.executable}")
+        typer.echo(f"{self.name} version: {probe.version}")
+
+    def _run(self, args: List[str], cwd: pl.Path) -> None:
+        """Run the executable, echoing its output line by line as it is produced.
+
+        Every line is prefixed with the name of ``cwd`` so that the output of
+        commands running concurrently in different components stays readable.
+
+        Raises:
+            typer.Exit: If the command cannot be started or fails.
+        """
+        command = " ".join([self.name, *args])
+        prefix = pl.Path(cwd).resolve().name
+        try:
+            with sp.Popen(  # noqa: S603
+                [self.executable, *args],
+                stdout=sp.PIPE,
+                stderr=sp.STDOUT,
+                cwd=cwd,
+                text=True,
+                bufsize=1,
+            ) as process:
+                for line in process.stdout:
+                    typer.echo(f"[{prefix}] {line.rstrip()}")
+        except OSError:
+            typer.echo(f"An error occurred while running '{command}'.", color="red")
+            raise typer.Exit() from None
+
+        if process.returncode != 0:
+            typer.echo(f"An error occurred while running '{command}'.", color="red")
+            raise typer.Exit()
+
+    @abc.abstractmethod
+    def install(self, cwd: pl.Path) -> None:
+        """Install the dependencies of the project in ``cwd``."""
+
+    @abc.abstractmethod
+    def remove(self, cwd: pl.Path, dependency: str) -> None:
+        """Remove ``dependency`` from the project in ``cwd``."""
+
+    @abc.abstractmethod
+    def add_path_dependency(self, cwd: pl.Path, path: pl.Path) -> None:
+        """Add the project in ``path`` as an editable dependency of the project in ``cwd``."""
+
+    @abc.abstractmethod
+    def lock(self, cwd: pl.Path) -> None:
+        """Update the lock file of the project in ``cwd``."""
+
+
+def get_package_manager(name: str = PackageManagerEnum.POETRY) -> PackageManager:
+    """Create the package manager backend called ``name``.
+
+    Args:
+        name (str): One of PackageManagerEnum.
+
+    Returns:
+        PackageManager: The package manager.
+
+    Raises:
+        ValueError: If ``name`` is not a supported package manager.
+        typer.Exit: If the package manager is not installed.
+    """
+    name = PackageManagerEnum(name)
+    if name == PackageManagerEnum.UV:
+        from tigr81.commands.core.uv_pm import UvPM
+
+        return UvPM()
+
+    from tigr81.commands.core.poetry_pm import PoetryPM
+
+    return PoetryPM()
@@ -1,11 +1,11 @@
 import pathlib as pl
-import shutil
-import subprocess as sp
 
 import typer
 
+from tigr81.commands.core.package_manager import PackageManager
 
-class PoetryPM:
+
+class PoetryPM(PackageManager):
     """A utility class for managing Python dependencies using Poetry.
 
     This class provides methods to interact with the Poetry package manager.
@@ -13,28 +13,12 @@ class PoetryPM:
     dependencies from a specified working directory.
     """
 
-    def __init__(self):
-        """Initializes the PoetryPM class by checking for the Poetry executable.
+    name = "poetry"
 
-        If Poetry is installed, it captures the Poetry version information.
-        If Poetry is not found, it will print a message and exit the program.
-        """
-        self.poetry_executable = shutil.which("poetry")
-
-        if not self.poetry_executable:
-            typer.echo("Poetry is not installed or not found on this machine.")
-            raise typer.Exit()
-
-        result: sp.CompletedProcess = sp.run(  # noqa: S603
-            [self.poetry_executable, "--version"],
-            stdout=sp.PIPE,
-            stderr=sp.PIPE,
-            check=True,
-            text=True,
-        )
-        poetry_version = result.stdout.strip()
-        typer.echo(f"Poetry executable: {self.poetry_executable}")
-        typer.echo(f"Poetry version: {poetry_version}")
+    @property
+    def poetry_executable(self) -> str:
+        """Path to the Poetry executable."""
+        return self.executable
 
     def install(self, cwd: pl.Path) -> None:
         """Installs dependencies in the specified working directory using Poetry.
@@ -43,31 +27,12 @@ class PoetryPM:
             cwd (pl.Path): The path to the working directory where `poetry install`
                            should be executed.
 
-        This method runs `poetry install` in the specified directory and captures
-        both standard output and standard error, displaying any error messages in
-        red text. If installation fails, it will print an error message and exit.
+        This method runs `poetry install` in the specified directory and streams
+        its standard output and standard error as they are produced. If
+        installation fails, it will print an error message and exit.
         """
-        try:
-            typer.echo(f"Installing component {cwd}...")
-            result: sp.CompletedProcess = sp.run(  # noqa: S603
-                [self.poetry_executable, "install"],
-                stdout=sp.PIPE,
-                stderr=sp.PIPE,
-                check=True,
-                cwd=cwd,
-            )
-
-            typer.echo(result.stdout, color="green")
-            typer.echo(result.stderr, color="red")
-
-            if result.returncode != 0:
-                typer.echo(
-                    "An error occurred while running 'poetry install'.", color="red"
-                )
-                raise typer.Exit()
-        except sp.CalledProcessError:
-            typer.echo("An error occurred while running 'poetry install'.", color="red")
-            raise typer.Exit() from None
+        typer.echo(f"Installing component {cwd}...")
+        self._run(["install"], cwd=cwd)
 
     def remove(self, cwd: pl.Path, dependency: str) -> None:
         """Removes a specified dependency from the working directory using Poetry.
@@ -78,32 +43,29 @@ class PoetryPM:
             dependency (str): The name of the dependency to remove.
 
         This method runs `poetry remove <dependency>` in the specified directory
-        and captures both standard output and standard error, displaying error
-        messages in red text if they occur. If the removal fails, it will print
-        an error message and exit.
+        and streams its standard output and standard error as they are produced.
+        If the removal fails, it will print an error message and exit.
+        """
+        typer.echo(f"Removing dependency {dependency} from {cwd}...")
+        self._run(["remove", dependency], cwd=cwd)
+
+    def add_path_dependency(self, cwd: pl.Path, path: pl.Path) -> None:
+        """Adds a local project as an editable dependency using Poetry.
+
+        Args:
+            cwd (pl.Path): The path to the working directory where `poetry add`
+                           should be executed.
+            path (pl.Path): The path of the dependency, relative to ``cwd``.
+        """
+        typer.echo(f"Adding path dependency {path} to {cwd}...")
+        self._run(["add", "--editable", str(path)], cwd=cwd)
+
+    def lock(self, cwd: pl.Path) -> None:
+        """Updates the poetry.lock file of the working directory.
+
+        Args:
+            cwd (pl.Path): The path to the working directory where `poetry lock`
+                           should be executed.
         """
-        try:
-            typer.echo(f"Removing dependency {dependency} from {cwd}...")
-            result: sp.CompletedProcess = sp.run(  # noqa: S603
-                [self.poetry_executable, "remove", dependency],
-                stdout=sp.PIPE,
-                stderr=sp.PIPE,
-                check=True,
-                cwd=cwd,
-            )
-
-            typer.echo(result.stdout, color="green")
-            typer.echo(result.stderr, color="red")
-
-            if result.returncode != 0:
-                typer.echo(
-                    f"An error occurred while running 'poetry remove {dependency}'.",
-                    color="red",
-                )
-                raise typer.Exit()
-        except sp.CalledProcessError:
-            typer.echo(
-                f"An error occurred while running 'poetry remove {dependency}'.",
-                color="red",
-            )
-            raise typer.Exit() from None
+        typer.echo(f"Locking {cwd}...")
+        self._run(["lock"], cwd=cwd)
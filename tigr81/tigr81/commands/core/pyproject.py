@@ -0,0 +1,107 @@
+"""Line based edits of pyproject.toml files.
+
+Edits keep the rest of the file, comments and formatting included, untouched,
+which a TOML round trip would not.
+"""
+
+import pathlib as pl
+import re
+
+SECTION_REGEX = re.compile(r"^\s*\[\s*([^\[\]]+?)\s*\]\s*(#.*)?$")
+KEY_REGEX = re.compile(r"""^\s*["']?([A-Za-z0-9][A-Za-z0-9._-]*)["']?\s*=""")
+ARRAY_START_REGEX = re.compile(r"""^\s*["']?([A-Za-z0-9][A-Za-z0-9._-]*)["']?\s*=\s*\[""")
+REQUIREMENT_REGEX = re.compile(r"""(["'])\s*([A-Za-z0-9][A-Za-z0-9._-]*)[^"']*\1\s*,?[ \t]*""")
+QUOTED_REGEX = re.compile(r""""[^"]*"|'[^']*'""")
+
+DEPENDENCY_TABLE_REGEX = re.compile(
+    r"tool\.poetry\.(dev-)?dependencies|tool\.poetry\.group\.[^.]+\.dependencies|tool\.uv\.sources"
+)
+"""Tables whose keys are dependency names."""
+DEPENDENCY_ARRAYS = {
+    "project": {"dependencies"},
+    "project.optional-dependencies": None,
+    "dependency-groups": None,
+}
+"""Tables holding arrays of PEP 508 requirements, with the array keys (None for any key)."""
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a distribution name as in PEP 503."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def _remove_requirements(text: str, name: str) -> str:
+    def replace(match: re.Match) -> str:
+        return "" if normalize_name(match.group(2)) == name else match.group(0)
+
+    return REQUIREMENT_REGEX.sub(replace, text)
+
+
+def _closes_array(text: str) -> bool:
+    return "]" in QUOTED_REGEX.sub("", text).partition("#")[0]
+
+
+def _split_newline(line: str):
+    body = line.rstrip("\r\n")
+    return body, line[len(body) :]
+
+
+def remove_dependency(pyproject_path: pl.Path, dependency: str) -> bool:
+    """Remove a dependency from a pyproject.toml file, without resolving anything.
+
+    The dependency is removed from the Poetry dependency tables (main, dev and
+    groups), from ``[tool.uv.sources]`` and from the PEP 621 / PEP 735 arrays
+    of requirements (``project.dependencies``, optional dependencies and
+    dependency groups). The lock file has to be updated afterwards.
+
+    Args:
+        pyproject_path (pl.Path): Path to the pyproject.toml file.
+        dependency (str): The name of the dependency to remove.
+
+    Returns:
+        bool: True if the file changed, False if it did not mention the dependency.
+    """
+    name = normalize_name(dependency)
+    text = pyproject_path.read_text()
+    out = []
+    section = None
+    in_array = False
+
+    for line in text.splitlines(keepends=True):
+        if in_array:
+            body, newline = _split_newline(line)
+            edited = _remove_requirements(body, name)
+            in_array = not _closes_array(body)
+            # Drop the lines left holding nothing but a comment of the removed requirement
+            if edited.partition("#")[0].strip() or edited == body:
+                out.append(edited + newline)
+            continue
+
+        section_match = SECTION_REGEX.match(line)
+        if section_match:
+            section = section_match.group(1)
+            out.append(line)
+            continue
+
+        if section and DEPENDENCY_TABLE_REGEX.fullmatch(section):
+            key_match = KEY_REGEX.match(line)
+            if key_match and normalize_name(key_match.group(1)) == name:
+                continue
+
+        array_match = ARRAY_START_REGEX.match(line)
+        if array_match and section in DEPENDENCY_ARRAYS:
+            keys = DEPENDENCY_ARRAYS[section]
+            if keys is None or array_match.group(1) in keys:
+                head, _, tail = line.partition("[")
+                body, newline = _split_newline(tail)
+                out.append(f"{head}[{_remove_requirements(body, name)}{newline}")
+                in_array = not _closes_array(body)
+                continue
+
+        out.append(line)
+
+    edited_text = "".join(out)
+    if edited_text == text:
+        return False
+    pyproject_path.write_text(edited_text)
+    return True
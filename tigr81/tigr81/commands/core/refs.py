@@ -0,0 +1,284 @@
+"""Resolution of remote git refs.
+
+``git ls-remote`` results are cached on disk per repository URL for a TTL, so
+that resolving the latest tag of a template does not hit the network on every
+scaffold, and several repositories are resolved concurrently.
+"""
+
+import json
+import os
+import re
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import tigr81.utils as tigr81_utils
+from tigr81 import USER_CACHE_LOCATION
+
+REFS_CACHE_LOCATION = USER_CACHE_LOCATION / "refs.json"
+REFS_TTL_ENV_VAR = "TIGR81_REFS_TTL"
+DEFAULT_REFS_TTL = 600
+"""Default number of seconds before the refs of a repository are listed again."""
+
+LATEST_CHECKOUT = "latest"
+"""Checkout standing for the latest release tag of a repository."""
+
+VERSION_REGEX = re.compile(
+    r"^(?P<prefix>(?:\D.*?[-_/@])??)[vV]?"
+    r"(?P<major>\d+)(?:\.(?P<minor>\d+))?(?:\.(?P<patch>\d+))?"
+    r"(?:-?(?P<pre>[0-9A-Za-z]+(?:[.-][0-9A-Za-z]+)*))?"
+    r"(?:\+[0-9A-Za-z.-]+)?$"
+)
+"""Version tags, with an optional ``v`` and a prefix ending with a separator.
+
+The prefix is the shortest one, not starting with a digit, that lets the rest
+parse as a version: ``1.2.3-1`` is version 1.2.3 with pre-release 1, not
+version 1 with prefix ``1.2.3-``.
+"""
+
+
+class Version(NamedTuple):
+    """A semantic version parsed from a tag, ordered as in semver.
+
+    Pre-releases come before their release, and their dot separated identifiers
+    are compared numerically when numeric and alphabetically otherwise, numeric
+    identifiers first. The tag prefix (e.g. ``v`` or ``release-``) is ignored.
+
+    Attributes:
+        release (Tuple[int, int, int]): The major, minor and patch numbers.
+        stable (bool): False for pre-releases.
+        pre (Tuple[Tuple[int, int, str], ...]): The pre-release identifiers.
+        tag (str): The tag the version was parsed from.
+    """
+
+    release: Tuple[int, int, int]
+    stable: bool
+    pre: Tuple[Tuple[int, int, str], ...]
+    tag: str
+
+    @classmethod
+    def parse(cls, tag: str) -> Optional["Version"]:
+        """Parse a tag such as ``1.2.3``, ``v1.2``, ``pkg-v2.0.0-rc.1`` or ``1.0.0b2``.
+
+        Args:
+            tag (str): The tag name.
+
+        Returns:
+            Optional[Version]: The version, or None if the tag is not a version.
+        """
+        match = VERSION_REGEX.match(tag)
+        if match is None:
+            return None
+        release = tuple(int(match.group(key) or 0) for key in ("major", "minor", "patch"))
+        pre = match.group("pre")
+        identifiers = tuple(
+            (0, int(part), "") if part.isdigit() else (1, 0, part)
+            for part in re.split(r"[.-]|(?<=[A-Za-z])(?=\d)", pre or "")
+            if part
+        )
+        return cls(release=release, stable=pre is None, pre=identifiers, tag=tag)
+
+
+def sort_tags(tags: Iterable[str]) -> List[str]:
+    """Sort the version tags in semantic version order, dropping the other tags.
+
+    Args:
+        tags (Iterable[str]): Tag names.
+
+    Returns:
+        List[str]: The version tags, from the oldest to the latest.
+    """
+    versions = [version for version in map(Version.parse, tags) if version is not None]
+    return [version.tag for version in sorted(versions)]
+
+
+def get_refs_ttl() -> float:
+    """Return the refs TTL in seconds, read from ``TIGR81_REFS_TTL``."""
+    return float(os.environ.get(REFS_TTL_ENV_VAR, DEFAULT_REFS_TTL))
+
+
+def _read_cache() -> dict:
+    try:
+        return json.loads(REFS_CACHE_LOCATION.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_cache(repo_url: str, refs: Dict[str, str]) -> None:
+    try:
+        REFS_CACHE_LOCATION.parent.mkdir(parents=True, exist_ok=True)
+        with tigr81_utils.file_lock(REFS_CACHE_LOCATION):
+            cache = _read_cache()
+            cache[repo_url] = {"fetched_at": time.time(), "refs": refs}
+            with tigr81_utils.atomic_write(REFS_CACHE_LOCATION) as f:
+                json.dump(cache, f)
+    except OSError:
+        pass
+
+
+def ls_remote(repo_url: str, ttl: Optional[float] = None) -> Dict[str, str]:
+    """List the branches and tags of a remote repository, through the refs cache.
+
+    Args:
+        repo_url (str): The remote repository URL.
+        ttl (Optional[float]): Seconds after which cached refs are listed again,
+                               0 to bypass the cache. Defaults to get_refs_ttl().
+
+    Returns:
+        Dict[str, str]: The commit SHA of each ref, by full ref name (e.g.
+        ``refs/tags/1.0.0``). Annotated tags are peeled to their commit.
+
+    Raises:
+        subprocess.CalledProcessError: If git cannot list the remote refs.
+    """
+    ttl = get_refs_ttl() if ttl is None else ttl
+    use_cache = tigr81_utils.is_cache_enabled()
+    if use_cache and ttl > 0:
+        cached = _read_cache().get(repo_url)
+        if cached is not None and time.time() - cached["fetched_at"] < ttl:
+            return cached["refs"]
+
+    result = subprocess.run(  # noqa: S603
+        ["git", "ls-remote", "--heads", "--tags", repo_url],  # noqa: S607
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    refs: Dict[str, str] = {}
+    peeled: Dict[str, str] = {}
+    for line in result.stdout.splitlines():
+        parts = line.split()
+        if len(parts) != 2:
+            continue
+        sha, ref = parts
+        if ref.endswith("^{}"):
+            peeled[ref[:-3]] = sha
+        else:
+            refs[ref] = sha
+    refs.update((ref, sha) for ref, sha in peeled.items() if ref in refs)
+
+    if use_cache:
+        _write_cache(repo_url, refs)
+    return refs
+
+
+def latest_tag(repo_url: str, ttl: Optional[float] = None) -> Optional[str]:
+    """Return the latest release tag of a remote repository.
+
+    Pre-releases are only considered when the repository has no release.
+
+    Args:
+        repo_url (str): The remote repository URL.
+        ttl (Optional[float]): See ls_remote.
+
+    Returns:
+        Optional[str]: The latest tag, or None if no tag is a version.
+
+    Raises:
+        subprocess.CalledProcessError: If git cannot list the remote refs.
+    """
+    return find_latest_tag(ls_remote(repo_url, ttl))
+
+
+def find_latest_tag(refs: Dict[str, str]) -> Optional[str]:
+    """Look the latest release tag up in refs listed by ls_remote, as latest_tag.
+
+    Args:
+        refs (Dict[str, str]): The commit SHA of each ref, by full ref name.
+
+    Returns:
+        Optional[str]: The latest tag, or None if no tag is a version.
+    """
+    prefix = "refs/tags/"
+    tags = [ref[len(prefix) :] for ref in refs if ref.startswith(prefix)]
+    versions = sorted(v for v in map(Version.parse, tags) if v is not None)
+    releases = [version for version in versions if version.stable]
+    return (releases or versions)[-1].tag if versions else None
+
+
+def resolve_ref(repo_url: str, ref: str, ttl: Optional[float] = None) -> Optional[str]:
+    """Return the commit SHA a branch or tag of a remote repository points to.
+
+    Args:
+        repo_url (str): The remote repository URL.
+        ref (str): A branch or tag name, or a full ref name.
+        ttl (Optional[float]): See ls_remote.
+
+    Returns:
+        Optional[str]: The commit SHA, or None if the repository has no such ref.
+
+    Raises:
+        subprocess.CalledProcessError: If git cannot list the remote refs.
+    """
+    return find_ref(ls_remote(repo_url, ttl), ref)
+
+
+def find_ref(refs: Dict[str, str], ref: str) -> Optional[str]:
+    """Look a branch or tag up in refs listed by ls_remote.
+
+    Args:
+        refs (Dict[str, str]): The commit SHA of each ref, by full ref name.
+        ref (str): A branch or tag name, or a full ref name. Tags win over
+                   branches with the same name, as in git.
+
+    Returns:
+        Optional[str]: The commit SHA, or None if there is no such ref.
+    """
+    for name in (ref, f"refs/tags/{ref}", f"refs/heads/{ref}"):
+        if name in refs:
+            return refs[name]
+    return None
+
+
+def resolve_checkouts(
+    checkouts: Iterable[Tuple[str, str]], jobs: int = 8
+) -> Dict[Tuple[str, str], str]:
+    """Resolve the ``latest`` checkouts of several repositories concurrently.
+
+    Args:
+        checkouts (Iterable[Tuple[str, str]]): Pairs of repository URL and checkout.
+        jobs (int): Maximum number of repositories listed concurrently.
+
+    Returns:
+        Dict[Tuple[str, str], str]: The checkout to use for each pair: the latest
+        tag of the repository for ``latest`` (``main`` if it has no tag), the
+        checkout itself otherwise.
+
+    Raises:
+        subprocess.CalledProcessError: If git cannot list the refs of a repository.
+    """
+    pairs = [*dict.fromkeys(checkouts)]
+    resolved = {pair: pair[1] for pair in pairs}
+    urls = [*dict.fromkeys(url for url, checkout in pairs if checkout == LATEST_CHECKOUT)]
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        tags = list(executor.map(latest_tag, urls))
+    for i, url in enumerate(urls):
+        resolved[url, LATEST_CHECKOUT] = tags[i] or "main"
+    return resolved
+
+
+def refresh(repo_urls: Iterable[str], jobs: int = 8) -> Dict[str, Optional[Exception]]:
+    """List the refs of several repositories concurrently, bypassing the cache.
+
+    Args:
+        repo_urls (Iterable[str]): The remote repository URLs.
+        jobs (int): Maximum number of repositories listed concurrently.
+
+    Returns:
+        Dict[str, Optional[Exception]]: The error of each repository, None if
+        its refs were listed and cached.
+    """
+
+    def _refresh(repo_url: str) -> Optional[Exception]:
+        try:
+            ls_remote(repo_url, ttl=0)
+        except (OSError, subprocess.CalledProcessError) as e:
+            return e
+        return None
+
+    urls = [*dict.fromkeys(repo_urls)]
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        errors = list(executor.map(_refresh, urls))
+    return {url: errors[i] for i, url in enumerate(urls)}
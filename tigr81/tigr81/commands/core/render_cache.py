@@ -0,0 +1,217 @@
+"""Cache of rendered templates.
+
+Rendering a template without prompting is deterministic given the template
+commit, the directory rendered and the answers, so the rendered tree is kept
+under ``~/.tigr81rc/cache/renders/<key>`` and copied into the output folder of
+later scaffolds instead of rendering again. Files are copied as copy-on-write
+clones where the filesystem supports it, so a hit costs little disk space.
+The cache is bounded in size, evicting the least recently used renders first.
+"""
+
+import hashlib
+import json
+import os
+import pathlib as pl
+import shutil
+import subprocess
+import tempfile
+from typing import Any, Callable, List, Optional
+
+import tigr81.commands.core.mirror as mirror
+import tigr81.utils as tigr81_utils
+from tigr81 import USER_CACHE_LOCATION
+
+RENDER_CACHE_LOCATION = USER_CACHE_LOCATION / "renders"
+RENDER_CACHE_SIZE_ENV_VAR = "TIGR81_RENDER_CACHE_SIZE"
+DEFAULT_RENDER_CACHE_SIZE = 512 * 1024 * 1024
+"""Default maximum size of the cached renders, in bytes."""
+RENDER_CACHE_VERSION = 1
+"""Bumped when the layout of a cached render changes, to ignore older ones."""
+
+TREE_DIR_NAME = "tree"
+SIZE_FILE_NAME = "size"
+
+
+def get_render_cache_size() -> int:
+    """Return the render cache size in bytes, read from ``TIGR81_RENDER_CACHE_SIZE``."""
+    return int(os.environ.get(RENDER_CACHE_SIZE_ENV_VAR, DEFAULT_RENDER_CACHE_SIZE))
+
+
+def resolve_commit(template: str, source: str, checkout: Optional[str]) -> Optional[str]:
+    """Return the commit ``checkout`` points to in the local mirror of ``template``.
+
+    Args:
+        template (str): The template location.
+        source (str): Where the template is read from, see mirror.resolve_template_source.
+        checkout (Optional[str]): A branch, tag or commit SHA.
+
+    Returns:
+        Optional[str]: The commit SHA, or None if ``source`` is not the mirror of
+        ``template`` or it has no such checkout.
+    """
+    if checkout is None or not mirror.is_remote_repo(template):
+        return None
+    path = mirror.get_mirror_path(str(template))
+    if source != path.as_uri():
+        return None
+    try:
+        result = subprocess.run(  # noqa: S603
+            ["git", "--git-dir", str(path), "rev-parse", "--verify", "--quiet", f"{checkout}^{{commit}}"],  # noqa: S607
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def render_key(template: str, source: str, checkout: Optional[str], **parts: Any) -> Optional[str]:
+    """Return the key of a render in the cache.
+
+    Args:
+        template (str): The template location.
+        source (str): Where the template is read from, see mirror.resolve_template_source.
+        checkout (Optional[str]): The branch, tag or commit SHA rendered.
+        **parts: Everything else the rendered files depend on, e.g. the template
+                 type, directory and answers. Values must be JSON serializable.
+
+    Returns:
+        Optional[str]: The key, or None if the render cannot be cached because
+        caches are disabled or the checkout is not a commit of a local mirror.
+    """
+    if not tigr81_utils.is_cache_enabled():
+        return None
+    commit = resolve_commit(template, source, checkout)
+    if commit is None:
+        return None
+    payload = json.dumps(
+        {"version": RENDER_CACHE_VERSION, "template": str(template), "commit": commit, **parts},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _tree_paths(tree: pl.Path) -> List[pl.Path]:
+    return [
+        pl.Path(root, name).relative_to(tree)
+        for root, dirs, files in os.walk(tree)
+        for name in [*dirs, *files]
+    ]
+
+
+def materialize(tree: pl.Path, output_dir: pl.Path) -> None:
+    """Copy a cached render into ``output_dir``, merging it with existing folders.
+
+    Args:
+        tree (pl.Path): The cached rendered tree.
+        output_dir (pl.Path): The folder to copy it into.
+    """
+    tigr81_utils.copy_tree(tree, output_dir)
+
+
+def _store(key: str, render: Callable[[pl.Path], None]) -> pl.Path:
+    """Render into a staging folder and move it into the cache as ``key``."""
+    RENDER_CACHE_LOCATION.mkdir(parents=True, exist_ok=True)
+    entry = RENDER_CACHE_LOCATION / key
+    staging = pl.Path(tempfile.mkdtemp(dir=RENDER_CACHE_LOCATION, suffix=".tmp"))
+    try:
+        render(staging / TREE_DIR_NAME)
+        size = sum(
+            (staging / TREE_DIR_NAME / path).lstat().st_size
+            for path in _tree_paths(staging / TREE_DIR_NAME)
+        )
+        (staging / SIZE_FILE_NAME).write_text(str(size))
+        try:
+            os.replace(staging, entry)
+        except OSError:
+            # Another process stored the same render first
+            if not (entry / TREE_DIR_NAME).is_dir():
+                raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return entry
+
+
+def _last_used(entry: pl.Path) -> float:
+    try:
+        return entry.stat().st_mtime
+    except OSError:
+        return 0.0
+
+
+def evict(max_size: Optional[int] = None) -> None:
+    """Remove the least recently used renders until the cache fits in ``max_size``.
+
+    Args:
+        max_size (Optional[int]): The maximum size of the cached renders, in bytes.
+                                  Defaults to get_render_cache_size().
+    """
+    max_size = get_render_cache_size() if max_size is None else max_size
+    sizes = {}
+    for entry in RENDER_CACHE_LOCATION.glob("*"):
+        try:
+            sizes[entry] = int((entry / SIZE_FILE_NAME).read_text())
+        except (OSError, ValueError):
+            continue
+    total = sum(sizes.values())
+    for entry in sorted(sizes, key=_last_used):
+        if total <= max_size:
+            break
+        # Rename first so that the render disappears from the cache at once
+        trash = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+        try:
+            os.replace(entry, trash)
+        except OSError:
+            continue
+        shutil.rmtree(trash, ignore_errors=True)
+        total -= sizes[entry]
+
+
+def render_cached(
+    key: Optional[str],
+    output_dir: pl.Path,
+    render: Callable[[pl.Path], None],
+    overwrite: bool = False,
+) -> bool:
+    """Render a template into ``output_dir`` through the render cache.
+
+    On a miss, ``render`` renders into a staging folder that is stored in the
+    cache, then copied into ``output_dir``. On a hit, only the copy happens.
+    When the render would overwrite existing paths and ``overwrite`` is False,
+    ``render`` renders into ``output_dir`` directly, so that the backend reports
+    or prompts about the conflicts as without the cache.
+
+    Args:
+        key (Optional[str]): The key of the render, see render_key. None renders
+                             into ``output_dir`` without the cache.
+        output_dir (pl.Path): The folder to render into.
+        render (Callable[[pl.Path], None]): Renders the template into the folder
+                                            it is given.
+        overwrite (bool): Whether cached files may replace existing ones.
+
+    Returns:
+        bool: True if the render was read from the cache.
+    """
+    if key is None:
+        render(output_dir)
+        return False
+
+    entry = RENDER_CACHE_LOCATION / key
+    hit = (entry / TREE_DIR_NAME).is_dir()
+    if not hit:
+        entry = _store(key, render)
+    tree = entry / TREE_DIR_NAME
+
+    if not overwrite and any((output_dir / path).exists() for path in _tree_paths(tree)):
+        render(output_dir)
+        return False
+
+    materialize(tree, output_dir)
+    if hit:
+        os.utime(entry)
+    else:
+        evict()
+    return hit
@@ -1,10 +1,18 @@
+import functools
 import pathlib as pl
-from typing import List
+import tempfile
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from importlib.metadata import version
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import typer
 from cookiecutter.main import cookiecutter
 
 import tigr81.commands.core.gitw as gitw
+import tigr81.commands.core.mirror as mirror
+from tigr81.commands.core import archive, local, refs, render_cache, scheduler
+from tigr81.commands.hub.models import HubTemplate, TemplateTypeEnum
 from tigr81.commands.scaffold.project_template import (
     ProjectTemplate,
     ProjectTemplateOptions,
@@ -17,6 +25,7 @@ def scaffold_project_type(
     default: bool = False,
     output_dir: pl.Path = pl.Path("."),
     checkout: str = "main",
+    use_render_cache: bool = True,
 ):
     """Scaffold a project based on the project type.
 
@@ -25,6 +34,7 @@ def scaffold_project_type(
         default: Whether to use default values without prompting.
         output_dir: The directory where the project will be created.
         checkout: The git branch or tag to checkout.
+        use_render_cache: Whether to reuse a previous identical render, see render_cache.
     """
     author_name, author_email = gitw.get_author_info()
 
@@ -37,7 +47,11 @@ def scaffold_project_type(
     )
 
     scaffold_project_template(
-        project_template, default=default, output_dir=output_dir, checkout=checkout
+        project_template,
+        default=default,
+        output_dir=output_dir,
+        checkout=checkout,
+        use_render_cache=use_render_cache,
     )
 
 
@@ -46,6 +60,10 @@ def scaffold_project_template(
     default: bool = False,
     output_dir: pl.Path = pl.Path("."),
     checkout: str = "main",
+    template_dir: Optional[pl.Path] = None,
+    author_info: Optional[Tuple[str, str]] = None,
+    overwrite_if_exists: bool = False,
+    use_render_cache: bool = True,
 ):
     """Scaffold a project from a project template.
 
@@ -54,25 +72,66 @@ def scaffold_project_template(
         default: Whether to use default values without prompting.
         output_dir: The directory where the project will be created.
         checkout: The git branch or tag to checkout.
+        template_dir: A local copy of the project type repository, see
+            fetch_project_type. Defaults to fetching it from its location.
+        author_info: The author name and email. Defaults to the git configuration.
+        overwrite_if_exists: Whether to render over an existing project folder.
+        use_render_cache: Whether to reuse a previous identical render, see
+            render_cache. Renders of a template_dir are never cached.
     """
     template = project_template.project_type_as_enum.project_location
     typer.echo(
         f"Scaffolding a {project_template.project_type} project template from {template}"
     )
 
-    author_name, author_email = gitw.get_author_info()
+    author_name, author_email = author_info or gitw.get_author_info()
 
     project_template.project_options.author_name = author_name
     project_template.project_options.author_email = author_email
 
-    cookiecutter(
-        template=template,
+    if template_dir is not None:
+        template = source = str(template_dir)
+        checkout = None
+        use_render_cache = False
+    else:
+        source = mirror.resolve_template_source(template)
+
+    render_cookiecutter(
+        template,
+        source,
+        default=default,
         output_dir=output_dir,
-        no_input=default,
-        extra_context=project_template.extra_content,
         checkout=checkout,
         directory=str(project_template.project_type),
+        extra_context=project_template.extra_content,
+        overwrite_if_exists=overwrite_if_exists,
+        use_render_cache=use_render_cache,
+    )
+
+
+def fetch_project_type(
+    project_type: ProjectTypeEnum, checkout: str, output_dir: pl.Path
+) -> pl.Path:
+    """Fetch the template of a project type at ``checkout`` into ``output_dir``.
+
+    Args:
+        project_type: The project type to fetch.
+        checkout: The git branch or tag to checkout.
+        output_dir: The directory where the template repository is written.
+
+    Returns:
+        pl.Path: ``output_dir``, to be passed as ``template_dir`` to
+        scaffold_project_template.
+    """
+    template = project_type.project_location
+    gitw.export_repo_directory(
+        repo_url=template,
+        checkout=checkout,
+        directory=pl.Path(str(project_type)),
+        output_dir=output_dir,
+        source=mirror.resolve_template_source(template),
     )
+    return output_dir
 
 
 def scaffold_cookiecutter(
@@ -80,6 +139,7 @@ def scaffold_cookiecutter(
     default: bool = False,
     output_dir: pl.Path = pl.Path("."),
     checkout: str = "main",
+    use_render_cache: bool = True,
 ):
     """Scaffold a project using cookiecutter.
 
@@ -88,22 +148,377 @@ def scaffold_cookiecutter(
         default: Whether to use default values without prompting.
         output_dir: The directory where the project will be created.
         checkout: The git branch or tag to checkout.
+        use_render_cache: Whether to reuse a previous identical render, see render_cache.
     """
     template = project_type.project_location
     typer.echo(f"Scaffolding a {project_type} project template from {template}")
-    cookiecutter(
-        template=template,
+    render_cookiecutter(
+        template,
+        mirror.resolve_template_source(template),
+        default=default,
         output_dir=output_dir,
-        no_input=default,
         checkout=checkout,
         directory=str(project_type),
+        use_render_cache=use_render_cache,
     )
 
 
-def scaffold_monorepo(components: List[ProjectTemplate]):
-    """Scaffold a monorepo with multiple components.
+def _cookiecutter_default_context() -> Dict[str, Any]:
+    from cookiecutter.config import get_user_config
+
+    return get_user_config()["default_context"]
+
+
+def render_cookiecutter(
+    template: str,
+    source: str,
+    default: bool = False,
+    output_dir: pl.Path = pl.Path("."),
+    checkout: Optional[str] = None,
+    directory: Optional[str] = None,
+    extra_context: Optional[Dict[str, Any]] = None,
+    overwrite_if_exists: bool = False,
+    use_render_cache: bool = True,
+    template_dir: Optional[pl.Path] = None,
+):
+    """Render a cookiecutter template, through the render cache when possible.
+
+    Renders are cached only without prompting, since answers typed by the user
+    are not part of the cache key.
+
+    Args:
+        template: The template location, identifying it in the cache.
+        source: Where to read the template from, see mirror.resolve_template_source.
+        default: Whether to use default values without prompting.
+        output_dir: The directory where the project will be created.
+        checkout: The git branch, tag or commit to checkout.
+        directory: The directory of the template within the repository.
+        extra_context: Values overriding the defaults of cookiecutter.json.
+        overwrite_if_exists: Whether to render over an existing project folder.
+        use_render_cache: Whether to reuse a previous identical render.
+        template_dir: A local copy of the repository at ``checkout``, see
+            gitw.export_repo_directory, rendered instead of ``source``. Cookiecutter
+            clones every repository into the same ``~/.cookiecutters`` folder, so
+            concurrent renders of one repository need their own copy. The cache
+            key is still computed from ``source``.
+    """
+    key = None
+    if default and use_render_cache:
+        key = render_cache.render_key(
+            template,
+            source,
+            checkout,
+            backend=f"cookiecutter=={version('cookiecutter')}",
+            directory=directory,
+            extra_context=extra_context or {},
+            default_context=_cookiecutter_default_context(),
+        )
+
+    def _render(render_dir: pl.Path) -> None:
+        cookiecutter(
+            template=source if template_dir is None else str(template_dir),
+            output_dir=render_dir,
+            no_input=default,
+            extra_context=extra_context,
+            checkout=checkout if template_dir is None else None,
+            directory=directory,
+            overwrite_if_exists=overwrite_if_exists,
+        )
+
+    render_cache.render_cached(key, output_dir, _render, overwrite=overwrite_if_exists)
+
+
+def render_copier(
+    template: str,
+    source: str,
+    default: bool = False,
+    output_dir: pl.Path = pl.Path("."),
+    checkout: Optional[str] = None,
+    use_render_cache: bool = True,
+):
+    """Render a copier template, through the render cache when possible.
+
+    Renders are cached only without prompting, since answers typed by the user
+    are not part of the cache key.
+
+    Args:
+        template: The template location, identifying it in the cache.
+        source: Where to read the template from, see mirror.resolve_template_source.
+        default: Whether to use default values without prompting.
+        output_dir: The directory where the project will be created.
+        checkout: The git branch, tag or commit to checkout. Unlike copier, None
+            is not resolved to the latest tag when caching.
+        use_render_cache: Whether to reuse a previous identical render.
+    """
+    import copier
+
+    key = None
+    if default and use_render_cache:
+        key = render_cache.render_key(
+            template, source, checkout, backend=f"copier=={version('copier')}"
+        )
+
+    def _render(render_dir: pl.Path) -> None:
+        copier.run_copy(
+            src_path=source, dst_path=render_dir, vcs_ref=checkout, defaults=default
+        )
+
+    render_cache.render_cached(key, output_dir, _render)
+
+
+def render_raw_git(
+    template: str,
+    source: str,
+    output_dir: pl.Path = pl.Path("."),
+    checkout: Optional[str] = None,
+    directory: Optional[str] = None,
+    use_render_cache: bool = True,
+):
+    """Check out a directory of a git repository, through the render cache when possible.
+
+    A cached checkout is copied with reflinks or in-kernel copies instead of
+    being checked out again, which matters for repositories of large assets.
+
+    Args:
+        template: The repository URL, identifying it in the cache.
+        source: Where to clone the repository from, see mirror.resolve_template_source.
+        output_dir: The directory the files are written to. Defaults to a folder
+            named after the repository, see gitw.export_repo_directory.
+        checkout: The git branch, tag or commit to checkout. Defaults to ``main``.
+        directory: The directory of the repository to check out. Defaults to all.
+        use_render_cache: Whether to reuse a previous identical checkout.
+    """
+    checkout = checkout or "main"
+    directory = directory or "."
+    if str(output_dir) == ".":
+        output_dir = pl.Path(pl.Path(template).name.replace(".git", ""))
+
+    key = None
+    if use_render_cache:
+        key = render_cache.render_key(
+            template, source, checkout, backend="git", directory=directory
+        )
+
+    def _render(render_dir: pl.Path) -> None:
+        gitw.export_repo_directory(
+            repo_url=template,
+            output_dir=render_dir,
+            directory=pl.Path(directory),
+            checkout=checkout,
+            source=source,
+        )
+
+    render_cache.render_cached(key, output_dir, _render)
+
+
+def render_archive(
+    template: str,
+    source: Optional[str] = None,
+    output_dir: pl.Path = pl.Path("."),
+    directory: Optional[str] = None,
+    sha256: Optional[str] = None,
+):
+    """Extract an archive template (tarball or zip) into ``output_dir``.
+
+    Args:
+        template: The archive location: a local path, a file:// or HTTP(S) URL.
+        source: Where to read the archive from. Defaults to the cached download
+            of the archive, see archive.resolve_archive_source.
+        output_dir: The directory the files are written to. Defaults to a folder
+            named after the archive.
+        directory: The folder of the archive to extract, relative to it.
+            Defaults to the whole archive.
+        sha256: The expected SHA-256 of the archive, in hex.
+    """
+    if source is None:
+        source = archive.resolve_archive_source(template)
+    if str(output_dir) == ".":
+        output_dir = pl.Path(archive.archive_name(template))
+
+    with archive.open_archive(source, sha256) as f:
+        archive.extract_archive(f, output_dir, directory)
+
+
+def render_local(
+    template: str,
+    output_dir: pl.Path = pl.Path("."),
+    directory: Optional[str] = None,
+    hardlink: bool = False,
+):
+    """Copy a local template folder into ``output_dir``, see local.copy_local_template.
+
+    Args:
+        template: The template folder.
+        output_dir: The directory the files are written to. Defaults to a folder
+            named after the template.
+        directory: The sub folder of the template to copy. Defaults to all of it.
+        hardlink: Whether to hard link the files instead of copying them.
+    """
+    template_dir = pl.Path(template).expanduser()
+    if directory not in (None, "."):
+        template_dir = template_dir / directory
+    if not template_dir.is_dir():
+        raise ValueError(f"The local template {template_dir} is not a folder.")
+    if str(output_dir) == ".":
+        output_dir = pl.Path(template_dir.resolve().name)
+
+    start = time.perf_counter()
+    copied = local.copy_local_template(template_dir, output_dir, hardlink=hardlink)
+    typer.echo(f"Copied {copied} files in {time.perf_counter() - start:.2f}s")
+
+
+def scaffold_hub_template(
+    hub_template: HubTemplate,
+    default: bool = False,
+    output_dir: pl.Path = pl.Path("."),
+    source: Optional[str] = None,
+    use_render_cache: bool = True,
+    hardlink: bool = False,
+    template_dir: Optional[pl.Path] = None,
+):
+    """Scaffold a hub template with the backend matching its template type.
+
+    Args:
+        hub_template: The hub template to scaffold.
+        default: Whether to use default values without prompting.
+        output_dir: The directory where the project will be created.
+        source: Where to read the template from. Defaults to the local mirror
+            of the template location, see mirror.resolve_template_source, or
+            the cached download of archives.
+        use_render_cache: Whether to reuse a previous identical render, see
+            render_cache.
+        hardlink: Whether to hard link the files of local templates instead of
+            copying them.
+        template_dir: A local copy of a cookiecutter template repository to
+            render from, see render_cookiecutter.
+    """
+    _template_type = hub_template.template_type
+    if _template_type == TemplateTypeEnum.LOCAL:
+        render_local(
+            str(hub_template.template),
+            output_dir=output_dir,
+            directory=hub_template.directory,
+            hardlink=hardlink,
+        )
+        return
+
+    if _template_type == TemplateTypeEnum.ARCHIVE:
+        render_archive(
+            str(hub_template.template),
+            source,
+            output_dir=output_dir,
+            directory=hub_template.directory,
+            sha256=hub_template.sha256,
+        )
+        return
+
+    if source is None:
+        source = mirror.resolve_template_source(hub_template.template)
+
+    if _template_type == TemplateTypeEnum.COOKIECUTTER:
+        render_cookiecutter(
+            str(hub_template.template),
+            source,
+            default=default,
+            output_dir=output_dir,
+            checkout=hub_template.checkout,
+            directory=hub_template.directory,
+            use_render_cache=use_render_cache,
+            template_dir=template_dir,
+        )
+    elif _template_type == TemplateTypeEnum.RAW_GIT:
+        render_raw_git(
+            str(hub_template.template),
+            source,
+            output_dir=output_dir,
+            checkout=hub_template.checkout,
+            directory=hub_template.directory,
+            use_render_cache=use_render_cache,
+        )
+    elif _template_type == TemplateTypeEnum.COPIER:
+        render_copier(
+            str(hub_template.template),
+            source,
+            default=default,
+            output_dir=output_dir,
+            checkout=hub_template.checkout,
+            use_render_cache=use_render_cache,
+        )
+    else:
+        raise ValueError("Unknown template type")
+
+
+def _wait(submit: Callable[..., Future], *args, **kwargs) -> None:
+    submit(*args, **kwargs).result()
+
+
+def scaffold_monorepo(
+    components: List[ProjectTemplate],
+    relative_path: pl.Path,
+    checkout: str = "main",
+    jobs: int = 4,
+    keep_going: bool = False,
+) -> List[scheduler.TaskResult]:
+    """Scaffold the components of a monorepo concurrently.
+
+    Every distinct project type is fetched once and shared by all of its
+    components, the author info is read from git once, and components are
+    scaffolded after the components they depend on. Components whose folder
+    already exists are rendered over it.
 
     Args:
         components: List of project templates to scaffold.
+        relative_path: The folder in which the monorepo source code is located.
+        checkout: The git branch or tag of the project type templates, or
+            ``latest`` for the latest release tag of each of them.
+        jobs: Maximum number of components fetched or scaffolded concurrently.
+        keep_going: Keep scaffolding the components that do not depend on a failed one.
+
+    Returns:
+        List[scheduler.TaskResult]: The result of each scaffolded component.
     """
-    pass
+    if not components:
+        return []
+
+    author_info = gitw.get_author_info()
+    project_types = [*dict.fromkeys(c.project_type_as_enum for c in components)]
+    checkouts = refs.resolve_checkouts(
+        [(project_type.project_location, checkout) for project_type in project_types],
+        jobs=jobs,
+    )
+
+    with tempfile.TemporaryDirectory(prefix="tigr81-") as tmp_dir:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            fetches = {
+                project_type: executor.submit(
+                    fetch_project_type,
+                    project_type,
+                    checkouts[project_type.project_location, checkout],
+                    pl.Path(tmp_dir) / str(project_type),
+                )
+                for project_type in project_types
+            }
+            template_dirs = {pt: fetch.result() for pt, fetch in fetches.items()}
+
+        deps = {
+            component.project_options.name: [d.name for d in component.dependencies]
+            for component in components
+        }
+        # Cookiecutter changes the working directory while rendering, so
+        # concurrent renders run in separate processes
+        with ProcessPoolExecutor(max_workers=jobs) as renders:
+            tasks = {
+                component.project_options.name: functools.partial(
+                    _wait,
+                    renders.submit,
+                    scaffold_project_template,
+                    component,
+                    default=True,
+                    output_dir=relative_path / component.relative_path,
+                    template_dir=template_dirs[component.project_type_as_enum],
+                    author_info=author_info,
+                    overwrite_if_exists=True,
+                )
+                for component in components
+            }
+            return scheduler.run_tasks(tasks, deps, jobs=jobs, keep_going=keep_going)
@@ -0,0 +1,196 @@
+"""Run tasks concurrently in dependency order.
+
+A task starts only once every task it depends on has succeeded. Independent
+tasks run in parallel on a thread pool, which suits tasks that mostly wait on
+subprocesses such as package manager installs.
+"""
+
+import heapq
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from tigr81.utils import StrEnum
+
+
+class TaskStatus(StrEnum):
+    """Outcome of a scheduled task."""
+
+    OK = "ok"
+    """The task succeeded."""
+    FAILED = "failed"
+    """The task raised an exception."""
+    SKIPPED = "skipped"
+    """The task did not run because a task failed before it could start."""
+
+
+class TaskResult(NamedTuple):
+    """Outcome and timing of a scheduled task.
+
+    Attributes:
+        name (str): The task name.
+        status (TaskStatus): Whether the task succeeded, failed or was skipped.
+        elapsed (float): Wall clock seconds the task ran for.
+        error (Optional[str]): The error message of a failed task.
+    """
+
+    name: str
+    status: TaskStatus
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+
+class CycleError(ValueError):
+    """Raised when dependencies contain a cycle.
+
+    Attributes:
+        cycle (List[str]): The names along the cycle, the first one repeated last.
+    """
+
+    def __init__(self, cycle: List[str]):
+        """Initializes the error with the names along the cycle."""
+        self.cycle = cycle
+        super().__init__(f"Dependency cycle: {' -> '.join(cycle)}")
+
+
+def _find_cycle(deps: Dict[str, List[str]], names: List[str]) -> List[str]:
+    """Return a cycle among ``names``, which all lie on or lead to a cycle."""
+    pending = set(names)
+    path = [names[0]]
+    while True:
+        # Every remaining name has a dependency that is remaining too
+        next_name = next(d for d in deps[path[-1]] if d in pending)
+        if next_name in path:
+            return path[path.index(next_name) :] + [next_name]
+        path.append(next_name)
+
+
+def topological_order(deps: Dict[str, List[str]]) -> List[str]:
+    """Sort task names so that every task comes after its dependencies.
+
+    Runs in O(V+E). Ties are broken by the order of ``deps``, so independent
+    tasks keep their original order. Dependencies that are not tasks
+    themselves are ignored.
+
+    Args:
+        deps (Dict[str, List[str]]): The dependencies of each task.
+
+    Returns:
+        List[str]: The task names in dependency order.
+
+    Raises:
+        CycleError: If the dependencies contain a cycle.
+    """
+    remaining = {name: 0 for name in deps}
+    dependents: Dict[str, List[str]] = {name: [] for name in deps}
+    for name, names in deps.items():
+        for d in dict.fromkeys(names):
+            if d in deps:
+                remaining[name] += 1
+                dependents[d].append(name)
+
+    ready = deque(name for name, count in remaining.items() if count == 0)
+    order = []
+    while ready:
+        name = ready.popleft()
+        order.append(name)
+        for dependent in dependents[name]:
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+                ready.append(dependent)
+
+    if len(order) < len(deps):
+        done = set(order)
+        raise CycleError(_find_cycle(deps, [n for n in deps if n not in done]))
+    return order
+
+
+def _timed(task: Callable[[], None]) -> float:
+    start = time.perf_counter()
+    task()
+    return time.perf_counter() - start
+
+
+def run_tasks(
+    tasks: Dict[str, Callable[[], None]],
+    deps: Dict[str, List[str]],
+    jobs: int = 1,
+    keep_going: bool = False,
+) -> List[TaskResult]:
+    """Run ``tasks`` concurrently, each one after the tasks it depends on.
+
+    When a task fails and ``keep_going`` is False no new task is started:
+    running tasks are waited for and every other task is skipped. With
+    ``keep_going`` only the tasks depending, directly or not, on a failed
+    task are skipped.
+
+    Args:
+        tasks (Dict[str, Callable[[], None]]): The task callables by name.
+        deps (Dict[str, List[str]]): The names of the tasks each task depends on.
+                                     Names that are not tasks are ignored.
+        jobs (int): Maximum number of tasks running at the same time.
+        keep_going (bool): Keep running the tasks that do not depend on a failure.
+
+    Returns:
+        List[TaskResult]: The result of every task, in dependency order.
+
+    Raises:
+        CycleError: If the dependencies contain a cycle.
+    """
+    deps = {
+        name: [d for d in dict.fromkeys(deps.get(name, [])) if d in tasks]
+        for name in tasks
+    }
+    order = topological_order(deps)
+    position = {name: i for i, name in enumerate(order)}
+    remaining = {name: len(deps[name]) for name in order}
+    dependents: Dict[str, List[str]] = {name: [] for name in order}
+    for name in order:
+        for d in deps[name]:
+            dependents[d].append(name)
+
+    # Ready tasks start in dependency order
+    ready = [position[name] for name in order if remaining[name] == 0]
+    heapq.heapify(ready)
+    results: Dict[str, TaskResult] = {}
+    running: Dict[Future, str] = {}
+    starts: Dict[str, float] = {}
+    stop = False
+
+    def skip_dependents(name: str) -> None:
+        stack = [name]
+        while stack:
+            for dependent in dependents[stack.pop()]:
+                if dependent not in results:
+                    results[dependent] = TaskResult(dependent, TaskStatus.SKIPPED)
+                    stack.append(dependent)
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        while True:
+            while ready and not stop and len(running) < jobs:
+                name = order[heapq.heappop(ready)]
+                starts[name] = time.perf_counter()
+                running[executor.submit(_timed, tasks[name])] = name
+
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    results[name] = TaskResult(name, TaskStatus.OK, future.result())
+                except Exception as e:
+                    elapsed = time.perf_counter() - starts[name]
+                    error = str(e) or type(e).__name__
+                    results[name] = TaskResult(name, TaskStatus.FAILED, elapsed, error)
+                    skip_dependents(name)
+                    stop = stop or not keep_going
+                    continue
+                for dependent in dependents[name]:
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0 and dependent not in results:
+                        heapq.heappush(ready, position[dependent])
+
+    return [results.get(name, TaskResult(name, TaskStatus.SKIPPED)) for name in order]
@@ -0,0 +1,57 @@
+import pathlib as pl
+
+import typer
+
+from tigr81.commands.core.package_manager import PackageManager
+
+
+class UvPM(PackageManager):
+    """A utility class for managing Python dependencies using uv.
+
+    uv resolves and installs much faster than Poetry and reads the same
+    pyproject.toml metadata, with its own uv.lock lock file.
+    """
+
+    name = "uv"
+
+    def install(self, cwd: pl.Path) -> None:
+        """Installs dependencies in the specified working directory using `uv sync`.
+
+        Args:
+            cwd (pl.Path): The path to the working directory where `uv sync`
+                           should be executed.
+        """
+        typer.echo(f"Installing component {cwd}...")
+        self._run(["sync"], cwd=cwd)
+
+    def remove(self, cwd: pl.Path, dependency: str) -> None:
+        """Removes a specified dependency from the working directory using uv.
+
+        Args:
+            cwd (pl.Path): The path to the working directory where `uv remove`
+                           should be executed.
+            dependency (str): The name of the dependency to remove.
+        """
+        typer.echo(f"Removing dependency {dependency} from {cwd}...")
+        self._run(["remove", dependency], cwd=cwd)
+
+    def add_path_dependency(self, cwd: pl.Path, path: pl.Path) -> None:
+        """Adds a local project as an editable dependency using uv.
+
+        Args:
+            cwd (pl.Path): The path to the working directory where `uv add`
+                           should be executed.
+            path (pl.Path): The path of the dependency, relative to ``cwd``.
+        """
+        typer.echo(f"Adding path dependency {path} to {cwd}...")
+        self._run(["add", "--editable", str(path)], cwd=cwd)
+
+    def lock(self, cwd: pl.Path) -> None:
+        """Updates the uv.lock file of the working directory.
+
+        Args:
+            cwd (pl.Path): The path to the working directory where `uv lock`
+                           should be executed.
+        """
+        typer.echo(f"Locking {cwd}...")
+        self._run(["lock"], cwd=cwd)
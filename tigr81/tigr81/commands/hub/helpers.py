@@ -1,22 +1,32 @@
 import pathlib as pl
-from typing import Dict, List
-
-import typer
+from typing import Dict, List, Optional
 
+import tigr81.utils as tigr81_utils
 from tigr81 import AVAILABLE_HUBS
-from tigr81.commands.hub.models import Hub, HubTemplate
+from tigr81.commands.hub.index import HubIndex
+from tigr81.commands.hub.models import Hub
 
 
-def load_hubs(hub_folders: List[pl.Path] = AVAILABLE_HUBS) -> Dict[str, Hub]:
+def load_hubs(
+    hub_folders: List[pl.Path] = AVAILABLE_HUBS, use_cache: Optional[bool] = None
+) -> Dict[str, Hub]:
     """Load hub configurations from specified YAML files in given folders.
 
     Args:
         hub_folders (List[pl.Path]): A list of paths to directories containing hub YAML files.
                                        Defaults to AVAILABLE_HUBS.
+        use_cache (Optional[bool]): Whether to go through the on-disk hub index, so that
+                                    only changed hub files are parsed and validated.
+                                    Defaults to tigr81_utils.is_cache_enabled().
 
     Returns:
         Dict[str, Hub]: A dictionary mapping hub names to Hub objects.
     """
+    if use_cache is None:
+        use_cache = tigr81_utils.is_cache_enabled()
+    if use_cache:
+        return HubIndex().load(hub_folders)
+
     hubs = {}
     for hub_folder in hub_folders:
         for hub_path in hub_folder.glob("*.yml"):
@@ -25,49 +35,71 @@ def load_hubs(hub_folders: List[pl.Path] = AVAILABLE_HUBS) -> Dict[str, Hub]:
     return hubs
 
 
-def is_hub_name_valid(
+def find_hub_path(
     hub_name: str, hub_folders: List[pl.Path] = AVAILABLE_HUBS
-) -> bool:
-    """Check if a hub name is valid by determining if it exists in the loaded hubs.
+) -> Optional[pl.Path]:
+    """Find the YAML file of a hub following the ``<hub_name>.yml`` naming of Hub.to_yaml.
+
+    Folders are searched from last to first, as later folders take precedence in load_hubs.
 
     Args:
-        hub_name (str): The name of the hub to check.
+        hub_name (str): The name of the hub to find.
         hub_folders (List[pl.Path]): A list of paths to directories containing hub YAML files.
                                        Defaults to AVAILABLE_HUBS.
 
     Returns:
-        bool: True if the hub name is not found in the loaded hubs, False otherwise.
+        Optional[pl.Path]: The path of the hub YAML file, or None if there is no such file.
     """
-    hubs = load_hubs(hub_folders)
-    return hub_name not in hubs
+    for hub_folder in reversed(hub_folders):
+        hub_path = hub_folder / f"{hub_name}.yml"
+        if hub_path.is_file():
+            return hub_path
+    return None
 
 
-def get_template_from_hubs(
-    hub_name: str, template_name: str, hubs: Dict[str, Hub]
-) -> HubTemplate:
-    """Retrieve a hub template by name from a specified hub.
+def load_hub(
+    hub_name: str,
+    hub_folders: List[pl.Path] = AVAILABLE_HUBS,
+    use_cache: Optional[bool] = None,
+) -> Optional[Hub]:
+    """Load a single hub by name, reading only its own YAML file or index entry.
+
+    Every hub file is loaded only if the hub is not stored in a file named after it.
 
     Args:
-        hub_name (str): The name of the hub from which to retrieve the template.
-        template_name (str): The name of the template to retrieve.
-        hubs (Dict[str, Hub]): A dictionary of loaded hubs.
+        hub_name (str): The name of the hub to load.
+        hub_folders (List[pl.Path]): A list of paths to directories containing hub YAML files.
+                                       Defaults to AVAILABLE_HUBS.
+        use_cache (Optional[bool]): Whether to go through the on-disk hub index.
+                                    Defaults to tigr81_utils.is_cache_enabled().
 
     Returns:
-        HubTemplate: The requested HubTemplate object.
-
-    Raises:
-        typer.Exit: If the hub name or template name is not found, an error message is printed
-                     and the program exits.
+        Optional[Hub]: The hub, or None if no hub with this name exists.
     """
-    hub = hubs.get(hub_name)
-    if not hub:
-        typer.echo(f"Hub name not found: {hub_name}")
-        raise typer.Exit()
+    if use_cache is None:
+        use_cache = tigr81_utils.is_cache_enabled()
+
+    hub_path = find_hub_path(hub_name, hub_folders)
+    if hub_path is not None:
+        hub = HubIndex().get(hub_path) if use_cache else Hub.from_yaml(hub_path)
+        if hub.name == hub_name:
+            return hub
 
-    template = hub.hub_templates.get(template_name)
+    return load_hubs(hub_folders, use_cache=use_cache).get(hub_name)
 
-    if not template:
-        typer.echo(f"Hub template {template_name} not found in hub {hub_name}")
-        raise typer.Exit()
 
-    return template
+def is_hub_name_valid(
+    hub_name: str, hub_folders: List[pl.Path] = AVAILABLE_HUBS
+) -> bool:
+    """Check if a hub name is valid by determining if it exists in the loaded hubs.
+
+    Args:
+        hub_name (str): The name of the hub to check.
+        hub_folders (List[pl.Path]): A list of paths to directories containing hub YAML files.
+                                       Defaults to AVAILABLE_HUBS.
+
+    Returns:
+        bool: True if the hub name is not found in the loaded hubs, False otherwise.
+    """
+    hubs = load_hubs(hub_folders)
+    return hub_name not in hubs
@@ -8,26 +8,57 @@
 """
 
 import pathlib as pl
-from typing import Optional, Tuple
+import re
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
 
-import copier
 import typer
-from cookiecutter.main import cookiecutter
 from typing_extensions import Annotated
 
+import tigr81.commands.core.archive as archive
 import tigr81.commands.core.gitw as gitw
+import tigr81.commands.core.mirror as mirror
+import tigr81.commands.core.refs as refs
 import tigr81.utils as tigr81_utils
-from tigr81 import DEFAULT_HUB_LOCATION, USER_HUB_LOCATION
+from tigr81 import AVAILABLE_HUBS, USER_HUB_LOCATION
 from tigr81.commands.hub.helpers import (
-    get_template_from_hubs,
     is_hub_name_valid,
+    load_hub,
     load_hubs,
 )
-from tigr81.commands.hub.models import Hub, HubTemplate, TemplateTypeEnum
+from tigr81.commands.hub.index import HubIndex
+from tigr81.commands.hub.models import (
+    BatchScaffoldItem,
+    Hub,
+    HubLock,
+    HubTemplate,
+    LockedTemplate,
+    TemplateTypeEnum,
+)
+from tigr81.commands.scaffold.project_template import ProjectTypeEnum
 
 app = typer.Typer()
 
-default_hub = Hub.from_yaml(path=DEFAULT_HUB_LOCATION)
+COMMIT_SHA_REGEX = re.compile(r"^[0-9a-f]{40}$")
+
+
+class BatchScaffoldResult(NamedTuple):
+    """Outcome of scaffolding one item of a batch.
+
+    Attributes:
+        item (BatchScaffoldItem): The scaffolded batch item.
+        ok (bool): Whether the item was scaffolded successfully.
+        elapsed (float): Time spent rendering the item, in seconds.
+        error (Optional[str]): The error message if the item failed.
+    """
+
+    item: BatchScaffoldItem
+    ok: bool
+    elapsed: float
+    error: Optional[str] = None
 
 
 def _resolve_checkout_directory(
@@ -44,6 +75,111 @@ def _resolve_checkout_directory(
     return resolved_checkout, resolved_directory
 
 
+def _scaffold_batch_item(
+    item: BatchScaffoldItem,
+    hub_template: HubTemplate,
+    source: str,
+    use_render_cache: bool = True,
+    hardlink: bool = False,
+    template_dir: Optional[pl.Path] = None,
+) -> BatchScaffoldResult:
+    """Scaffold one batch item without prompting; runs in a worker process."""
+    import tigr81.commands.core.scaffold as scaffold_core
+
+    start = time.perf_counter()
+    try:
+        scaffold_core.scaffold_hub_template(
+            hub_template,
+            default=True,
+            output_dir=item.output_dir,
+            source=source,
+            use_render_cache=use_render_cache,
+            hardlink=hardlink,
+            template_dir=template_dir,
+        )
+    except BaseException as e:
+        return BatchScaffoldResult(
+            item=item,
+            ok=False,
+            elapsed=time.perf_counter() - start,
+            error=str(e) or type(e).__name__,
+        )
+    return BatchScaffoldResult(item=item, ok=True, elapsed=time.perf_counter() - start)
+
+
+def _pin_hub_template(
+    hub_template: HubTemplate, hub_lock: Optional[HubLock]
+) -> Tuple[HubTemplate, Optional[str]]:
+    """Check out the commit locked for a hub template, from the local mirror.
+
+    Returns:
+        Tuple[HubTemplate, Optional[str]]: The template with its checkout replaced
+        by the locked commit and the source to read it from, or the template
+        unchanged and None if it is not locked.
+    """
+    commit = hub_lock.get_commit(hub_template) if hub_lock is not None else None
+    if commit is None:
+        return hub_template, None
+    return (
+        hub_template.model_copy(update={"checkout": commit}),
+        mirror.resolve_commit_source(hub_template.template, commit),
+    )
+
+
+def _resolve_latest_checkout(hub_template: HubTemplate) -> HubTemplate:
+    """Replace the ``latest`` checkout of a remote template with its latest tag.
+
+    Raises:
+        typer.Exit: If the tags of the template cannot be listed.
+    """
+    if hub_template.checkout != refs.LATEST_CHECKOUT or not _is_git_remote(hub_template):
+        return hub_template
+    pair = (str(hub_template.template), hub_template.checkout)
+    try:
+        checkout = refs.resolve_checkouts([pair])[pair]
+    except subprocess.CalledProcessError as e:
+        typer.echo(f"Could not list the tags of {e.cmd[-1]}: {e.stderr}")
+        raise typer.Exit(code=1) from None
+    typer.echo(f"Resolved {refs.LATEST_CHECKOUT} to {checkout}")
+    return hub_template.model_copy(update={"checkout": checkout})
+
+
+def _prefetch_locked_commit(locked: LockedTemplate) -> Optional[str]:
+    """Fetch a locked commit into the mirror of its template.
+
+    Returns:
+        Optional[str]: Why the commit could not be fetched, None if it was.
+    """
+    source = mirror.resolve_commit_source(locked.template, locked.commit)
+    if (
+        source == locked.template
+        and tigr81_utils.is_cache_enabled()
+        and mirror.is_remote_repo(locked.template)
+    ):
+        return f"could not fetch {locked.commit[:12]} into the mirror of {locked.template}"
+    return None
+
+
+def _is_git_remote(hub_template: HubTemplate) -> bool:
+    """Whether a hub template is read from a remote git repository."""
+    return hub_template.template_type not in (
+        TemplateTypeEnum.ARCHIVE,
+        TemplateTypeEnum.LOCAL,
+    ) and mirror.is_remote_repo(hub_template.template)
+
+
+def _ls_remote(repo_url: str) -> Union[Dict[str, str], Exception]:
+    try:
+        return refs.ls_remote(repo_url, ttl=0)
+    except (OSError, subprocess.CalledProcessError) as e:
+        return e
+
+
+def _user_hub_path(hub_name: str) -> pl.Path:
+    """The YAML file Hub.to_yaml writes a user hub to, also used as its lock."""
+    return USER_HUB_LOCATION / f"{hub_name}.yml"
+
+
 def _add_template_cli(
     hub_name: str,
     template_name: str,
@@ -51,28 +187,34 @@ def _add_template_cli(
     template_type: TemplateTypeEnum,
     checkout: Optional[str],
     directory: Optional[str],
+    sha256: Optional[str] = None,
 ) -> None:
     """Add one template from CLI flags; create the hub YAML under ~/.tigr81rc if needed."""
-    hubs = load_hubs()
-    selected_hub = hubs.get(hub_name)
-    if selected_hub is None:
-        selected_hub = Hub(name=hub_name, hub_templates={})
-    elif template_name in selected_hub.hub_templates:
-        typer.echo(
-            f"Template '{template_name}' already exists in hub '{hub_name}'."
-        )
-        raise typer.Exit(1)
-
-    co, di = _resolve_checkout_directory(template, checkout, directory)
+    if template_type == TemplateTypeEnum.ARCHIVE:
+        co, di = None, directory
+    else:
+        co, di = _resolve_checkout_directory(template, checkout, directory)
     hub_template = HubTemplate(
         name=template_name,
         template=template,
         checkout=co,
         directory=di,
         template_type=template_type,
+        sha256=sha256,
     )
-    selected_hub.hub_templates[template_name] = hub_template
-    selected_hub.to_yaml(USER_HUB_LOCATION)
+
+    with tigr81_utils.file_lock(_user_hub_path(hub_name)):
+        selected_hub = load_hubs().get(hub_name)
+        if selected_hub is None:
+            selected_hub = Hub(name=hub_name, hub_templates={})
+        elif template_name in selected_hub.hub_templates:
+            typer.echo(
+                f"Template '{template_name}' already exists in hub '{hub_name}'."
+            )
+            raise typer.Exit(1)
+
+        selected_hub.hub_templates[template_name] = hub_template
+        selected_hub.to_yaml(USER_HUB_LOCATION)
     typer.echo(
         f"Template '{template_name}' added to hub '{hub_name}' (saved under {USER_HUB_LOCATION})."
     )
@@ -84,7 +226,7 @@ def _interactive_add_to_hub(hub_name: str) -> None:
     if len(hubs) == 0:
         typer.echo(
             "No hubs were found. To create a hub with a template in one step, use:\n"
-            "  tigr81 hub add HUB_NAME TEMPLATE_NAME --template URL --type cookiecutter|copier|raw_git"
+            "  tigr81 hub add HUB_NAME TEMPLATE_NAME --template URL --type cookiecutter|copier|raw_git|archive|local"
         )
         raise typer.Exit(1)
 
@@ -94,29 +236,50 @@ def _interactive_add_to_hub(hub_name: str) -> None:
         raise typer.Exit(1)
 
     typer.echo(f"Adding templates to hub '{hub_name}'...")
-    added_any = False
+    added = {}
     while typer.confirm("Do you want to add a template?", default=True):
         hub_template = HubTemplate.prompt()
-        if hub_template.name in selected_hub.hub_templates:
+        if hub_template.name in selected_hub.hub_templates or hub_template.name in added:
             typer.echo(
                 f"Template '{hub_template.name}' already exists in hub '{hub_name}'."
             )
             raise typer.Exit(1)
-        selected_hub.hub_templates[hub_template.name] = hub_template
-        added_any = True
+        added[hub_template.name] = hub_template
         typer.echo(f"Template '{hub_template.name}' added to hub '{hub_name}'.")
 
-    if not added_any:
+    if not added:
         typer.echo("No templates added.")
         return
 
-    selected_hub.to_yaml(USER_HUB_LOCATION)
+    # The hub is read again under the lock, as another process may have updated it
+    # while prompting
+    with tigr81_utils.file_lock(_user_hub_path(hub_name)):
+        selected_hub = load_hubs().get(hub_name, selected_hub)
+        conflicts = [name for name in added if name in selected_hub.hub_templates]
+        if conflicts:
+            typer.echo(
+                f"Templates {tigr81_utils.pretty_list(conflicts)} were added to hub "
+                f"'{hub_name}' meanwhile."
+            )
+            raise typer.Exit(1)
+        selected_hub.hub_templates.update(added)
+        selected_hub.to_yaml(USER_HUB_LOCATION)
     typer.echo(f"Hub '{hub_name}' saved successfully.")
 
 
 @app.callback()
-def callback():
+def callback(
+    no_cache: Annotated[
+        bool,
+        typer.Option(
+            "--no-cache",
+            help="Bypass the tigr81 caches, e.g. the hub index (same as TIGR81_NO_CACHE=1)",
+        ),
+    ] = False,
+):
     """Handle hub templates."""
+    if no_cache:
+        tigr81_utils.disable_cache()
 
 
 @app.command()
@@ -138,14 +301,14 @@ def add(
         typer.Option(
             "--template",
             "-t",
-            help="Git URL or local path to the template",
+            help="Git URL, archive URL or local path to the template",
         ),
     ] = None,
     template_type: Annotated[
         Optional[TemplateTypeEnum],
         typer.Option(
             "--type",
-            help="Template backend: cookiecutter, copier, or raw_git",
+            help="Template backend: cookiecutter, copier, raw_git, archive, or local",
             case_sensitive=False,
         ),
     ] = None,
@@ -165,6 +328,13 @@ def add(
             help="Path inside the repo for remote templates (default: .)",
         ),
     ] = None,
+    sha256: Annotated[
+        Optional[str],
+        typer.Option(
+            "--sha256",
+            help="Expected SHA-256 of the archive, for archive templates",
+        ),
+    ] = None,
 ):
     """Add a new hub, or add template(s) to a hub.
 
@@ -186,12 +356,13 @@ def add(
             template_type=template_type,
             checkout=checkout,
             directory=directory,
+            sha256=sha256,
         )
         return
 
     cli_partial = any(
         x is not None
-        for x in (template_name, template, template_type, checkout, directory)
+        for x in (template_name, template, template_type, checkout, directory, sha256)
     )
     if hub_name is not None and cli_partial:
         typer.echo(
@@ -207,12 +378,158 @@ def add(
 
     hub = Hub.prompt()
 
-    if not is_hub_name_valid(hub.name):
-        typer.echo(
-            f"The hub name {hub.name} is not valid. Already present hub with this name."
+    with tigr81_utils.file_lock(_user_hub_path(hub.name)):
+        if not is_hub_name_valid(hub.name):
+            typer.echo(
+                f"The hub name {hub.name} is not valid. Already present hub with this name."
+            )
+            raise typer.Exit(1)
+        hub.to_yaml(USER_HUB_LOCATION)
+
+
+@app.command()
+def reindex():
+    """Rebuild the hub index cache from every hub file."""
+    hubs = HubIndex().rebuild(AVAILABLE_HUBS)
+    typer.echo(f"Indexed {len(hubs)} hubs.")
+
+
+@app.command()
+def refresh(
+    hub_name: Annotated[
+        Optional[str],
+        typer.Argument(help="The hub to refresh, every hub and project type by default"),
+    ] = None,
+    jobs: Annotated[
+        int,
+        typer.Option(
+            "--jobs",
+            "-j",
+            min=1,
+            help="Maximum number of repositories listed concurrently",
+        ),
+    ] = 8,
+):
+    """Refresh the cached tags and branches of the remote templates.
+
+    Later scaffolds resolve their checkouts, e.g. the latest tag, from the
+    cache without hitting the network until it expires (TIGR81_REFS_TTL).
+    """
+    if hub_name is None:
+        hubs = load_hubs()
+    else:
+        hub = load_hub(hub_name)
+        if hub is None:
+            typer.echo(f"The hub name '{hub_name}' does not exist.")
+            raise typer.Exit(code=1)
+        hubs = {hub_name: hub}
+
+    repo_urls = [
+        str(hub_template.template)
+        for hub in hubs.values()
+        for hub_template in hub.hub_templates.values()
+        if _is_git_remote(hub_template)
+    ]
+    if hub_name is None:
+        repo_urls += [project_type.project_location for project_type in ProjectTypeEnum]
+
+    errors = refs.refresh(repo_urls, jobs=jobs)
+    for repo_url, error in errors.items():
+        status = "OK" if error is None else "FAILED"
+        typer.echo(f"{status:<6} {repo_url}" + (f"  ({error})" if error else ""))
+
+    failed = sum(error is not None for error in errors.values())
+    typer.echo(f"{len(errors) - failed} refreshed, {failed} failed.")
+    if failed:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def lock(
+    hub_name: Annotated[str, typer.Argument(help="The name of the hub to lock")],
+    jobs: Annotated[
+        int,
+        typer.Option(
+            "--jobs",
+            "-j",
+            min=1,
+            help="Maximum number of repositories resolved and fetched concurrently",
+        ),
+    ] = 8,
+):
+    """Pin the checkout of every remote template of a hub to a commit.
+
+    The commits are stored in ~/.tigr81rc/hubs/<hub>.lock and fetched into the
+    local mirrors: later scaffolds of the hub check them out from the mirrors,
+    without any network round trip and with identical output, until the hub
+    is locked again. Templates whose location or checkout changed since they
+    were locked are scaffolded as usual.
+    """
+    hub = load_hub(hub_name)
+    if hub is None:
+        typer.echo(f"The hub name '{hub_name}' does not exist.")
+        raise typer.Exit(code=1)
+
+    remote_templates = [
+        hub_template
+        for hub_template in hub.hub_templates.values()
+        if _is_git_remote(hub_template)
+    ]
+    repo_urls = [*dict.fromkeys(str(t.template) for t in remote_templates)]
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        listed = dict(enumerate(executor.map(_ls_remote, repo_urls)))
+    remote_refs = {repo_url: listed[i] for i, repo_url in enumerate(repo_urls)}
+
+    hub_lock = HubLock(hub=hub_name)
+    errors = []
+    for hub_template in remote_templates:
+        repo_url = str(hub_template.template)
+        checkout = hub_template.checkout or "main"
+        if isinstance(remote_refs[repo_url], Exception):
+            errors.append(f"{hub_template.name}: {remote_refs[repo_url]}")
+            continue
+        if checkout == refs.LATEST_CHECKOUT:
+            checkout = refs.find_latest_tag(remote_refs[repo_url]) or "main"
+        commit = (
+            checkout
+            if COMMIT_SHA_REGEX.match(checkout)
+            else refs.find_ref(remote_refs[repo_url], checkout)
         )
-        raise typer.Exit(1)
-    hub.to_yaml(USER_HUB_LOCATION)
+        if commit is None:
+            errors.append(f"{hub_template.name}: '{checkout}' not found in {repo_url}")
+            continue
+        hub_lock.templates[hub_template.name] = LockedTemplate(
+            template=repo_url, checkout=hub_template.checkout, commit=commit
+        )
+        typer.echo(f"{hub_template.name:<20} {checkout} -> {commit[:12]}")
+
+    if errors:
+        typer.echo("Could not lock the hub:\n" + "\n".join(errors))
+        raise typer.Exit(code=1)
+
+    # Fetch the pinned commits now, so that scaffolds do not have to
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        fetches = {
+            name: executor.submit(_prefetch_locked_commit, locked)
+            for name, locked in hub_lock.templates.items()
+        }
+    for name, fetch in fetches.items():
+        try:
+            error = fetch.result()
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        if error is not None:
+            errors.append(f"{name}: {error}")
+
+    if errors:
+        typer.echo("Could not fetch the locked commits:\n" + "\n".join(errors))
+        raise typer.Exit(code=1)
+
+    with tigr81_utils.file_lock(HubLock.get_path(hub_name)):
+        hub_lock.to_yaml()
+    typer.echo(
+        f"Locked {len(hub_lock.templates)} templates in {HubLock.get_path(hub_name)}."
+    )
 
 
 @app.command()
@@ -222,19 +539,20 @@ def list(  # noqa: A001
     ] = "all",
 ):
     """List all hub templates."""
-    hubs = load_hubs()
     if hub_name == "all":
+        hubs = load_hubs()
         typer.echo("Your hub templates are:")
         for hub_name in hubs:
             typer.echo(hub_name)
         return
 
-    if hub_name not in hubs:
+    hub = load_hub(hub_name)
+    if hub is None:
         typer.echo(f"The hub name {hub_name} does not exist")
         raise typer.Exit()
 
     typer.echo(f"Info about hub {hub_name}")
-    typer.echo(hubs[hub_name])
+    typer.echo(hub)
 
 
 @app.command()
@@ -265,24 +583,25 @@ def remove(
     ] = False,
 ):
     """Remove a hub, or remove one template from a hub."""
-    hubs = load_hubs([USER_HUB_LOCATION])
+    if hub_name is None:
+        hubs = load_hubs([USER_HUB_LOCATION])
 
-    if len(hubs) == 0:
-        typer.echo("No hubs were found..")
-        raise typer.Exit()
+        if len(hubs) == 0:
+            typer.echo("No hubs were found..")
+            raise typer.Exit()
 
-    if hub_name is None:
         hub_name = tigr81_utils.create_interactive_prompt(
             values=[*hubs.keys()],
             message="Select a hub",
         )
+        selected_hub = hubs.get(hub_name)
+    else:
+        selected_hub = load_hub(hub_name, [USER_HUB_LOCATION])
 
-    if hub_name not in hubs:
+    if selected_hub is None:
         typer.echo(f"The hub name '{hub_name}' does not exist.")
         raise typer.Exit()
 
-    selected_hub = hubs.get(hub_name)
-
     delete_one_template = template_name is not None or interactive_template
 
     if delete_one_template:
@@ -313,16 +632,30 @@ def remove(
             raise typer.Exit(code=1)
 
         typer.echo(f"Deleting hub template '{hub_template_name_to_delete}'...")
-        selected_hub.hub_templates.pop(hub_template_name_to_delete)
-
-        selected_hub.to_yaml(USER_HUB_LOCATION)
+        with tigr81_utils.file_lock(_user_hub_path(hub_name)):
+            selected_hub = load_hub(hub_name, [USER_HUB_LOCATION])
+            if selected_hub is None or selected_hub.hub_templates.pop(
+                hub_template_name_to_delete, None
+            ) is None:
+                typer.echo(
+                    f"The hub template '{hub_template_name_to_delete}' was removed "
+                    f"from hub '{hub_name}' meanwhile."
+                )
+                raise typer.Exit(code=1)
+            selected_hub.to_yaml(USER_HUB_LOCATION)
         typer.echo(
             f"Hub template '{hub_template_name_to_delete}' deleted successfully."
         )
     else:
-        hub_path = USER_HUB_LOCATION / f"{hub_name}.yml"
+        hub_path = _user_hub_path(hub_name)
         typer.echo(f"Deleting hub '{hub_name}'...")
-        hub_path.unlink()
+        hub_lock_path = HubLock.get_path(hub_name)
+        with tigr81_utils.file_lock(hub_path), tigr81_utils.file_lock(hub_lock_path):
+            hub_path.unlink(missing_ok=True)
+            hub_lock_path.unlink(missing_ok=True)
+        # Released first, as open files cannot be deleted on Windows
+        for path in (hub_path, hub_lock_path):
+            tigr81_utils.lock_file_path(path).unlink(missing_ok=True)
         typer.echo(f"Hub '{hub_name}' deleted successfully.")
 
 
@@ -344,17 +677,42 @@ def scaffold(
     default: bool = typer.Option(
         default=False, help="Set to False to enable input during cookiecutter execution"
     ),
+    ignore_lock: Annotated[
+        bool,
+        typer.Option(
+            "--ignore-lock",
+            help="Scaffold the checkout of the template rather than its locked commit",
+        ),
+    ] = False,
+    no_render_cache: Annotated[
+        bool,
+        typer.Option(
+            "--no-render-cache",
+            help="Render the template even if an identical render is cached",
+        ),
+    ] = False,
+    hardlink: Annotated[
+        bool,
+        typer.Option(
+            "--hardlink",
+            help="Hard link the files of local templates instead of copying them "
+            "(the scaffolded files then share their content with the template)",
+        ),
+    ] = False,
 ):
     """Scaffold a template from an existing hub templates."""
-    hubs = load_hubs()
+    import tigr81.commands.core.scaffold as scaffold_core
 
-    if not hub_name:
+    if hub_name:
+        selected_hub = load_hub(hub_name)
+    else:
+        hubs = load_hubs()
         hub_name = tigr81_utils.create_interactive_prompt(
             values=[*hubs.keys()],
             message="Select the hub from which to scaffold the template",
         )
+        selected_hub = hubs.get(hub_name)
 
-    selected_hub = hubs.get(hub_name)
     if not selected_hub:
         typer.echo(f"Hub '{hub_name}' not found.")
         raise typer.Exit(code=1)
@@ -370,32 +728,224 @@ def scaffold(
         typer.echo(f"Template '{template_name}' not found in hub '{hub_name}'.")
         raise typer.Exit(code=1)
 
-    hub_template = get_template_from_hubs(
-        hub_name=hub_name, template_name=template_name, hubs=hubs
+    hub_lock = None if ignore_lock else HubLock.from_yaml(HubLock.get_path(hub_name))
+    hub_template, source = _pin_hub_template(hub_template, hub_lock)
+    if source is not None:
+        typer.echo(f"Scaffolding the locked commit {hub_template.checkout[:12]}")
+    else:
+        hub_template = _resolve_latest_checkout(hub_template)
+
+    typer.echo(f"Scaffolding template type: {hub_template.template_type}")
+    scaffold_core.scaffold_hub_template(
+        hub_template,
+        default=default,
+        output_dir=output_dir,
+        source=source,
+        use_render_cache=not no_render_cache,
+        hardlink=hardlink,
     )
-    _template_type = hub_template.template_type
-    typer.echo(f"Scaffolding template type: {_template_type}")
-    if _template_type == TemplateTypeEnum.COOKIECUTTER:
-        cookiecutter(
-            template=hub_template.template,
-            output_dir=output_dir,
-            no_input=default,
-            checkout=hub_template.checkout,
-            directory=hub_template.directory,
+
+
+@app.command(name="scaffold-many")
+def scaffold_many(
+    items: Annotated[
+        Optional[List[str]],
+        typer.Argument(help="Templates to scaffold, as HUB/TEMPLATE=OUTPUT_DIR"),
+    ] = None,
+    spec: Annotated[
+        Optional[pl.Path],
+        typer.Option(
+            "--spec",
+            "-s",
+            help="YAML file listing the hub, template and output_dir of each item",
+        ),
+    ] = None,
+    jobs: Annotated[
+        int,
+        typer.Option(
+            "--jobs",
+            "-j",
+            min=1,
+            help="Maximum number of templates fetched and rendered concurrently",
+        ),
+    ] = 4,
+    no_render_cache: Annotated[
+        bool,
+        typer.Option(
+            "--no-render-cache",
+            help="Render the template even if an identical render is cached",
+        ),
+    ] = False,
+    hardlink: Annotated[
+        bool,
+        typer.Option(
+            "--hardlink",
+            help="Hard link the files of local templates instead of copying them "
+            "(the scaffolded files then share their content with the template)",
+        ),
+    ] = False,
+):
+    """Scaffold many hub templates concurrently, without prompting.
+
+    Example: tigr81 hub scaffold-many my-hub/api=services/api my-hub/web=services/web -j 8
+    """
+    try:
+        batch = [BatchScaffoldItem.parse(item) for item in items or []]
+        if spec is not None:
+            batch += BatchScaffoldItem.from_yaml(spec)
+    except ValueError as e:
+        typer.echo(str(e))
+        raise typer.Exit(code=1) from None
+
+    if not batch:
+        typer.echo("Nothing to scaffold: pass HUB/TEMPLATE=OUTPUT_DIR items or --spec.")
+        raise typer.Exit(code=1)
+
+    hubs = load_hubs()
+    work = []
+    for item in batch:
+        selected_hub = hubs.get(item.hub)
+        hub_template = selected_hub.hub_templates.get(item.template) if selected_hub else None
+        if hub_template is None:
+            typer.echo(f"Template '{item.template}' not found in hub '{item.hub}'.")
+            raise typer.Exit(code=1)
+        work.append((item, hub_template))
+
+    # Templates locked with `hub lock` are scaffolded at their locked commit
+    hub_locks = {item.hub: HubLock.from_yaml(HubLock.get_path(item.hub)) for item in batch}
+    commits = [
+        hub_locks[item.hub].get_commit(hub_template) if hub_locks[item.hub] else None
+        for item, hub_template in work
+    ]
+
+    # Resolve the 'latest' checkouts of every distinct template once, concurrently
+    try:
+        checkouts = refs.resolve_checkouts(
+            [
+                (str(hub_template.template), hub_template.checkout)
+                for i, (_, hub_template) in enumerate(work)
+                if commits[i] is None
+                and hub_template.checkout
+                and _is_git_remote(hub_template)
+            ],
+            jobs=jobs,
         )
-    elif _template_type == TemplateTypeEnum.RAW_GIT:
-        gitw.clone_repo_directory(
-            repo_url=hub_template.template,
-            output_dir=output_dir,
-            directory=hub_template.directory,
-            checkout=hub_template.checkout,
+    except subprocess.CalledProcessError as e:
+        typer.echo(f"Could not list the tags of {e.cmd[-1]}: {e.stderr}")
+        raise typer.Exit(code=1) from None
+    for i, (item, hub_template) in enumerate(work):
+        checkout = commits[i] or checkouts.get(
+            (str(hub_template.template), hub_template.checkout)
         )
-    elif _template_type == TemplateTypeEnum.COPIER:
-        copier.run_copy(
-            src_path=hub_template.template,
-            dst_path=output_dir,
-            vcs_ref=hub_template.checkout,
-            defaults=default,
+        if checkout is not None:
+            work[i] = (item, hub_template.model_copy(update={"checkout": checkout}))
+
+    # Fetch every distinct template, locked commit, or archive, once, concurrently
+    fetch_keys = [
+        (
+            str(hub_template.template),
+            commits[i],
+            hub_template.template_type == TemplateTypeEnum.ARCHIVE,
         )
-    else:
-        raise ValueError("Unknown template type")
+        for i, (_, hub_template) in enumerate(work)
+    ]
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        fetches = {
+            key: executor.submit(archive.resolve_archive_source, key[0])
+            if key[2]
+            else executor.submit(mirror.resolve_commit_source, key[0], key[1])
+            if key[1] is not None
+            else executor.submit(mirror.resolve_template_source, key[0])
+            for key in dict.fromkeys(fetch_keys)
+        }
+        # A template that cannot be fetched only fails the items scaffolding it
+        sources, errors = {}, {}
+        for key, fetch in fetches.items():
+            try:
+                sources[key] = fetch.result()
+            except Exception as e:
+                errors[key] = f"Could not fetch the template: {str(e) or type(e).__name__}"
+    item_errors = {i: errors[key] for i, key in enumerate(fetch_keys) if key in errors}
+
+    with tempfile.TemporaryDirectory(prefix="tigr81-") as tmp_dir:
+        # Cookiecutter clones every repository into the same folder, deleting
+        # the previous clone: concurrent renders get their own exported copy
+        export_keys = [
+            (str(hub_template.template), hub_template.checkout, hub_template.directory, fetch_keys[i])
+            if hub_template.template_type == TemplateTypeEnum.COOKIECUTTER
+            and _is_git_remote(hub_template)
+            and i not in item_errors
+            else None
+            for i, (_, hub_template) in enumerate(work)
+        ]
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            exports = {
+                key: (
+                    pl.Path(tmp_dir) / str(n),
+                    executor.submit(
+                        gitw.export_repo_directory,
+                        repo_url=key[0],
+                        checkout=key[1] or "HEAD",
+                        directory=pl.Path(key[2] or "."),
+                        output_dir=pl.Path(tmp_dir) / str(n),
+                        source=sources[key[3]],
+                    ),
+                )
+                for n, key in enumerate(k for k in dict.fromkeys(export_keys) if k is not None)
+            }
+        template_dirs = {}
+        for i, key in enumerate(export_keys):
+            if key is None:
+                continue
+            template_dir, export = exports[key]
+            try:
+                export.result()
+                template_dirs[i] = template_dir
+            except Exception as e:
+                item_errors[i] = f"Could not export the template: {str(e) or type(e).__name__}"
+
+        typer.echo(f"Scaffolding {len(batch)} templates with {jobs} workers...")
+        results = []
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            renders = [
+                (
+                    i,
+                    item,
+                    None
+                    if i in item_errors
+                    else executor.submit(
+                        _scaffold_batch_item,
+                        item,
+                        hub_template,
+                        sources[fetch_keys[i]],
+                        not no_render_cache,
+                        hardlink,
+                        template_dirs.get(i),
+                    ),
+                )
+                for i, (item, hub_template) in enumerate(work)
+            ]
+            for i, item, render in renders:
+                if render is None:
+                    results.append(
+                        BatchScaffoldResult(item=item, ok=False, elapsed=0.0, error=item_errors[i])
+                    )
+                    continue
+                try:
+                    results.append(render.result())
+                except Exception as e:
+                    results.append(
+                        BatchScaffoldResult(item=item, ok=False, elapsed=0.0, error=str(e))
+                    )
+
+    for result in results:
+        status = "OK" if result.ok else "FAILED"
+        line = f"{status:<6} {result.elapsed:7.2f}s  {result.item}"
+        if result.error:
+            line += f"  ({result.error})"
+        typer.echo(line)
+
+    failed = sum(not result.ok for result in results)
+    typer.echo(f"{len(results) - failed} succeeded, {failed} failed.")
+    if failed:
+        raise typer.Exit(code=1)
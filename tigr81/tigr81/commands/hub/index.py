@@ -0,0 +1,167 @@
+import functools
+import hashlib
+import json
+import os
+import pathlib as pl
+import pickle
+import shutil
+from typing import Dict, List, NamedTuple, Optional
+
+import pydantic
+
+import tigr81.utils as tigr81_utils
+from tigr81 import USER_CACHE_LOCATION
+from tigr81.commands.hub.models import Hub
+
+HUB_INDEX_LOCATION = USER_CACHE_LOCATION / "hub_index"
+HUB_INDEX_FORMAT = 2
+"""Bumped when the layout of the index files changes."""
+
+
+@functools.lru_cache(maxsize=None)
+def hub_index_version() -> str:
+    """Return the version of the index, derived from the schema of the hub models.
+
+    Indexes written with other models, e.g. before a field was added to
+    HubTemplate, or with another pydantic version are treated as empty, so
+    that pickled hubs always match the classes they are unpickled into.
+
+    Returns:
+        str: A hash of HUB_INDEX_FORMAT, the pydantic version and the Hub schema.
+    """
+    schema = json.dumps(Hub.model_json_schema(), sort_keys=True)
+    payload = f"{HUB_INDEX_FORMAT}:{pydantic.VERSION}:{schema}"
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+class HubIndexEntry(NamedTuple):
+    """An already validated hub together with the stat of the file it came from.
+
+    Attributes:
+        mtime_ns (int): Modification time of the hub YAML file, in nanoseconds.
+        size (int): Size of the hub YAML file, in bytes.
+        hub (Hub): The hub parsed and validated from the file.
+    """
+
+    mtime_ns: int
+    size: int
+    hub: Hub
+
+
+class HubIndex:
+    """On-disk index of validated hubs keyed by hub file path, mtime and size.
+
+    Each hub file has its own pickle, named after the hashes of its folder and
+    file name, so that looking up one hub only unpickles that hub. Only hub
+    files that changed since they were last indexed are parsed and validated
+    again; every other hub is unpickled as is.
+    """
+
+    def __init__(self, path: Optional[pl.Path] = None):
+        """Initializes the index stored in the folder ``path``.
+
+        Entries are read lazily, on the first lookup of their hub file. Missing,
+        unreadable or outdated entries are treated as absent.
+
+        Args:
+            path (Optional[pl.Path]): The folder of the index files.
+                                      Defaults to HUB_INDEX_LOCATION.
+        """
+        self.path = path or HUB_INDEX_LOCATION
+        self.entries: Dict[str, HubIndexEntry] = {}
+
+    @staticmethod
+    def _digest(value: str) -> str:
+        return hashlib.sha256(value.encode()).hexdigest()[:16]
+
+    def _folder_prefix(self, hub_folder: str) -> str:
+        return f"{self._digest(hub_folder)}-"
+
+    def _entry_path(self, key: str) -> pl.Path:
+        folder, name = os.path.split(key)
+        return self.path / f"{self._folder_prefix(folder)}{self._digest(name)}.pickle"
+
+    def _read(self, key: str) -> Optional[HubIndexEntry]:
+        try:
+            with open(self._entry_path(key), "rb") as f:
+                version, entry_key, entry = pickle.load(f)  # noqa: S301
+        except Exception:
+            return None
+        if version != hub_index_version() or entry_key != key:
+            return None
+        return entry
+
+    def _write(self, key: str, entry: HubIndexEntry) -> None:
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            with tigr81_utils.atomic_write(self._entry_path(key), "wb") as f:
+                pickle.dump((hub_index_version(), key, entry), f)
+        except OSError:
+            pass
+
+    def get(self, hub_path: pl.Path) -> Hub:
+        """Return the hub stored in ``hub_path``, revalidating it only if it changed.
+
+        Args:
+            hub_path (pl.Path): Path to the hub YAML file.
+
+        Returns:
+            Hub: The hub defined in the file.
+        """
+        key = str(hub_path.resolve())
+        stat = hub_path.stat()
+        entry = self.entries.get(key) or self._read(key)
+        if entry is None or (entry.mtime_ns, entry.size) != (
+            stat.st_mtime_ns,
+            stat.st_size,
+        ):
+            entry = HubIndexEntry(
+                mtime_ns=stat.st_mtime_ns,
+                size=stat.st_size,
+                hub=Hub.from_yaml(hub_path),
+            )
+            self._write(key, entry)
+        self.entries[key] = entry
+        return entry.hub
+
+    def load(self, hub_folders: List[pl.Path]) -> Dict[str, Hub]:
+        """Load every hub found in ``hub_folders`` through the index.
+
+        Index files of hub files that no longer exist in these folders are deleted.
+
+        Args:
+            hub_folders (List[pl.Path]): Directories containing hub YAML files.
+
+        Returns:
+            Dict[str, Hub]: A dictionary mapping hub names to Hub objects.
+        """
+        hubs = {}
+        for hub_folder in hub_folders:
+            indexed = set()
+            for hub_path in hub_folder.glob("*.yml"):
+                hub = self.get(hub_path)
+                indexed.add(self._entry_path(str(hub_path.resolve())))
+                hubs[hub.name] = hub
+
+            prefix = self._folder_prefix(str(hub_folder.resolve()))
+            for entry_path in self.path.glob(f"{prefix}*.pickle"):
+                if entry_path not in indexed:
+                    entry_path.unlink(missing_ok=True)
+        return hubs
+
+    def rebuild(self, hub_folders: List[pl.Path]) -> Dict[str, Hub]:
+        """Drop every entry and index ``hub_folders`` from scratch.
+
+        Args:
+            hub_folders (List[pl.Path]): Directories containing hub YAML files.
+
+        Returns:
+            Dict[str, Hub]: A dictionary mapping hub names to Hub objects.
+        """
+        self.clear()
+        return self.load(hub_folders)
+
+    def clear(self) -> None:
+        """Drop every entry and delete the index files."""
+        self.entries = {}
+        shutil.rmtree(self.path, ignore_errors=True)
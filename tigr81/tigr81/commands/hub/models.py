@@ -1,11 +1,12 @@
 import pathlib as pl
-from typing import Dict, Optional, Union
+from typing import Dict, List, Optional, Union
 
 import typer
 import yaml
 from pydantic import BaseModel
 
 import tigr81.utils as tigr81_utils
+from tigr81 import USER_HUB_LOCATION
 
 
 class TemplateTypeEnum(tigr81_utils.StrEnum):
@@ -13,6 +14,8 @@ class TemplateTypeEnum(tigr81_utils.StrEnum):
     COOKIECUTTER = "cookiecutter"
     COPIER = "copier"
     RAW_GIT = "raw_git"
+    ARCHIVE = "archive"
+    LOCAL = "local"
 
 
 class HubTemplate(BaseModel):
@@ -22,8 +25,10 @@ class HubTemplate(BaseModel):
         name (str): The name of the template.
         template (Union[str, pl.Path]): Path or URL location of the template.
         checkout (Optional[str]): Specific version or branch if it's a remote template.
-        directory (Optional[str]): Path within the repository if it's a remote template.
+        directory (Optional[str]): Path within the repository if it's a remote template,
+            or within the archive or folder for archive and local templates.
         template_type (TemplateTypeEnum): The type of the template, such as cookiecutter or copier.
+        sha256 (Optional[str]): Expected SHA-256 of the archive for archive templates.
     """
 
     name: str
@@ -31,6 +36,7 @@ class HubTemplate(BaseModel):
     checkout: Optional[str] = None
     directory: Optional[str] = None
     template_type: TemplateTypeEnum
+    sha256: Optional[str] = None
 
     def __str__(self):
         """String representation of the HubTemplate instance, listing the template type, name, location, and optional checkout and directory details.
@@ -45,6 +51,8 @@ class HubTemplate(BaseModel):
         ]
         if self.checkout:
             components.append(f"\tCheckout: {self.checkout}")
+        if self.sha256:
+            components.append(f"\tSHA-256: {self.sha256}")
         if self.directory:
             components.append(f"\tDirectory: {self.directory}\n")
         return "\n".join(components)
@@ -60,7 +68,7 @@ class HubTemplate(BaseModel):
             values=list(TemplateTypeEnum),
             message="Select a template type",
         )
-        template = typer.prompt("Enter the template location (git repo, local)")
+        template = typer.prompt("Enter the template location (git repo, archive, local)")
 
         hub_template_name = tigr81_utils.extract_template_name(template)
         hub_template_name = typer.prompt(
@@ -70,7 +78,15 @@ class HubTemplate(BaseModel):
         template_pl = pl.Path(template)
         checkout = None
         directory = None
-        if not template_pl.exists() or not template_pl.is_dir():
+        sha256 = None
+        if template_type == TemplateTypeEnum.ARCHIVE:
+            directory = typer.prompt(
+                "Enter the relative path to a template in the archive", default="."
+            )
+            sha256 = typer.prompt(
+                "Enter the SHA-256 of the archive (optional)", default="", show_default=False
+            ) or None
+        elif not template_pl.exists() or not template_pl.is_dir():
             checkout = typer.prompt(
                 "Enter the checkout (only needed for remote template)",
                 default="main",
@@ -86,6 +102,7 @@ class HubTemplate(BaseModel):
             checkout=checkout,
             directory=directory,
             template_type=template_type,
+            sha256=sha256,
         )
 
 
@@ -108,7 +125,7 @@ class Hub(BaseModel):
             folder_path (pl.Path): The directory where the YAML file should be saved.
         """
         path = folder_path / f"{self.name}.yml"
-        with open(path, "w") as f:
+        with tigr81_utils.atomic_write(path) as f:
             yaml.dump(
                 data=self.model_dump(mode="json"),
                 stream=f,
@@ -155,3 +172,134 @@ class Hub(BaseModel):
 hub name: {self.name}
 hub templates:\n\n{hub_templates_str}
 """
+
+
+class LockedTemplate(BaseModel):
+    """The commit a remote hub template checkout resolved to when the hub was locked.
+
+    Attributes:
+        template (str): The template location when it was locked.
+        checkout (Optional[str]): The branch or tag that was resolved.
+        commit (str): The commit SHA the checkout pointed to.
+    """
+
+    template: str
+    checkout: Optional[str] = None
+    commit: str
+
+
+class HubLock(BaseModel):
+    """Commits pinned for the remote templates of a hub, see ``tigr81 hub lock``.
+
+    Attributes:
+        hub (str): The name of the locked hub.
+        templates (Dict[str, LockedTemplate]): The locked templates, by name.
+    """
+
+    hub: str
+    templates: Dict[str, LockedTemplate] = {}
+
+    @staticmethod
+    def get_path(hub_name: str, folder_path: Optional[pl.Path] = None) -> pl.Path:
+        """Return the lock file of a hub, ``<hub_name>.lock`` next to the user hubs."""
+        return (folder_path or USER_HUB_LOCATION) / f"{hub_name}.lock"
+
+    def to_yaml(self, folder_path: Optional[pl.Path] = None) -> None:
+        """Serializes the lock to ``<hub>.lock`` in the specified folder.
+
+        Args:
+            folder_path (Optional[pl.Path]): The directory where the lock file should
+                                             be saved. Defaults to USER_HUB_LOCATION.
+        """
+        with tigr81_utils.atomic_write(self.get_path(self.hub, folder_path)) as f:
+            yaml.dump(data=self.model_dump(mode="json"), stream=f)
+
+    @staticmethod
+    def from_yaml(path: pl.Path) -> Optional["HubLock"]:
+        """Loads a hub lock from a lock file.
+
+        Args:
+            path (pl.Path): Path to the lock file.
+
+        Returns:
+            Optional[HubLock]: The lock, or None if the file does not exist.
+        """
+        if not path.is_file():
+            return None
+        return HubLock(**tigr81_utils.read_yaml(path))
+
+    def get_commit(self, hub_template: HubTemplate) -> Optional[str]:
+        """Return the locked commit of a hub template.
+
+        Args:
+            hub_template (HubTemplate): A template of the locked hub.
+
+        Returns:
+            Optional[str]: The commit, or None if the template is not locked or
+            its location or checkout changed since it was locked.
+        """
+        locked = self.templates.get(hub_template.name)
+        if locked is None or (locked.template, locked.checkout) != (
+            str(hub_template.template),
+            hub_template.checkout,
+        ):
+            return None
+        return locked.commit
+
+
+class BatchScaffoldItem(BaseModel):
+    """A hub template to scaffold as part of a batch.
+
+    Attributes:
+        hub (str): The name of the hub containing the template.
+        template (str): The name of the template in the hub.
+        output_dir (pl.Path): The directory where the template is scaffolded.
+    """
+
+    hub: str
+    template: str
+    output_dir: pl.Path
+
+    @staticmethod
+    def parse(value: str) -> "BatchScaffoldItem":
+        """Parse a batch item written as ``HUB/TEMPLATE=OUTPUT_DIR``.
+
+        Args:
+            value (str): The batch item.
+
+        Returns:
+            BatchScaffoldItem: The parsed batch item.
+
+        Raises:
+            ValueError: If the value is not in the ``HUB/TEMPLATE=OUTPUT_DIR`` format.
+        """
+        hub_template, sep, output_dir = value.partition("=")
+        hub, slash, template = hub_template.partition("/")
+        if not (sep and slash and hub and template and output_dir):
+            raise ValueError(
+                f"Invalid batch item '{value}', expected HUB/TEMPLATE=OUTPUT_DIR."
+            )
+        return BatchScaffoldItem(hub=hub, template=template, output_dir=output_dir)
+
+    @staticmethod
+    def from_yaml(path: pl.Path) -> List["BatchScaffoldItem"]:
+        """Load batch items from a YAML spec file.
+
+        The spec holds a list of items with ``hub``, ``template`` and ``output_dir``
+        keys, either at the top level or under an ``items`` key.
+
+        Args:
+            path (pl.Path): Path to the YAML spec file.
+
+        Returns:
+            List[BatchScaffoldItem]: The batch items.
+        """
+        with open(path, "r") as stream:
+            spec = yaml.safe_load(stream) or []
+        if isinstance(spec, dict):
+            spec = spec.get("items", [])
+        return [BatchScaffoldItem(**item) for item in spec]
+
+    def __str__(self):
+        """String representation of the batch item, as ``HUB/TEMPLATE=OUTPUT_DIR``."""
+        return f"{self.hub}/{self.template}={self.output_dir}"
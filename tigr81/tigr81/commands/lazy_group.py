@@ -0,0 +1,117 @@
+"""Typer group that imports its sub-commands only when they are invoked.
+
+Every ``tigr81`` invocation pays the import cost of the modules reachable from
+``tigr81.main``. The hub, monorepo and scaffold commands pull in copier,
+cookiecutter, graphviz, InquirerPy and pydantic, so they are registered here by
+import path and loaded on demand instead.
+"""
+
+import contextlib
+import importlib
+from difflib import get_close_matches
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import click
+import typer
+from typer.core import TyperGroup
+
+
+class LazyCommand(NamedTuple):
+    """A sub-command resolved from an import path on first use.
+
+    Attributes:
+        import_path (str): ``"package.module:attribute"`` pointing to a ``typer.Typer``
+            application or to a plain command function.
+        help (str): Short help shown by ``--help`` and shell completion without
+            importing the target module.
+    """
+
+    import_path: str
+    help: str
+
+    def load(self, name: str) -> click.Command:
+        """Import the target and convert it to a click command.
+
+        Args:
+            name (str): The name the command is registered under.
+
+        Returns:
+            click.Command: The click command (or group) built by Typer.
+        """
+        module_name, attribute = self.import_path.split(":")
+        target = getattr(importlib.import_module(module_name), attribute)
+        if isinstance(target, typer.Typer):
+            command = typer.main.get_group(target)
+        else:
+            single_command_app = typer.Typer(add_completion=False)
+            single_command_app.command(name=name)(target)
+            command = typer.main.get_command(single_command_app)
+        command.name = name
+        return command
+
+
+class LazyTyperGroup(TyperGroup):
+    """A ``TyperGroup`` whose ``lazy_commands`` are imported only when resolved.
+
+    Subclasses declare ``lazy_commands``; eagerly registered Typer commands keep
+    working as usual and are listed first.
+    """
+
+    lazy_commands: Dict[str, LazyCommand] = {}
+
+    def __init__(self, **attrs):
+        super().__init__(**attrs)
+        self._loaded: Dict[str, click.Command] = {}
+        self._listing = False
+
+    @contextlib.contextmanager
+    def _listing_only(self) -> Iterator[None]:
+        """Serve lightweight placeholders while commands are only being listed."""
+        self._listing = True
+        try:
+            yield
+        finally:
+            self._listing = False
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        """Return eager commands followed by the lazy ones, in declaration order."""
+        eager = super().list_commands(ctx)
+        return eager + [name for name in self.lazy_commands if name not in eager]
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        """Return the command ``cmd_name``, importing it if it is a lazy one."""
+        lazy_command = self.lazy_commands.get(cmd_name)
+        if lazy_command is None or cmd_name in self.commands:
+            return super().get_command(ctx, cmd_name)
+        if cmd_name in self._loaded:
+            return self._loaded[cmd_name]
+        if self._listing:
+            return click.Command(
+                name=cmd_name, help=lazy_command.help, short_help=lazy_command.help
+            )
+        self._loaded[cmd_name] = lazy_command.load(cmd_name)
+        return self._loaded[cmd_name]
+
+    def resolve_command(
+        self, ctx: click.Context, args: List[str]
+    ) -> Tuple[Optional[str], Optional[click.Command], List[str]]:
+        """Resolve the sub-command, suggesting lazy commands on typos too."""
+        try:
+            return super().resolve_command(ctx, args)
+        except click.UsageError as e:
+            if self.suggest_commands and args and "Did you mean" not in e.message:
+                matches = get_close_matches(args[0], self.list_commands(ctx))
+                if matches:
+                    suggestions = ", ".join(f"{m!r}" for m in matches)
+                    e.message = f"{e.message.rstrip('.')}. Did you mean {suggestions}?"
+            raise
+
+    def format_help(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        """Render the help page without importing the lazy sub-commands."""
+        with self._listing_only():
+            super().format_help(ctx, formatter)
+
+    def shell_complete(self, ctx: click.Context, incomplete: str):
+        """Complete sub-command names without importing the lazy sub-commands."""
+        with self._listing_only():
+            return super().shell_complete(ctx, incomplete)
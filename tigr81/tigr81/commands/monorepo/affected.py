@@ -0,0 +1,68 @@
+import pathlib as pl
+import subprocess
+from typing import Iterable, List, Optional
+
+from tigr81.commands.monorepo.manifest import Manifest
+
+
+def _git_paths(args: List[str], cwd: Optional[pl.Path] = None) -> List[pl.Path]:
+    result = subprocess.run(  # noqa: S603
+        ["git", args[0], "-z", *args[1:]],  # noqa: S607
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    return [pl.Path(name) for name in result.stdout.split("\0") if name]
+
+
+def changed_files(since: str, cwd: Optional[pl.Path] = None) -> List[pl.Path]:
+    """List the files changed since a git ref, uncommitted and untracked files included.
+
+    Args:
+        since (str): The git ref to compare the working tree with, e.g. "origin/main".
+        cwd (Optional[pl.Path]): The directory the paths are relative to.
+                                 Defaults to the current directory.
+
+    Returns:
+        List[pl.Path]: The changed files under ``cwd``, relative to it.
+
+    Raises:
+        subprocess.CalledProcessError: If git fails, e.g. because the ref does not exist.
+    """
+    changed = _git_paths(["diff", "--name-only", "--relative", since, "--"], cwd=cwd)
+    untracked = _git_paths(["ls-files", "--others", "--exclude-standard"], cwd=cwd)
+    return [*dict.fromkeys(changed + untracked)]
+
+
+def affected_components(manifest: Manifest, paths: Iterable[pl.Path]) -> List[str]:
+    """Map changed paths onto components and add their transitive dependents.
+
+    Args:
+        manifest (Manifest): The manifest of the monorepo.
+        paths (Iterable[pl.Path]): Changed paths, relative to the manifest folder.
+
+    Returns:
+        List[str]: The names of the affected components, in build order.
+    """
+    graph = manifest.graph
+    folders = {
+        pl.Path(manifest.component_location(component)).parts: name
+        for name, component in graph.components.items()
+    }
+
+    changed = set()
+    for path in paths:
+        parts = pl.Path(path).parts
+        # The deepest component folder containing the path, for nested components
+        for depth in range(len(parts), 0, -1):
+            name = folders.get(parts[:depth])
+            if name is not None:
+                changed.add(name)
+                break
+
+    affected = set(changed)
+    for name in changed:
+        affected.update(graph.transitive_dependents(name))
+    return [name for name in graph.order() if name in affected]
@@ -5,3 +5,5 @@ MANIFEST_FILE_NAME = "manifest.yml"
 MANIFEST_DEFAULT_NAME = "my-monorepo"
 MANIFEST_DEFAULT_RELATIVE_PATH = pl.Path("src")
 MANIFEST_DEFAULT_DESCRIPTION = "A monorepo for my project"
+MANIFEST_LOCK_FILE_NAME = "manifest.lock"
+INSTALL_STATE_FILE_NAME = ".tigr81-install.yml"
@@ -0,0 +1,211 @@
+"""Text renderings of the manifest dependency graph.
+
+Unlike the PNG rendering, which shells out to the Graphviz ``dot`` binary,
+every format here is produced by tigr81 itself. Edges go from a dependency to
+the component depending on it, as in Manifest.to_graphviz_digraph.
+"""
+
+import json
+from html import escape
+from typing import Callable, Dict, List, Tuple
+
+import tigr81.utils as tigr81_utils
+from tigr81.commands.monorepo.manifest import Manifest
+from tigr81.commands.scaffold.project_template import ProjectTemplate, ProjectTypeEnum
+
+
+class DrawFormatEnum(tigr81_utils.StrEnum):
+    """Enumeration of the formats the manifest can be drawn in."""
+
+    PNG = "png"
+    """PNG image rendered by Graphviz, which must be installed."""
+    SVG = "svg"
+    """SVG image with a layered layout, rendered natively."""
+    DOT = "dot"
+    """Graphviz DOT source."""
+    MERMAID = "mermaid"
+    """Mermaid flowchart source."""
+    JSON = "json"
+    """JSON adjacency list."""
+
+
+FILL_COLORS = {ProjectTypeEnum.FAST_API: "#836fff"}
+"""Node fill color by project type, white by default (slateblue1 as in the PNG)."""
+
+NODE_HEIGHT = 40
+LAYER_GAP = 60
+NODE_GAP = 30
+CHAR_WIDTH = 8
+NODE_PADDING = 24
+MARGIN = 20
+
+
+def _fill_color(component: ProjectTemplate) -> str:
+    return FILL_COLORS.get(component.project_type_as_enum, "#ffffff")
+
+
+def _edges(manifest: Manifest) -> List[Tuple[str, str]]:
+    graph = manifest.graph
+    return [(d, name) for name in graph.components for d in graph.dependencies[name]]
+
+
+def _dot_quote(text: str) -> str:
+    text = (text or "").replace("\\", "\\\\").replace('"', '\\"')
+    return '"' + text.replace("\n", "\\n") + '"'
+
+
+def to_dot(manifest: Manifest) -> str:
+    """Render the manifest as Graphviz DOT source.
+
+    Args:
+        manifest: The manifest to render.
+
+    Returns:
+        str: The DOT source of the dependency graph.
+    """
+    lines = [f"digraph {_dot_quote(manifest.name)} {{"]
+    for name, component in manifest.graph.components.items():
+        label = f"{name}\n\n{component.project_options.description or ''}"
+        lines.append(
+            f"    {_dot_quote(name)} [label={_dot_quote(label)} shape=box "
+            f'style=filled fillcolor="{_fill_color(component)}"]'
+        )
+    for tail, head in _edges(manifest):
+        lines.append(f"    {_dot_quote(tail)} -> {_dot_quote(head)}")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def to_mermaid(manifest: Manifest) -> str:
+    """Render the manifest as a Mermaid flowchart.
+
+    Args:
+        manifest: The manifest to render.
+
+    Returns:
+        str: The Mermaid source of the dependency graph.
+    """
+    ids = {name: f"c{i}" for i, name in enumerate(manifest.graph.components)}
+    lines = ["flowchart TD"]
+    for name in manifest.graph.components:
+        lines.append(f'    {ids[name]}["{escape(name)}"]')
+    for tail, head in _edges(manifest):
+        lines.append(f"    {ids[tail]} --> {ids[head]}")
+    return "\n".join(lines) + "\n"
+
+
+def to_json(manifest: Manifest) -> str:
+    """Render the manifest as a JSON adjacency list.
+
+    Args:
+        manifest: The manifest to render.
+
+    Returns:
+        str: A JSON object with the manifest name and, for every component, its
+        project type, description, dependencies and dependents.
+    """
+    graph = manifest.graph
+    data = {
+        "name": manifest.name,
+        "components": [
+            {
+                "name": name,
+                "project_type": str(component.project_type),
+                "description": component.project_options.description,
+                "dependencies": graph.dependencies[name],
+                "dependents": graph.dependents[name],
+            }
+            for name, component in graph.components.items()
+        ],
+    }
+    return json.dumps(data, indent=2) + "\n"
+
+
+def _layers(manifest: Manifest) -> List[List[str]]:
+    """Group components by longest dependency chain, dependencies first."""
+    graph = manifest.graph
+    depth: Dict[str, int] = {}
+    for name in graph.order():
+        depth[name] = max((depth[d] + 1 for d in graph.dependencies[name]), default=0)
+    layers: List[List[str]] = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+    for name in graph.components:
+        layers[depth[name]].append(name)
+    return layers
+
+
+def to_svg(manifest: Manifest) -> str:
+    """Render the manifest as an SVG image with a layered layout.
+
+    Components are stacked in layers below the components they depend on, and
+    centered in each layer.
+
+    Args:
+        manifest: The manifest to render.
+
+    Returns:
+        str: The SVG document.
+    """
+    graph = manifest.graph
+    layers = _layers(manifest)
+    widths = {name: len(name) * CHAR_WIDTH + NODE_PADDING for name in graph.components}
+    layer_widths = [
+        sum(widths[name] for name in layer) + NODE_GAP * (len(layer) - 1)
+        for layer in layers
+    ]
+    width = max(layer_widths, default=0) + 2 * MARGIN
+    height = len(layers) * (NODE_HEIGHT + LAYER_GAP) - LAYER_GAP + 2 * MARGIN
+
+    boxes: Dict[str, Tuple[float, float]] = {}
+    for i, layer in enumerate(layers):
+        x = (width - layer_widths[i]) / 2
+        y = MARGIN + i * (NODE_HEIGHT + LAYER_GAP)
+        for name in layer:
+            boxes[name] = (x, y)
+            x += widths[name] + NODE_GAP
+
+    out = [
+        '<svg xmlns="http://www.w3.org/2000/svg" '
+        f'width="{width:g}" height="{max(height, 0):g}" font-family="sans-serif" font-size="13">',
+        "  <defs>",
+        '    <marker id="arrow" viewBox="0 0 10 10" refX="10" refY="5" '
+        'markerWidth="6" markerHeight="6" orient="auto-start-reverse">',
+        '      <path d="M 0 0 L 10 5 L 0 10 z"/>',
+        "    </marker>",
+        "  </defs>",
+        f"  <title>{escape(manifest.name or '')}</title>",
+    ]
+    for tail, head in _edges(manifest):
+        (tx, ty), (hx, hy) = boxes[tail], boxes[head]
+        out.append(
+            f'  <line x1="{tx + widths[tail] / 2:g}" y1="{ty + NODE_HEIGHT:g}" '
+            f'x2="{hx + widths[head] / 2:g}" y2="{hy:g}" stroke="black" '
+            'marker-end="url(#arrow)"/>'
+        )
+    for name, component in graph.components.items():
+        x, y = boxes[name]
+        out.append(
+            f'  <g><title>{escape(component.project_options.description or name)}</title>'
+            f'<rect x="{x:g}" y="{y:g}" width="{widths[name]:g}" height="{NODE_HEIGHT}" '
+            f'fill="{_fill_color(component)}" stroke="black"/>'
+            f'<text x="{x + widths[name] / 2:g}" y="{y + NODE_HEIGHT / 2:g}" '
+            f'text-anchor="middle" dominant-baseline="central">{escape(name)}</text></g>'
+        )
+    out.append("</svg>")
+    return "\n".join(out) + "\n"
+
+
+RENDERERS: Dict[DrawFormatEnum, Callable[[Manifest], str]] = {
+    DrawFormatEnum.SVG: to_svg,
+    DrawFormatEnum.DOT: to_dot,
+    DrawFormatEnum.MERMAID: to_mermaid,
+    DrawFormatEnum.JSON: to_json,
+}
+"""Native renderer of each text format."""
+
+FILE_EXTENSIONS = {
+    DrawFormatEnum.PNG: "png",
+    DrawFormatEnum.SVG: "svg",
+    DrawFormatEnum.DOT: "dot",
+    DrawFormatEnum.MERMAID: "mmd",
+    DrawFormatEnum.JSON: "json",
+}
@@ -0,0 +1,118 @@
+from typing import Dict, List
+
+from tigr81.commands.core.scheduler import CycleError, topological_order
+from tigr81.commands.scaffold.project_template import ProjectTemplate
+
+__all__ = ["CycleError", "ManifestGraph"]
+
+
+class ManifestGraph:
+    """Dependency graph of the components of a manifest.
+
+    Built once in O(V+E), it indexes components by name with their forward and
+    reverse adjacency, so that lookups are O(1) and traversals O(V+E).
+    Dependencies on names that are not components of the manifest are kept in
+    ``components[name].dependencies`` but are not part of the graph.
+
+    Attributes:
+        components: The components by name, in manifest order.
+        dependencies: The names of the components each component depends on.
+        dependents: The names of the components depending on each component.
+    """
+
+    def __init__(self, components: List[ProjectTemplate]):
+        """Initializes the graph from a list of components.
+
+        Args:
+            components: The components of the manifest.
+
+        Raises:
+            ValueError: If two components have the same name.
+        """
+        self.components: Dict[str, ProjectTemplate] = {}
+        for component in components:
+            name = component.project_options.name
+            if name in self.components:
+                raise ValueError(f"Duplicate component name '{name}' in the manifest.")
+            self.components[name] = component
+
+        self.dependencies: Dict[str, List[str]] = {}
+        self.dependents: Dict[str, List[str]] = {name: [] for name in self.components}
+        for name, component in self.components.items():
+            self.dependencies[name] = [
+                d for d in dict.fromkeys(d.name for d in component.dependencies)
+                if d in self.components
+            ]
+            for dependency in self.dependencies[name]:
+                self.dependents[dependency].append(name)
+
+    def __contains__(self, name: str) -> bool:
+        """Whether ``name`` is a component of the graph."""
+        return name in self.components
+
+    def __getitem__(self, name: str) -> ProjectTemplate:
+        """Return the component called ``name``.
+
+        Raises:
+            KeyError: If there is no such component.
+        """
+        return self.components[name]
+
+    def order(self) -> List[str]:
+        """Return the component names so that each comes after its dependencies.
+
+        Independent components keep the manifest order.
+
+        Raises:
+            CycleError: If the dependencies contain a cycle.
+        """
+        return topological_order(self.dependencies)
+
+    def check(self) -> None:
+        """Check that the dependencies do not contain a cycle.
+
+        Raises:
+            CycleError: If the dependencies contain a cycle.
+        """
+        self.order()
+
+    def _reachable(self, name: str, adjacency: Dict[str, List[str]]) -> List[str]:
+        if name not in self.components:
+            raise KeyError(name)
+        seen = {name}
+        stack = [name]
+        while stack:
+            for next_name in adjacency[stack.pop()]:
+                if next_name not in seen:
+                    seen.add(next_name)
+                    stack.append(next_name)
+        seen.discard(name)
+        return [n for n in self.components if n in seen]
+
+    def transitive_dependencies(self, name: str) -> List[str]:
+        """Return the components ``name`` depends on, directly or not.
+
+        Args:
+            name: The component name.
+
+        Returns:
+            The names of the dependencies, in manifest order.
+
+        Raises:
+            KeyError: If there is no such component.
+        """
+        return self._reachable(name, self.dependencies)
+
+    def transitive_dependents(self, name: str) -> List[str]:
+        """Return the components depending on ``name``, directly or not.
+
+        Args:
+            name: The component name.
+
+        Returns:
+            The names of the dependents, in manifest order.
+
+        Raises:
+            KeyError: If there is no such component.
+        """
+        return self._reachable(name, self.dependents)
@@ -0,0 +1,109 @@
+import hashlib
+import pathlib as pl
+from typing import Dict, List
+
+import yaml
+from pydantic import BaseModel
+
+import tigr81.utils as tigr81_utils
+from tigr81.commands.monorepo.constants import INSTALL_STATE_FILE_NAME
+from tigr81.commands.monorepo.manifest import Manifest
+from tigr81.commands.scaffold.project_template import ProjectTemplate
+
+INSTALL_INPUT_FILE_NAMES = ["pyproject.toml", "poetry.lock", "uv.lock"]
+"""Files of a component, and of its path dependencies, that its install depends on."""
+
+
+def hash_install_inputs(manifest: Manifest, component: ProjectTemplate) -> str:
+    """Hash the install inputs of a component and of its path dependencies.
+
+    Args:
+        manifest: The manifest of the monorepo.
+        component: The component.
+
+    Returns:
+        str: The sha256 of the pyproject.toml and lock files of the component
+        and of the folders of its dependencies.
+    """
+    location = manifest.component_location(component)
+    folders = [location] + [
+        location / dependency.relative_path for dependency in component.dependencies
+    ]
+    digest = hashlib.sha256()
+    for folder in folders:
+        for file_name in INSTALL_INPUT_FILE_NAMES:
+            path = folder / file_name
+            digest.update(f"{path.as_posix()}\0".encode())
+            if path.exists():
+                digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+class InstallState(BaseModel):
+    """Hashes of the install inputs of each component as they were last installed.
+
+    Attributes:
+        components: The install inputs hash of each installed component, by name.
+    """
+
+    components: Dict[str, str] = {}
+
+    @classmethod
+    def from_yaml(cls, file_name: str = INSTALL_STATE_FILE_NAME) -> "InstallState":
+        """Read the state file, or return an empty state if it does not exist.
+
+        Args:
+            file_name: The name of the state file.
+
+        Returns:
+            The state read from the file.
+        """
+        if not pl.Path(file_name).exists():
+            return cls()
+        return cls(**tigr81_utils.read_yaml(file_name))
+
+    def to_yaml(self, file_name: str = INSTALL_STATE_FILE_NAME) -> None:
+        """Serialize the state to a YAML file.
+
+        Args:
+            file_name: The name of the YAML file to write to.
+        """
+        with tigr81_utils.atomic_write(file_name) as f:
+            yaml.dump(
+                data=self.model_dump(mode="json"),
+                stream=f,
+                default_flow_style=False,
+                sort_keys=True,
+            )
+
+    def plan(self, manifest: Manifest) -> List[str]:
+        """List the components to install again.
+
+        A component is installed again when its install inputs changed since
+        it was last installed, or when one of its dependencies is installed
+        again.
+
+        Args:
+            manifest: The manifest of the monorepo.
+
+        Returns:
+            The names of the components to install, in dependency order.
+
+        Raises:
+            ValueError: If the component dependencies contain a cycle.
+        """
+        graph = manifest.graph
+        outdated = {}
+        for name in graph.order():
+            changed = self.components.get(name) != hash_install_inputs(
+                manifest, graph[name]
+            )
+            if changed or any(d in outdated for d in graph.dependencies[name]):
+                outdated[name] = None
+        return list(outdated)
+
+    def update(self, manifest: Manifest, component: ProjectTemplate) -> None:
+        """Record the current install inputs hash of a component."""
+        self.components[component.project_options.name] = hash_install_inputs(
+            manifest, component
+        )
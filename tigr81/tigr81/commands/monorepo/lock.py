@@ -0,0 +1,115 @@
+import pathlib as pl
+from typing import Dict, List, NamedTuple
+
+import yaml
+from pydantic import BaseModel
+
+import tigr81.utils as tigr81_utils
+from tigr81.commands.monorepo.constants import MANIFEST_LOCK_FILE_NAME
+from tigr81.commands.monorepo.manifest import Manifest
+from tigr81.commands.scaffold.project_template import ProjectTemplate
+from tigr81.utils import StrEnum
+
+
+class ScaffoldReason(StrEnum):
+    """Why a component has to be scaffolded."""
+
+    MISSING = "missing"
+    """The component folder does not exist."""
+    CHANGED = "changed"
+    """The component changed in the manifest since it was scaffolded."""
+    UNTRACKED = "untracked"
+    """The component folder exists but was not scaffolded with a lock file."""
+
+
+class ScaffoldStep(NamedTuple):
+    """A component to scaffold and the reason why.
+
+    Attributes:
+        component (ProjectTemplate): The component.
+        reason (ScaffoldReason): Why the component has to be scaffolded.
+    """
+
+    component: ProjectTemplate
+    reason: ScaffoldReason
+
+
+class ManifestLock(BaseModel):
+    """Fingerprints of the manifest components as they were last scaffolded.
+
+    Attributes:
+        checkout: The git branch or tag of the project type templates.
+        components: The fingerprint of each scaffolded component, by name.
+    """
+
+    checkout: str = "main"
+    components: Dict[str, str] = {}
+
+    @classmethod
+    def from_yaml(cls, file_name: str = MANIFEST_LOCK_FILE_NAME) -> "ManifestLock":
+        """Read the lock file, or return an empty lock if it does not exist.
+
+        Args:
+            file_name: The name of the lock file.
+
+        Returns:
+            The lock read from the file.
+        """
+        if not pl.Path(file_name).exists():
+            return cls()
+        return cls(**tigr81_utils.read_yaml(file_name))
+
+    def to_yaml(self, file_name: str = MANIFEST_LOCK_FILE_NAME) -> None:
+        """Serialize the lock to a YAML file.
+
+        Args:
+            file_name: The name of the YAML file to write to.
+        """
+        with tigr81_utils.atomic_write(file_name) as f:
+            yaml.dump(
+                data=self.model_dump(mode="json"),
+                stream=f,
+                default_flow_style=False,
+                sort_keys=True,
+            )
+
+    def plan(self, manifest: Manifest) -> List[ScaffoldStep]:
+        """List the components whose scaffolded files are out of date.
+
+        A component is scaffolded again when its folder is missing or when its
+        fingerprint differs from the locked one. Existing folders without a
+        locked fingerprint are reported as untracked, but are not scaffolded.
+
+        Args:
+            manifest: The manifest of the monorepo.
+
+        Returns:
+            The components to scaffold, in manifest order.
+        """
+        steps = []
+        for component in manifest.components:
+            name = component.project_options.name
+            location = manifest.relative_path / component.relative_path / name
+            locked = self.components.get(name)
+            if not location.exists():
+                steps.append(ScaffoldStep(component, ScaffoldReason.MISSING))
+            elif locked is None:
+                steps.append(ScaffoldStep(component, ScaffoldReason.UNTRACKED))
+            elif locked != component.fingerprint(self.checkout):
+                steps.append(ScaffoldStep(component, ScaffoldReason.CHANGED))
+        return steps
+
+    def update(self, component: ProjectTemplate) -> None:
+        """Record the current fingerprint of a component."""
+        self.components[component.project_options.name] = component.fingerprint(
+            self.checkout
+        )
+
+    def prune(self, manifest: Manifest) -> None:
+        """Drop the fingerprints of components no longer in the manifest."""
+        names = {component.project_options.name for component in manifest.components}
+        self.components = {
+            name: fingerprint
+            for name, fingerprint in self.components.items()
+            if name in names
+        }
@@ -1,21 +1,87 @@
+import functools
+import hashlib
+import json
+import os
 import pathlib as pl
+import pickle
 import shutil
-from typing import List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 
+import click
+import pydantic
 import typer
 import yaml
-from graphviz import Digraph
 from pydantic import BaseModel
 
 import tigr81.utils as tigr81_utils
-from tigr81.commands.core.poetry_pm import PoetryPM
+from tigr81 import USER_CACHE_LOCATION
+from tigr81.commands.core import pyproject, scheduler
+from tigr81.commands.core.package_manager import (
+    PackageManagerEnum,
+    get_package_manager,
+)
 from tigr81.commands.monorepo.constants import (
     MANIFEST_DEFAULT_DESCRIPTION,
     MANIFEST_DEFAULT_NAME,
     MANIFEST_DEFAULT_RELATIVE_PATH,
     MANIFEST_FILE_NAME,
 )
-from tigr81.commands.scaffold.project_template import ProjectTemplate, ProjectTypeEnum
+from tigr81.commands.monorepo.graph import ManifestGraph
+from tigr81.commands.scaffold.project_template import (
+    Dependency,
+    ProjectTemplate,
+    ProjectTemplateOptions,
+    ProjectTypeEnum,
+)
+
+if TYPE_CHECKING:
+    from graphviz import Digraph
+
+MANIFEST_CACHE_LOCATION = USER_CACHE_LOCATION / "manifests"
+MANIFEST_CACHE_FORMAT = 1
+"""Bumped when the layout of the cached manifest files changes."""
+MANIFEST_CACHE_MAX_ENTRIES = 32
+"""Number of validated manifests kept on disk, the least recently read are dropped."""
+
+
+@functools.lru_cache(maxsize=None)
+def manifest_cache_version() -> str:
+    """Return the version of the manifest cache, derived from the schema of the models.
+
+    Manifests cached with other models, e.g. before a field was added to
+    ProjectTemplate, or with another pydantic version are validated again.
+
+    Returns:
+        str: A hash of MANIFEST_CACHE_FORMAT, the pydantic version and the Manifest schema.
+    """
+    schema = json.dumps(Manifest.model_json_schema(), sort_keys=True)
+    payload = f"{MANIFEST_CACHE_FORMAT}:{pydantic.VERSION}:{schema}"
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def _read_cache(cache_path: pl.Path) -> Optional["Manifest"]:
+    """Unpickle a cached manifest, None if it is missing, unreadable or outdated."""
+    try:
+        with open(cache_path, "rb") as f:
+            version, manifest = pickle.load(f)  # noqa: S301
+        # Keep the entries read recently from being pruned
+        os.utime(cache_path)
+    except Exception:
+        return None
+    return manifest if version == manifest_cache_version() else None
+
+
+def _write_cache(cache_path: pl.Path, manifest: "Manifest") -> None:
+    """Pickle a validated manifest atomically, then prune the oldest entries."""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    with tigr81_utils.atomic_write(cache_path, "wb") as f:
+        pickle.dump((manifest_cache_version(), manifest), f)
+
+    entries = sorted(
+        cache_path.parent.glob("*.pickle"), key=lambda p: p.stat().st_mtime_ns
+    )
+    for entry in entries[:-MANIFEST_CACHE_MAX_ENTRIES]:
+        entry.unlink(missing_ok=True)
 
 
 class Manifest(BaseModel):
@@ -26,18 +92,163 @@ class Manifest(BaseModel):
         relative_path: The relative path where the monorepo source code is located.
         description: Description of the monorepo project.
         components: List of project templates/components in the monorepo.
+        package_manager: The package manager installing the components.
     """
 
     name: Optional[str] = MANIFEST_DEFAULT_NAME
     relative_path: Optional[pl.Path] = MANIFEST_DEFAULT_RELATIVE_PATH
     description: Optional[str] = MANIFEST_DEFAULT_DESCRIPTION
     components: Optional[List[ProjectTemplate]] = []
+    package_manager: PackageManagerEnum = PackageManagerEnum.POETRY
+
+    @classmethod
+    def from_yaml(
+        cls, file_name: str = MANIFEST_FILE_NAME, graph_only: bool = False
+    ) -> "Manifest":
+        """Read a manifest from a YAML file.
+
+        Manifests are cached on disk keyed by the hash of the file content, so
+        that an unchanged manifest is unpickled instead of being parsed and
+        validated again.
+
+        Args:
+            file_name: The name of the YAML file to read.
+            graph_only: Build the components without validating them, reading
+                only their names, types, descriptions, paths and dependencies.
+                Faster on large manifests, for commands that only query the
+                graph: the result must not be scaffolded or written back.
+
+        Returns:
+            The manifest defined in the file.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+        """
+        content = pl.Path(file_name).read_bytes()
+        if not tigr81_utils.is_cache_enabled():
+            return cls._load(content, graph_only)
+
+        digest = hashlib.sha256(content).hexdigest()
+        # A validated manifest also serves as a graph-only view
+        cache_paths = [MANIFEST_CACHE_LOCATION / f"{digest}.pickle"]
+        if graph_only:
+            cache_paths.insert(0, MANIFEST_CACHE_LOCATION / f"{digest}.graph.pickle")
+        for cache_path in cache_paths:
+            manifest = _read_cache(cache_path)
+            if manifest is not None:
+                return manifest
+
+        manifest = cls._load(content, graph_only)
+        _write_cache(cache_paths[0], manifest)
+        return manifest
+
+    @classmethod
+    def _load(cls, content: bytes, graph_only: bool) -> "Manifest":
+        manifest_dct = yaml.load(content, Loader=tigr81_utils.SafeLoader) or {}  # noqa: S506
+        return cls._graph_view(manifest_dct) if graph_only else cls(**manifest_dct)
+
+    @classmethod
+    def _graph_view(cls, manifest_dct: Dict) -> "Manifest":
+        components = [
+            ProjectTemplate.model_construct(
+                project_type=component.get("project_type"),
+                relative_path=pl.Path(component.get("relative_path") or "."),
+                project_options=ProjectTemplateOptions.model_construct(
+                    **{
+                        key: (component.get("project_options") or {}).get(key)
+                        for key in ("name", "description")
+                    }
+                ),
+                dependencies=[
+                    Dependency.model_construct(
+                        name=dependency["name"],
+                        relative_path=pl.Path(dependency.get("relative_path") or "."),
+                    )
+                    for dependency in component.get("dependencies") or []
+                ],
+            )
+            for component in manifest_dct.get("components") or []
+        ]
+        return cls.model_construct(
+            name=manifest_dct.get("name", MANIFEST_DEFAULT_NAME),
+            relative_path=pl.Path(
+                manifest_dct.get("relative_path") or MANIFEST_DEFAULT_RELATIVE_PATH
+            ),
+            description=manifest_dct.get("description", MANIFEST_DEFAULT_DESCRIPTION),
+            components=components,
+        )
+
+    def component_location(self, component: ProjectTemplate) -> pl.Path:
+        """Return the folder of a component of the manifest."""
+        return (
+            self.relative_path
+            / component.relative_path
+            / component.project_options.name
+        )
+
+    @functools.cached_property
+    def graph(self) -> ManifestGraph:
+        """The dependency graph of the components, built on first access."""
+        return ManifestGraph(self.components)
+
+    def _remove_from_dependents(
+        self,
+        component_name: str,
+        dependents: List[ProjectTemplate],
+        package_manager: Optional[str] = None,
+        jobs: int = 4,
+        lock: bool = True,
+    ) -> None:
+        pm = get_package_manager(package_manager or self.package_manager)
+
+        if lock:
+
+            def remove(component: ProjectTemplate) -> None:
+                pm.remove(self.component_location(component), component_name)
+
+        else:
+            # Edit every pyproject.toml first, then update the lock files
+            for component in dependents:
+                pyproject_path = self.component_location(component) / "pyproject.toml"
+                if pyproject_path.exists():
+                    pyproject.remove_dependency(pyproject_path, component_name)
 
-    def remove(self, component_name: str) -> ProjectTemplate:
+            def remove(component: ProjectTemplate) -> None:
+                pm.lock(self.component_location(component))
+
+        tasks = {
+            component.project_options.name: functools.partial(remove, component)
+            for component in dependents
+        }
+        results = scheduler.run_tasks(tasks, {}, jobs=jobs, keep_going=True)
+        failed = [r.name for r in results if r.status != scheduler.TaskStatus.OK]
+        if failed:
+            typer.echo(
+                f"Could not remove {component_name} from: {tigr81_utils.pretty_list(failed)}"
+            )
+            raise typer.Exit(code=1)
+
+    def remove(
+        self,
+        component_name: str,
+        package_manager: Optional[str] = None,
+        jobs: int = 4,
+        lock: bool = True,
+    ) -> ProjectTemplate:
         """Remove a component from the manifest.
 
+        The component is first removed from the components depending on it,
+        concurrently. With ``lock`` each of them runs the package manager
+        remove command, otherwise their pyproject.toml is edited in place and
+        only their lock file is updated.
+
         Args:
             component_name: The name of the component to remove.
+            package_manager: The package manager removing the component from its
+                dependents. Defaults to the manifest package manager.
+            jobs: Maximum number of dependents updated concurrently.
+            lock: Whether to remove the dependency with the package manager, or
+                to edit pyproject.toml directly and then update the lock files.
 
         Returns:
             The removed ProjectTemplate.
@@ -45,24 +256,15 @@ class Manifest(BaseModel):
         Raises:
             ValueError: If the component is not found in the manifest.
         """
-        component_to_remove = None
-        # find the component to delete
-        for component in self.components:
-            if component.project_options.name == component_name:
-                component_to_remove = component
-                break
-
-        if not component_to_remove:
+        if component_name not in self.graph:
             raise ValueError(
                 f"Component with name '{component_name}' not found in the manifest."
             )
+        component_to_remove = self.graph[component_name]
 
-        # find the component in which the component_name is installed
-        components_to_update = []
-        for component in self.components:
-            for dependency in component.dependencies:
-                if dependency.name == component_name:
-                    components_to_update.append(component.project_options.name)
+        # find the components in which the component_name is installed
+        components_to_update = self.graph.dependents[component_name]
+        dependents = [self.graph[name] for name in components_to_update]
 
         if len(components_to_update) == 0:
             continue_flg = True
@@ -71,29 +273,27 @@ class Manifest(BaseModel):
                 f"""By removing the component {component_name} you will remove it also from the components: {tigr81_utils.pretty_list(components_to_update)}\nDo you want to continue?"""
             )
         if continue_flg:
-            if components_to_update:
-                pc = PoetryPM()
-                for component in self.components:
-                    for dependency in component.dependencies:
-                        if dependency.name == component_name:
-                            cwd = (
-                                self.relative_path
-                                / component.relative_path
-                                / component.project_options.name
-                            )
-                            pc.remove(cwd, component_name)
+            if dependents:
+                self._remove_from_dependents(
+                    component_name,
+                    dependents,
+                    package_manager=package_manager,
+                    jobs=jobs,
+                    lock=lock,
+                )
+                for component in dependents:
+                    component.dependencies = [
+                        d for d in component.dependencies if d.name != component_name
+                    ]
 
             typer.echo(
                 f"Removing component {component_name} from manifest components.."
             )
             self.components.remove(component_to_remove)
+            self.__dict__.pop("graph", None)
 
             typer.echo("Deleting component folder file..")
-            shutil.rmtree(
-                self.relative_path
-                / component_to_remove.relative_path
-                / component_to_remove.project_options.name
-            )
+            shutil.rmtree(self.component_location(component_to_remove))
             typer.echo(f"Component {component_name} removed successfully")
             return component_to_remove
         raise typer.Exit("Component removal cancelled by user.")
@@ -117,6 +317,12 @@ class Manifest(BaseModel):
             default=MANIFEST_DEFAULT_DESCRIPTION,
         )
 
+        package_manager = typer.prompt(
+            "Enter the package manager installing the components",
+            type=click.Choice(list(PackageManagerEnum)),
+            default=PackageManagerEnum.POETRY,
+        )
+
         components = []
         while typer.confirm("Do you want to add a component? (y/n)", default=True):
             components.append(ProjectTemplate.prompt(available_dependencies=components))
@@ -126,14 +332,17 @@ class Manifest(BaseModel):
             relative_path=relative_path,
             description=description,
             components=components,
+            package_manager=package_manager,
         )
 
-    def to_graphviz_digraph(self) -> Digraph:
+    def to_graphviz_digraph(self) -> "Digraph":
         """Convert the manifest to a Graphviz Digraph representation.
 
         Returns:
             A Digraph object representing the component dependencies.
         """
+        from graphviz import Digraph
+
         dg = Digraph(name=self.name, filename=self.name, format="png")
 
         for component in self.components:
@@ -159,7 +368,7 @@ class Manifest(BaseModel):
         Args:
             file_name: The name of the YAML file to write to.
         """
-        with open(file_name, "w") as f:
+        with tigr81_utils.atomic_write(file_name) as f:
             yaml.dump(
                 data=self.model_dump(mode="json"),
                 stream=f,
@@ -1,19 +1,38 @@
+import functools
+import json
 import pathlib as pl
 import shutil
-from typing import Dict, List
+import subprocess
+from typing import Dict, List, Optional
 
 import click
 import typer
 from pydantic import BaseModel
-
-import tigr81.commands.core.scaffold as scaffold_core
-import tigr81.utils as tigr81_utils
-from tigr81.commands.core.poetry_pm import PoetryPM
-from tigr81.commands.monorepo.constants import MANIFEST_FILE_NAME
+from typing_extensions import Annotated
+
+from tigr81.commands.core import scheduler
+from tigr81.commands.core.package_manager import (
+    PackageManager,
+    PackageManagerEnum,
+    get_package_manager,
+)
+from tigr81.commands.monorepo import affected
+from tigr81.commands.monorepo import draw as draw_module
+from tigr81.commands.monorepo.constants import (
+    INSTALL_STATE_FILE_NAME,
+    MANIFEST_FILE_NAME,
+    MANIFEST_LOCK_FILE_NAME,
+)
+from tigr81.commands.monorepo.draw import DrawFormatEnum
+from tigr81.commands.monorepo.graph import ManifestGraph
+from tigr81.commands.monorepo.install_state import InstallState
+from tigr81.commands.monorepo.lock import ManifestLock, ScaffoldReason
 from tigr81.commands.monorepo.manifest import Manifest
 from tigr81.commands.scaffold.project_template import ProjectTemplate
 
 app = typer.Typer()
+graph_app = typer.Typer()
+app.add_typer(graph_app, name="graph")
 
 
 @app.callback()
@@ -21,13 +40,79 @@ def callback():
     """Handle monorepo project."""
 
 
+@graph_app.callback()
+def graph_callback():
+    """Query the dependency graph of the monorepo components."""
+
+
+def _read_graph() -> ManifestGraph:
+    """Read the manifest graph, exit if the manifest is missing or has a cycle."""
+    try:
+        graph = Manifest.from_yaml(MANIFEST_FILE_NAME, graph_only=True).graph
+        graph.check()
+    except FileNotFoundError:
+        typer.echo(
+            "Manifest not found.. make sure you are in the correct folder or if you want to create a new one run: tigr81 monorepo init"
+        )
+        raise typer.Exit(code=1) from None
+    except ValueError as e:
+        typer.echo(str(e))
+        raise typer.Exit(code=1) from None
+    return graph
+
+
+def _check_component(graph: ManifestGraph, component: str) -> None:
+    if component not in graph:
+        typer.echo(f"Component '{component}' not found in the manifest.")
+        raise typer.Exit(code=1)
+
+
+@graph_app.command()
+def deps(
+    component: Annotated[str, typer.Argument(help="The component name")],
+):
+    """List the components a component depends on, directly or not."""
+    graph = _read_graph()
+    _check_component(graph, component)
+    for name in graph.transitive_dependencies(component):
+        typer.echo(name)
+
+
+@graph_app.command()
+def rdeps(
+    component: Annotated[str, typer.Argument(help="The component name")],
+):
+    """List the components depending on a component, directly or not."""
+    graph = _read_graph()
+    _check_component(graph, component)
+    for name in graph.transitive_dependents(component):
+        typer.echo(name)
+
+
+@graph_app.command()
+def order(
+    component: Annotated[
+        Optional[str],
+        typer.Argument(help="Only order this component and its dependencies"),
+    ] = None,
+):
+    """List the components in build order, each after its dependencies."""
+    graph = _read_graph()
+    names = graph.order()
+    if component is not None:
+        _check_component(graph, component)
+        selected = {component, *graph.transitive_dependencies(component)}
+        names = [name for name in names if name in selected]
+    for name in names:
+        typer.echo(name)
+
+
 @app.command()
 def add():
     """Add a component to the monorepo project."""
     typer.echo("Adding a component to the monorepo project")
 
-    manifest_dct = tigr81_utils.read_yaml(MANIFEST_FILE_NAME)
-    manifest = Manifest(**manifest_dct)
+    manifest = Manifest.from_yaml(MANIFEST_FILE_NAME)
 
     component = ProjectTemplate.prompt(available_dependencies=manifest.components)
 
@@ -41,21 +126,65 @@ def add():
 
 
 @app.command()
-def draw():
-    """Generate the .png representation of the monorepo pkd dependencies."""
-    manifest_dct = tigr81_utils.read_yaml(MANIFEST_FILE_NAME)
-    manifest = Manifest(**manifest_dct)
-    mf_digraph = manifest.to_graphviz_digraph()
-    typer.echo("Rendering the manifest...")
-    mf_digraph.render()
+def draw(
+    draw_format: Annotated[
+        DrawFormatEnum,
+        typer.Option(
+            "--format",
+            "-f",
+            help="Output format; only png needs Graphviz installed",
+        ),
+    ] = DrawFormatEnum.PNG,
+    output: Annotated[
+        Optional[pl.Path],
+        typer.Option(
+            "--output",
+            "-o",
+            help="Output file, '-' for stdout. Defaults to <manifest name>.<format>",
+        ),
+    ] = None,
+):
+    """Draw the dependencies of the monorepo components."""
+    manifest = Manifest.from_yaml(MANIFEST_FILE_NAME, graph_only=True)
+    try:
+        manifest.graph.check()
+    except ValueError as e:
+        typer.echo(str(e))
+        raise typer.Exit(code=1) from None
+    _draw(manifest, draw_format, output)
+
+
+def _draw(
+    manifest: Manifest,
+    draw_format: DrawFormatEnum = DrawFormatEnum.PNG,
+    output: Optional[pl.Path] = None,
+) -> None:
+    """Write the drawing of the manifest, with Graphviz for PNG and natively otherwise."""
+    typer.echo("Rendering the manifest...", err=str(output) == "-")
+    if draw_format == DrawFormatEnum.PNG:
+        mf_digraph = manifest.to_graphviz_digraph()
+        if output is not None:
+            mf_digraph.render(outfile=output)
+        else:
+            mf_digraph.render()
+        return
+
+    content = draw_module.RENDERERS[draw_format](manifest)
+    if str(output) == "-":
+        typer.echo(content, nl=False)
+        return
+    output = output or pl.Path(
+        f"{manifest.name}.{draw_module.FILE_EXTENSIONS[draw_format]}"
+    )
+    output.write_text(content)
+    typer.echo(f"Manifest drawn in {output}")
 
 
 @app.command()
 def clean():
     """Delete all resources related to the current monorepo."""
     typer.echo("Cleaning monorepo project")
-    manifest_dct = tigr81_utils.read_yaml(MANIFEST_FILE_NAME)
-    manifest = Manifest(**manifest_dct)
+    manifest = Manifest.from_yaml(MANIFEST_FILE_NAME)
 
     confirmed = typer.confirm(
         f"Are you sure you want to delete all the resources related to the monorepo: {manifest.name}"
@@ -108,31 +237,213 @@ def init():
     manifest.to_yaml()
 
 
+def _echo_report(results: List[scheduler.TaskResult], done: str) -> None:
+    """Print the status and timing of each component, exit 1 if any did not succeed."""
+    typer.echo("\nReport:")
+    for result in results:
+        line = f"{result.status:<8} {result.elapsed:7.2f}s  {result.name}"
+        if result.error:
+            line += f"  ({result.error})"
+        typer.echo(line)
+
+    failed = [r for r in results if r.status != scheduler.TaskStatus.OK]
+    typer.echo(f"{len(results) - len(failed)} {done}, {len(failed)} not {done}.")
+    if failed:
+        raise typer.Exit(code=1)
+
+
+def _install_component(pm: PackageManager, cwd: pl.Path) -> None:
+    try:
+        pm.install(cwd=cwd)
+    except typer.Exit:
+        raise RuntimeError(f"'{pm.name} install' failed") from None
+
+
+def _affected_since(manifest: Manifest, since: str) -> List[str]:
+    """Return the components affected since a git ref, exit if git fails."""
+    try:
+        paths = affected.changed_files(since)
+    except subprocess.CalledProcessError as e:
+        typer.echo(f"Could not list the files changed since {since}: {e.stderr}")
+        raise typer.Exit(code=1) from None
+    return affected.affected_components(manifest, paths)
+
+
+@app.command(name="affected")
+def affected_command(
+    since: Annotated[
+        str,
+        typer.Option(
+            "--since",
+            help="The git ref to compare the working tree with, e.g. origin/main",
+        ),
+    ],
+    as_json: Annotated[
+        bool,
+        typer.Option("--json", help="Print the component names as a JSON list"),
+    ] = False,
+):
+    """List the components affected by the changes since a git ref.
+
+    Changed files are mapped onto the component folders containing them,
+    then every component depending on a changed one, directly or not, is
+    added. Components are listed in build order.
+    """
+    try:
+        manifest = Manifest.from_yaml(MANIFEST_FILE_NAME, graph_only=True)
+        manifest.graph.check()
+    except (FileNotFoundError, ValueError) as e:
+        typer.echo(str(e))
+        raise typer.Exit(code=1) from None
+
+    names = _affected_since(manifest, since)
+    if as_json:
+        typer.echo(json.dumps(names))
+    else:
+        for name in names:
+            typer.echo(name)
+
+
 @app.command()
-def install():
-    """Install every component inside the monorepo project."""
+def install(
+    jobs: Annotated[
+        int,
+        typer.Option(
+            "--jobs",
+            "-j",
+            min=1,
+            help="Maximum number of components installed concurrently",
+        ),
+    ] = 4,
+    keep_going: Annotated[
+        bool,
+        typer.Option(
+            "--keep-going",
+            "-k",
+            help="Keep installing the components that do not depend on a failed one",
+        ),
+    ] = False,
+    force: Annotated[
+        bool,
+        typer.Option(
+            "--force",
+            "-f",
+            help="Install every component, even the up to date ones",
+        ),
+    ] = False,
+    package_manager: Annotated[
+        Optional[PackageManagerEnum],
+        typer.Option(
+            "--pm",
+            help="Package manager to use instead of the one of the manifest",
+        ),
+    ] = None,
+    affected_since: Annotated[
+        Optional[str],
+        typer.Option(
+            "--affected-since",
+            help="Only install the components affected by the changes since this git ref",
+        ),
+    ] = None,
+):
+    """Install every component inside the monorepo project.
+
+    Only the components whose pyproject.toml or poetry.lock, or those of their
+    path dependencies, changed since they were last installed are installed,
+    along with the components depending on them. Components are installed
+    after the components they depend on, and independent components are
+    installed concurrently.
+    """
     typer.echo("Installing all the components of the monorepo project")
 
-    pc = PoetryPM()
-
-    manifest_dct = tigr81_utils.read_yaml(MANIFEST_FILE_NAME)
+    manifest = Manifest.from_yaml(MANIFEST_FILE_NAME)
 
-    manifest = Manifest(**manifest_dct)
+    pm = get_package_manager(package_manager or manifest.package_manager)
 
-    for component in manifest.components:
-        pc.install(
-            cwd=manifest.relative_path
-            / component.relative_path
-            / component.project_options.name
+    state = InstallState() if force else InstallState.from_yaml(INSTALL_STATE_FILE_NAME)
+    try:
+        outdated = state.plan(manifest)
+    except ValueError as e:
+        typer.echo(str(e))
+        raise typer.Exit(code=1) from None
+
+    if affected_since is not None:
+        affected = set(_affected_since(manifest, affected_since))
+        outdated = [name for name in outdated if name in affected]
+
+    components = [
+        component
+        for component in manifest.components
+        if component.project_options.name in outdated
+    ]
+    up_to_date = len(manifest.components) - len(components)
+    if up_to_date:
+        typer.echo(f"{up_to_date} components are up to date, use --force to reinstall.")
+
+    tasks = {
+        component.project_options.name: functools.partial(
+            _install_component,
+            pm,
+            manifest.component_location(component),
         )
+        for component in components
+    }
+    deps = {
+        component.project_options.name: [
+            dependency.name for dependency in component.dependencies
+        ]
+        for component in components
+    }
+    results = scheduler.run_tasks(tasks, deps, jobs=jobs, keep_going=keep_going)
+
+    # Hashed after installing, since poetry install may create the lock file
+    installed = {r.name for r in results if r.status == scheduler.TaskStatus.OK}
+    for component in components:
+        if component.project_options.name in installed:
+            state.update(manifest, component)
+        else:
+            state.components.pop(component.project_options.name, None)
+    state.to_yaml(INSTALL_STATE_FILE_NAME)
+
+    _echo_report(results, "installed")
 
 
 @app.command()
-def remove():
+def remove(
+    package_manager: Annotated[
+        Optional[PackageManagerEnum],
+        typer.Option(
+            "--pm",
+            help="Package manager to use instead of the one of the manifest",
+        ),
+    ] = None,
+    jobs: Annotated[
+        int,
+        typer.Option(
+            "--jobs",
+            "-j",
+            min=1,
+            help="Maximum number of dependent components updated concurrently",
+        ),
+    ] = 4,
+    lock: Annotated[
+        bool,
+        typer.Option(
+            "--lock/--no-lock",
+            help="Remove the component from its dependents with the package manager, "
+            "or edit their pyproject.toml and only update their lock files",
+        ),
+    ] = True,
+    draw_format: Annotated[
+        Optional[DrawFormatEnum],
+        typer.Option(
+            "--draw",
+            help="Draw the updated manifest in this format, see 'monorepo draw'",
+        ),
+    ] = None,
+):
     """Remove a component from the monorepo project."""
-    manifest_dct = tigr81_utils.read_yaml(MANIFEST_FILE_NAME)
-
-    manifest = Manifest(**manifest_dct)
+    manifest = Manifest.from_yaml(MANIFEST_FILE_NAME)
 
     names = [pt.project_options.name for pt in manifest.components]
     name = typer.prompt(
@@ -140,49 +451,99 @@ def remove():
     )
 
     typer.echo(f"Removing the component {name} to the monorepo project")
-    manifest.remove(component_name=name)
+    manifest.remove(
+        component_name=name, package_manager=package_manager, jobs=jobs, lock=lock
+    )
 
-    mf_digraph = manifest.to_graphviz_digraph()
-    typer.echo("Rendering the manifest...")
-    mf_digraph.render()
     manifest.to_yaml()
+    if draw_format is not None:
+        _draw(manifest, draw_format)
 
 
 @app.command()
-def scaffold():
-    """Scaffold a monorepo project."""
-    # TODO: check if the file exists and add a method from_yaml in Manifest
+def scaffold(
+    jobs: Annotated[
+        int,
+        typer.Option(
+            "--jobs",
+            "-j",
+            min=1,
+            help="Maximum number of components scaffolded concurrently",
+        ),
+    ] = 4,
+    keep_going: Annotated[
+        bool,
+        typer.Option(
+            "--keep-going",
+            "-k",
+            help="Keep scaffolding the components that do not depend on a failed one",
+        ),
+    ] = False,
+    dry_run: Annotated[
+        bool,
+        typer.Option(
+            "--dry-run",
+            help="Only show the components that would be scaffolded",
+        ),
+    ] = False,
+):
+    """Scaffold a monorepo project.
+
+    Only the components that are missing, or that changed in the manifest
+    since they were scaffolded (see manifest.lock), are scaffolded. Each
+    project type is fetched once and independent components are scaffolded
+    concurrently.
+    """
+    import tigr81.commands.core.scaffold as scaffold_core
+
     try:
-        manifest_dct = tigr81_utils.read_yaml(MANIFEST_FILE_NAME)
+        manifest = Manifest.from_yaml(MANIFEST_FILE_NAME)
     except FileNotFoundError:
         typer.echo(
             "Manifest not found.. make sure you are in the correct folder or if you want to create a new one run: tigr81 monorepo init"
         )
         raise typer.Exit() from None
 
-    manifest = Manifest(**manifest_dct)
-
     typer.echo(
         f"Scaffolding a monorepo project from manifest located at {pl.Path.cwd() / MANIFEST_FILE_NAME}"
     )
 
-    for component in manifest.components:
-        component_location = (
-            manifest.relative_path
-            / component.relative_path
-            / component.project_options.name
-        )
-        typer.echo(f"Scaffolding {component_location} component...")
-        if not component_location.exists():
-            scaffold_core.scaffold_project_template(
-                project_template=component,
-                default=True,
-                output_dir=manifest.relative_path / component.relative_path,
-            )
-            typer.echo(f"Component {component_location} scaffolded successfully")
-        else:
-            typer.echo(f"Component {component.project_options.name} already exists..")
+    lock = ManifestLock.from_yaml(MANIFEST_LOCK_FILE_NAME)
+    lock.prune(manifest)
+    steps = lock.plan(manifest)
+    to_scaffold = [
+        step.component for step in steps if step.reason != ScaffoldReason.UNTRACKED
+    ]
+    for step in steps:
+        typer.echo(f"{step.reason:<10} {step.component.project_options.name}")
+    if not to_scaffold:
+        typer.echo("Every component is up to date.")
+
+    if dry_run:
+        return
 
+    try:
+        results = scaffold_core.scaffold_monorepo(
+            to_scaffold,
+            relative_path=manifest.relative_path,
+            checkout=lock.checkout,
+            jobs=jobs,
+            keep_going=keep_going,
+        )
+    except (ValueError, subprocess.CalledProcessError) as e:
+        typer.echo(f"Monorepo scaffolding failed: {e}")
+        raise typer.Exit(code=1) from None
+
+    # Untracked components are adopted as they are: they were scaffolded from
+    # the manifest before the lock file existed
+    scaffolded = {r.name for r in results if r.status == scheduler.TaskStatus.OK}
+    for step in steps:
+        name = step.component.project_options.name
+        if name in scaffolded or step.reason == ScaffoldReason.UNTRACKED:
+            lock.update(step.component)
+    lock.to_yaml(MANIFEST_LOCK_FILE_NAME)
+
+    _echo_report(results, "scaffolded")
     typer.echo("Monorepo scaffolding completed successfully")
 
     # FIX: fix monorepo graph visualization
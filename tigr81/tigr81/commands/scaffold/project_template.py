@@ -1,3 +1,5 @@
+import hashlib
+import json
 import pathlib as pl
 from typing import Dict, List, Optional
 
@@ -146,6 +148,22 @@ class ProjectTemplate(BaseModel):
 
         return extra_content
 
+    def fingerprint(self, checkout: str = "main") -> str:
+        """Hash everything that determines the scaffolded files of the template.
+
+        Args:
+            checkout: The git branch or tag the template is scaffolded from.
+
+        Returns:
+            str: The sha256 of the project type, the checkout and the extra content.
+        """
+        data = {
+            "project_type": str(self.project_type),
+            "checkout": checkout,
+            "extra_content": self.extra_content,
+        }
+        return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
     @classmethod
     def prompt(
         cls, available_dependencies: List["ProjectTemplate"] = None
@@ -1,13 +1,12 @@
 import pathlib as pl
+import tarfile
+import zipfile
 from typing import Optional
 
-import cookiecutter.main as cookiecutter
-import copier
 import typer
 from typing_extensions import Annotated
 
-import tigr81.commands.core.scaffold as scaffold_core
-from tigr81.commands.core import gitw
+from tigr81.commands.core import gitw, mirror
 from tigr81.commands.scaffold.project_template import (
     ProjectTypeEnum,
 )
@@ -54,40 +53,80 @@ def scaffold(
         "--git-url",
         help="Specify the url of a git repo you want to scaffold",
     ),
+    archive_url: Optional[str] = typer.Option(
+        None,
+        "--archive-url",
+        help="Specify the url or path of a .tar.gz, .tar.zst or .zip archive to extract",
+    ),
+    sha256: Optional[str] = typer.Option(
+        None,
+        help="Specify the expected SHA-256 of the archive (for archive_url)",
+    ),
     directory: Optional[pl.Path] = typer.Option(
         None,
-        help="Specify a relative path to a directory (for git_url and cookiecutter_url scaffolding templates)",
+        help="Specify a relative path to a directory (for git_url, cookiecutter_url and archive_url scaffolding templates)",
     ),
+    no_render_cache: Annotated[
+        bool,
+        typer.Option(
+            "--no-render-cache",
+            help="Render the template even if an identical render is cached",
+        ),
+    ] = False,
 ):
     """Scaffold a project template."""
+    import cookiecutter.main as cookiecutter
+
+    import tigr81.commands.core.scaffold as scaffold_core
+
     if copier_url is not None:
         typer.echo(f"Scaffolding custom copier: {copier_url}")
-        copier.run_copy(
-            src_path=copier_url,
-            dst_path=output_dir,
-            vcs_ref=checkout or "main",
-            defaults=default,
+        scaffold_core.render_copier(
+            copier_url,
+            mirror.resolve_template_source(copier_url),
+            default=default,
+            output_dir=output_dir,
+            checkout=checkout or "main",
+            use_render_cache=not no_render_cache,
         )
         return
 
     if cookiecutter_url is not None:
         typer.echo(f"Scaffolding custom cookiecutter: {cookiecutter_url}")
-        cookiecutter(
-            template=cookiecutter_url,
+        scaffold_core.render_cookiecutter(
+            cookiecutter_url,
+            mirror.resolve_template_source(cookiecutter_url),
+            default=default,
             output_dir=output_dir,
-            directory=directory or ".",
-            no_input=default,
             checkout=checkout or "main",
+            directory=str(directory or "."),
+            use_render_cache=not no_render_cache,
         )
         return
 
+    if archive_url is not None:
+        typer.echo(f"Scaffolding archive: {archive_url}")
+        try:
+            scaffold_core.render_archive(
+                archive_url,
+                output_dir=output_dir,
+                directory=str(directory) if directory is not None else None,
+                sha256=sha256,
+            )
+        except (OSError, ValueError, tarfile.TarError, zipfile.BadZipFile) as e:
+            typer.echo(f"Could not extract {archive_url}: {e}", err=True)
+            raise typer.Exit(code=1) from None
+        return
+
     if git_url is not None:
         typer.echo(f"Scaffolding clone repo: {cookiecutter_url}")
-        gitw.clone_repo_directory(
-            repo_url=git_url,
-            checkout=checkout or "main",
-            directory=directory or pl.Path("."),
+        scaffold_core.render_raw_git(
+            git_url,
+            mirror.resolve_template_source(git_url),
             output_dir=output_dir,
+            checkout=checkout or "main",
+            directory=str(directory or "."),
+            use_render_cache=not no_render_cache,
         )
         return
 
@@ -121,6 +160,7 @@ def scaffold(
             default=default,
             output_dir=output_dir,
             checkout=checkout,
+            use_render_cache=not no_render_cache,
         )
     else:
         scaffold_core.scaffold_project_type(
@@ -128,4 +168,5 @@ def scaffold(
             default=default,
             output_dir=output_dir,
             checkout=checkout,
+            use_render_cache=not no_render_cache,
         )
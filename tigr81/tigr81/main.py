@@ -3,11 +3,30 @@ import importlib.metadata
 import typer
 
 from tigr81 import PYPY_URL, REPO_LOCATION
-from tigr81.commands.hub import hub
-from tigr81.commands.monorepo import monorepo
-from tigr81.commands.scaffold import scaffold
+from tigr81.commands.lazy_group import LazyCommand, LazyTyperGroup
 
-app = typer.Typer()
+
+class Tigr81Group(LazyTyperGroup):
+    """Root command group: sub-commands are imported only when they run."""
+
+    lazy_commands = {
+        "scaffold": LazyCommand(
+            "tigr81.commands.scaffold.scaffold:scaffold", "Scaffold a project template."
+        ),
+        "hub": LazyCommand("tigr81.commands.hub.hub:app", "Handle hub templates."),
+        "monorepo": LazyCommand(
+            "tigr81.commands.monorepo.monorepo:app", "Handle monorepo project."
+        ),
+        "cache": LazyCommand("tigr81.commands.cache.cache:app", "Handle tigr81 caches."),
+    }
+
+
+app = typer.Typer(cls=Tigr81Group)
+
+
+@app.callback()
+def callback():
+    """Project scaffolder for humans."""
 
 
 @app.command()
@@ -18,8 +37,3 @@ def version():
     typer.echo("\nCheck out for new versions:")
     typer.echo(f"- {PYPY_URL}")
     typer.echo(f"- {REPO_LOCATION}")
-
-
-app.command()(scaffold.scaffold)
-app.add_typer(hub.app, name="hub")
-app.add_typer(monorepo.app, name="monorepo")
@@ -1,13 +1,44 @@
-from .extract_template_name import extract_template_name
-from .interactive_prompt import create_interactive_prompt
-from .pretty import pretty_list
-from .read_yaml import read_yaml
+import importlib
+
+from .cache import disable_cache, is_cache_enabled
+from .files import atomic_write, clone_file, copy_tree, file_lock, lock_file_path
+from .pretty import pretty_list, pretty_size
+from .read_yaml import SafeLoader, read_yaml
 from .str_enum import StrEnum
 
+# These helpers pull in heavy third party packages (cookiecutter, InquirerPy)
+# that most commands never need, so they are imported on first access.
+_LAZY_ATTRIBUTES = {
+    "extract_template_name": ".extract_template_name",
+    "create_interactive_prompt": ".interactive_prompt",
+}
+
 __all__ = [
+    "atomic_write",
+    "clone_file",
+    "copy_tree",
+    "file_lock",
+    "lock_file_path",
+    "disable_cache",
+    "is_cache_enabled",
     "extract_template_name",
     "create_interactive_prompt",
     "read_yaml",
+    "SafeLoader",
     "pretty_list",
+    "pretty_size",
     "StrEnum",
 ]
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,20 @@
+import os
+
+NO_CACHE_ENV_VAR = "TIGR81_NO_CACHE"
+
+
+def is_cache_enabled() -> bool:
+    """Check whether tigr81 on-disk caches may be used.
+
+    Caches are enabled unless the ``TIGR81_NO_CACHE`` environment variable is set
+    to a truthy value (``1``, ``true`` or ``yes``).
+
+    Returns:
+        bool: True if caches are enabled, False otherwise.
+    """
+    return os.environ.get(NO_CACHE_ENV_VAR, "").lower() not in ("1", "true", "yes")
+
+
+def disable_cache() -> None:
+    """Disable tigr81 on-disk caches for the rest of the current process."""
+    os.environ[NO_CACHE_ENV_VAR] = "1"
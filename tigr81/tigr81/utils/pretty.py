@@ -27,3 +27,22 @@ def pretty_list(lst: List[str]) -> str:
         return lst[0]
 
     return f'{", ".join(lst[:-1])} and {lst[-1]}'
+
+
+def pretty_size(num_bytes: int) -> str:
+    """Convert a number of bytes into a human-readable size.
+
+    Args:
+        num_bytes (int): The size in bytes.
+
+    Returns:
+        str: The size with a binary unit suffix, e.g. "1.5 MiB".
+    """
+    size = float(num_bytes)
+    for unit in ["B", "KiB", "MiB", "GiB"]:
+        if size < 1024 or unit == "GiB":
+            break
+        size /= 1024
+    if unit == "B":
+        return f"{int(size)} B"
+    return f"{size:.1f} {unit}"
@@ -2,6 +2,9 @@ from typing import Dict
 
 import yaml
 
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+"""The libyaml safe loader when PyYAML was built with it, the pure Python one otherwise."""
+
 
 def read_yaml(file_path: str) -> Dict:
     """Reads a YAML file and returns its contents as a dictionary.
@@ -14,6 +17,6 @@ def read_yaml(file_path: str) -> Dict:
         or an error occurs during reading, returns an empty dictionary.
     """
     with open(file_path, "r") as stream:
-        config = yaml.safe_load(stream)
+        config = yaml.load(stream, Loader=SafeLoader)  # noqa: S506
 
     return config or {}